@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""Serve transcript and GO term annotation lookups from a resident process.
+
+The BLAST, GAF and OBO files are loaded once into an AnnotationIndex, so
+each lookup costs a few dictionary reads instead of a new Python process
+that parses every file. The server answers HTTP requests on localhost, or
+on a Unix socket with --socket, with JSON:
+
+    GET  /transcripts?ids=TRINITY_1,TRINITY_2
+         [{"transcript": ..., "protein": ..., "go": [[GO ID, name], ...]}]
+    GET  /go?ids=GO:0008150,GO:0003674
+         [{"go": ..., "name": ..., "ancestors": [[GO ID, name], ...]}]
+    POST /query  {"transcripts": [...], "go": [...]}
+         {"transcripts": [...], "go": [...]}
+    GET  /status
+         the number of loaded records, the load time and the cache usage.
+
+e.g. curl 'http://127.0.0.1:8765/transcripts?ids=TRINITY_DN1_c0_g1_i1' or
+curl --unix-socket annotations.sock 'http://localhost/go?ids=GO:0006915'.
+
+Unknown IDs are answered with "NA" like the annotation report. The JSON of
+every transcript and GO term is kept in an LRU cache of --cache-size
+entries. The input files are checked every --interval seconds and a new
+index is loaded in the background when one of them changed, the previous
+index answers the lookups until the new one is ready.
+
+This file contains below functions and classes:
+    * AnnotationIndex - A class defines the loaded lookups and the following
+                        methods:
+                           * transcript: To return the JSON of a transcript.
+                           * go_term: To return the JSON of a GO term.
+    * AnnotationService - A class defines the current index and its hot
+                          reload.
+    * AnnotationHandler - A class defines the HTTP requests.
+    * make_server - returns a server of the service on a TCP port or a Unix
+                    socket.
+    * main - loads the files and serves the lookups until interrupted.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import os
+import json
+import time
+import socket
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from urllib.parse import urlsplit, parse_qs
+
+from diff_exp_annotations import (transcript_protein_dict, gene_go_dict,
+                                  go_name_dict)
+from parse_humun_genes_go import go_is_a_dict
+from go_slim import slim_table
+from profiling import profile_option
+
+DEFAULT_PORT = 8765
+CACHE_SIZE = 65536
+RELOAD_INTERVAL = 2.0
+# The largest request body accepted by POST /query
+MAX_BODY_SIZE = 16 << 20
+
+
+class AnnotationIndex:
+    """The annotation lookups loaded from the input files.
+
+    Args:
+        blast_filename(str): File path to the blast output .outfmt6 file.
+        gaf_filename(str): File path to the gene association .gaf file.
+        obo_filename(str): File path to the GO terms .obo file.
+        cache_size(int): The number of JSON responses kept per lookup.
+
+    Attributes:
+        transcript_to_protein(dict): The SwissProt ID of each transcript.
+        gene_to_go(dict): The GO IDs of each SwissProt ID.
+        go_to_desc(dict): The name of each GO ID.
+        go_dict(dict): The is_a parent terms of each GO ID.
+        ancestors(dict): The frozenset of each GO ID and all its parent
+                         terms.
+        loaded(float): The time the files were loaded.
+
+    Methods:
+        transcript: Return the JSON of the protein and GO terms of a
+                    transcript.
+        go_term: Return the JSON of the name and ancestors of a GO term.
+        cache_info: Return the hits and misses of the caches.
+    """
+
+    def __init__(self, blast_filename, gaf_filename, obo_filename,
+                 cache_size=CACHE_SIZE):
+        self.transcript_to_protein = transcript_protein_dict(blast_filename)
+        self.gene_to_go = gene_go_dict(gaf_filename)
+        self.go_to_desc = go_name_dict(obo_filename)
+        self.go_dict = go_is_a_dict(obo_filename)
+        # Every term is its own slim, parents missing from the file, e.g.
+        # in a slim or truncated file, are roots
+        terms = set(self.go_dict).union(*self.go_dict.values())
+        self.ancestors = slim_table(self.go_dict, terms)
+        self.loaded = time.time()
+
+        # The caches belong to this index and are dropped with it on reload
+        self.transcript = lru_cache(cache_size)(self._transcript)
+        self.go_term = lru_cache(cache_size)(self._go_term)
+
+    def __repr__(self):
+        return f"AnnotationIndex({len(self.transcript_to_protein)} " \
+               f"transcripts, {len(self.go_dict)} GO terms)"
+
+    def _named(self, go_ids):
+        """Return the sorted GO IDs paired with their names."""
+
+        return [[go_id, self.go_to_desc.get(go_id, "NA")]
+                for go_id in sorted(go_ids)]
+
+    def _transcript(self, transcript):
+        """Return the JSON of the protein and GO terms of a transcript."""
+
+        protein = self.transcript_to_protein.get(transcript, "NA")
+        go_ids = self.gene_to_go.get(protein, ["NA"])
+        return json.dumps({"transcript": transcript, "protein": protein,
+                           "go": self._named(go_ids)})
+
+    def _go_term(self, go_id):
+        """Return the JSON of the name and all the parent terms of a GO
+        term."""
+
+        ancestors = self.ancestors.get(go_id, frozenset()) - {go_id}
+        return json.dumps({"go": go_id,
+                           "name": self.go_to_desc.get(go_id, "NA"),
+                           "ancestors": self._named(ancestors)})
+
+    def cache_info(self):
+        """Return the hits, misses and size of the transcript and GO term
+        caches."""
+
+        return {name: cache.cache_info()._asdict() for name, cache in
+                (("transcripts", self.transcript), ("go", self.go_term))}
+
+
+class AnnotationService:
+    """The current AnnotationIndex, loaded again when an input file changes.
+
+    Args:
+        blast_filename(str): File path to the blast output .outfmt6 file.
+        gaf_filename(str): File path to the gene association .gaf file.
+        obo_filename(str): File path to the GO terms .obo file.
+        cache_size(int): The number of JSON responses kept per lookup.
+
+    Attributes:
+        index(AnnotationIndex): The index answering the lookups.
+
+    Methods:
+        reload_if_changed: Load a new index when an input file changed.
+        watch: Start a thread calling reload_if_changed.
+        stop: Stop the thread.
+    """
+
+    def __init__(self, blast_filename, gaf_filename, obo_filename,
+                 cache_size=CACHE_SIZE):
+        self.filenames = (blast_filename, gaf_filename, obo_filename)
+        self.cache_size = cache_size
+        self._signature = self._file_signature()
+        self.index = AnnotationIndex(*self.filenames, cache_size)
+        self._stopped = threading.Event()
+
+    def __repr__(self):
+        return f"AnnotationService({self.index})"
+
+    def _file_signature(self):
+        """Return the modification time and size of every input file."""
+
+        signature = []
+        for filename in self.filenames:
+            try:
+                status = os.stat(filename)
+                signature.append((status.st_mtime_ns, status.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return signature
+
+    def reload_if_changed(self):
+        """Load a new index when an input file changed since the last load.
+        The lookups use the previous index until the new one is loaded, and
+        keep it if the new one fails to load, e.g. while a file is written.
+
+        Returns:
+            bool: True if a new index was loaded.
+        """
+
+        signature = self._file_signature()
+        if signature == self._signature or None in signature:
+            return False
+
+        try:
+            index = AnnotationIndex(*self.filenames, self.cache_size)
+        except (OSError, ValueError, IndexError, AttributeError) as error:
+            sys.stderr.write(f"Reload failed, keeping the loaded files: "
+                             f"{error}\n")
+            return False
+
+        # A file changed again while loading, load it on the next check
+        if self._file_signature() != signature:
+            return False
+        self.index = index
+        self._signature = signature
+        return True
+
+    def watch(self, interval=RELOAD_INTERVAL):
+        """Check the input files every interval seconds in a daemon thread.
+
+        Args:
+            interval(float): The seconds between two checks.
+        Returns:
+            Thread: The started thread.
+        """
+
+        def check():
+            while not self._stopped.wait(interval):
+                # A failed reload must not stop the thread
+                try:
+                    if self.reload_if_changed():
+                        sys.stderr.write(f"Reloaded {self.index}\n")
+                except Exception as error:
+                    sys.stderr.write(f"Reload failed, keeping the loaded "
+                                     f"files: {error!r}\n")
+
+        thread = threading.Thread(target=check, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Stop the thread started by watch."""
+
+        self._stopped.set()
+
+
+class AnnotationHandler(BaseHTTPRequestHandler):
+    """Answer the lookups of the HTTP requests with the service of the
+    server."""
+
+    server_version = "AnnotationServer/1.0"
+
+    def address_string(self):
+        # Unix socket clients have no address
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, body, status=200):
+        """Send a JSON response.
+
+        Args:
+            body(str): The JSON text.
+            status(int): The HTTP status code.
+        """
+
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_lookup_error(self, status, message):
+        """Send an error as a JSON object."""
+
+        self.send_json(json.dumps({"error": message}), status)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        ids = [value for values in parse_qs(url.query).get("ids", [])
+               for value in values.split(",") if value]
+        index = self.server.service.index
+
+        try:
+            if url.path == "/transcripts":
+                body = "[" + ",".join(map(index.transcript, ids)) + "]"
+            elif url.path == "/go":
+                body = "[" + ",".join(map(index.go_term, ids)) + "]"
+            elif url.path == "/status":
+                body = json.dumps({
+                    "transcripts": len(index.transcript_to_protein),
+                    "proteins": len(index.gene_to_go),
+                    "go_terms": len(index.go_dict),
+                    "loaded": index.loaded, "cache": index.cache_info()})
+            else:
+                self.send_lookup_error(404, f"Unknown path {url.path}")
+                return
+        except Exception as error:
+            self.send_lookup_error(500, f"Lookup failed: {error!r}")
+            return
+        self.send_json(body)
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/query":
+            self.send_lookup_error(404, f"Unknown path {self.path}")
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_SIZE:
+            self.send_lookup_error(413, "The query is too large.")
+            return
+        try:
+            query = json.loads(self.rfile.read(length) or b"{}")
+            transcripts = [str(value) for value in
+                           query.get("transcripts", [])]
+            go_ids = [str(value) for value in query.get("go", [])]
+        except (ValueError, AttributeError, TypeError):
+            self.send_lookup_error(400, "The query must be a JSON object "
+                                        "of ID lists.")
+            return
+
+        # Answer the whole batch from the same index
+        index = self.server.service.index
+        try:
+            body = ('{"transcripts": ['
+                    + ",".join(map(index.transcript, transcripts))
+                    + '], "go": ['
+                    + ",".join(map(index.go_term, go_ids)) + "]}")
+        except Exception as error:
+            self.send_lookup_error(500, f"Lookup failed: {error!r}")
+            return
+        self.send_json(body)
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """An HTTP server on a Unix socket handling each connection in a
+    thread."""
+
+    daemon_threads = True
+
+
+def make_server(service, port=DEFAULT_PORT, socket_filename=None,
+                verbose=False):
+    """Return a server answering the lookups of the service.
+
+    Args:
+        service(AnnotationService): The loaded annotations.
+        port(int): The localhost TCP port, 0 for any free port.
+        socket_filename(str): A Unix socket path to listen on instead of the
+                              TCP port.
+        verbose(bool): Log every request to stderr.
+    Returns:
+        server: The server, call serve_forever to answer the requests.
+    """
+
+    if socket_filename:
+        # Remove the socket left by a previous server
+        if os.path.exists(socket_filename):
+            probe = socket.socket(socket.AF_UNIX)
+            try:
+                probe.connect(socket_filename)
+            except OSError:
+                os.remove(socket_filename)
+            else:
+                probe.close()
+                raise OSError(f"A server is already listening on "
+                              f"{socket_filename}.")
+        server = ThreadingUnixHTTPServer(socket_filename, AnnotationHandler)
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", port), AnnotationHandler)
+
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+@profile_option
+def main():
+    """The main function of the script that loads the annotation files and
+    serves the lookups until it is interrupted.
+
+    Usage:
+        python annotation_server.py [--blast blastp.outfmt6]
+            [--gaf gene_association_subset.gaf] [--obo go-basic.obo]
+            [--port 8765 | --socket annotations.sock] [--cache-size 65536]
+            [--interval 2] [--verbose]
+    """
+
+    options = {"--blast": "blastp.outfmt6",
+               "--gaf": "gene_association_subset.gaf",
+               "--obo": "go-basic.obo", "--port": str(DEFAULT_PORT),
+               "--socket": None, "--cache-size": str(CACHE_SIZE),
+               "--interval": str(RELOAD_INTERVAL)}
+    verbose = "--verbose" in sys.argv
+    if verbose:
+        sys.argv.remove("--verbose")
+    for option in options:
+        if option in sys.argv:
+            index = sys.argv.index(option)
+            if index + 1 >= len(sys.argv):
+                sys.exit(f"Please provide a value for {option}.")
+            options[option] = sys.argv[index + 1]
+            del sys.argv[index:index + 2]
+    if len(sys.argv) > 1:
+        sys.exit("Unknown argument " + sys.argv[1])
+
+    try:
+        port = int(options["--port"])
+        cache_size = int(options["--cache-size"])
+        interval = float(options["--interval"])
+    except ValueError:
+        sys.exit("Please provide --port, --cache-size and --interval as "
+                 "numbers.")
+
+    for option in ("--blast", "--gaf", "--obo"):
+        if not os.path.exists(options[option]):
+            sys.exit(options[option] + " not found. Check the file path "
+                     "and try again.")
+
+    service = AnnotationService(options["--blast"], options["--gaf"],
+                                options["--obo"], cache_size)
+    try:
+        server = make_server(service, port, options["--socket"], verbose)
+    except OSError as error:
+        sys.exit(str(error))
+
+    address = options["--socket"] or f"http://127.0.0.1:{port}"
+    sys.stderr.write(f"Serving {service.index} on {address}\n")
+    service.watch(interval)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+        if options["--socket"] and os.path.exists(options["--socket"]):
+            os.remove(options["--socket"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+"""Benchmark the loaders and entry points of the annotation scripts on
+generated input files.
+
+The input files (.outfmt6, .gaf, .obo, .matrix, GenBank and UniProt) are
+generated with a seeded random number generator at several scales, so every
+run benchmarks the same data. The GO terms form a DAG with a configurable
+depth and number of parents per term (fan-in), which drives the cost of
+find_parent_terms.
+
+Every benchmark is timed (the best of --repeat runs) and run once more
+under tracemalloc for its peak memory. The results are saved as a JSON
+baseline with --save and later runs are compared against it, a benchmark
+slower or larger than the baseline by more than --tolerance is reported as
+a regression and the script exits with status 1.
+
+The timings depend on the machine, so no baseline is kept in the
+repository. Save one on the machine that runs the comparison before
+changing the code, e.g.
+
+    python benchmark.py --scale small,medium --save
+    python benchmark.py --scale small,medium
+
+This file contains below functions:
+    * generate_obo - writes a GO terms .obo file with a DAG of is_a terms.
+    * generate_gaf - writes a gene association .gaf file.
+    * generate_outfmt6 - writes a BLAST tabular .outfmt6 file.
+    * generate_matrix - writes a differential expression .matrix file.
+    * generate_genbank - writes a GenBank .gb file.
+    * generate_uniprot - writes a UniProt flat .txt file.
+    * generate_files - writes all the input files of one scale.
+    * measure - returns the time and peak memory of a function.
+    * run_benchmarks - runs every benchmark on the files of one scale.
+    * compare - returns the regressions against a baseline.
+    * main - runs the benchmarks and compares or saves the baseline.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import os
+import gc
+import json
+import time
+import random
+import tempfile
+import tracemalloc
+
+from blast_class import Blast
+from diff_class import Matrix
+from diff_exp_annotations import (transcript_protein_dict, gene_go_dict,
+                                  go_name_dict, wrtie_annotations)
+from parse_humun_genes_go import (split_terms, go_is_a_dict,
+                                  map_protein_to_go, find_parent_terms)
+from parse_fasta import split_records
+from go_slim import slim_table, map_to_slim, slim_counts
+from parse_uniprot_to_fasta import UniprotEntry, read_records
+from translate_mrna import translate_sequence
+from profiling import profile_option
+
+SCALES = {
+    "small": {"terms": 500, "depth": 6, "fan_in": 2, "proteins": 500,
+              "transcripts": 2000, "records": 50},
+    "medium": {"terms": 5000, "depth": 8, "fan_in": 2, "proteins": 5000,
+               "transcripts": 20000, "records": 500},
+    "large": {"terms": 40000, "depth": 10, "fan_in": 3, "proteins": 20000,
+              "transcripts": 200000, "records": 5000},
+}
+
+BASELINE_FILENAME = "benchmark_baseline.json"
+NUCLEOTIDES = "ACGT"
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+ASPECTS = ("P", "F", "C")
+NAMESPACES = {"P": "biological_process", "F": "molecular_function",
+              "C": "cellular_component"}
+EVIDENCE_CODES = ("IDA", "IEA", "IBA", "ISS", "TAS", "IMP")
+
+
+def go_id(number):
+    """Return the GO ID of a term number."""
+
+    return f"GO:{number:07d}"
+
+
+def accession(number):
+    """Return the UniProt accession of a protein number."""
+
+    return f"Q{number:05d}"
+
+
+def generate_obo(filename, terms, depth, fan_in, rng):
+    """Write a GO terms file where the terms form a DAG of is_a relations.
+
+    The terms are split into depth levels and every term below the roots has
+    one to fan_in parents on the level above it.
+
+    Args:
+        filename(str): The output .obo file path.
+        terms(int): The number of terms.
+        depth(int): The number of levels of the DAG.
+        fan_in(int): The largest number of parents of a term.
+        rng(Random): The seeded random number generator.
+    Returns:
+        list: The GO IDs of the terms.
+    """
+
+    levels = [[] for _ in range(depth)]
+    for number in range(1, terms + 1):
+        # Put at least one term on every level, the rest at random
+        level = number - 1 if number <= depth else rng.randrange(1, depth)
+        levels[level].append(number)
+
+    with open(filename, "w") as obo_file:
+        obo_file.write("format-version: 1.2\nontology: go\n\n")
+        for level, numbers in enumerate(levels):
+            for number in numbers:
+                obo_file.write(f"[Term]\nid: {go_id(number)}\n"
+                               f"name: term {number} of level {level}\n"
+                               f"namespace: {NAMESPACES[ASPECTS[number % 3]]}"
+                               "\n")
+                if level:
+                    parents = rng.sample(levels[level - 1], min(
+                        rng.randint(1, fan_in), len(levels[level - 1])))
+                    for parent in sorted(parents):
+                        obo_file.write(f"is_a: {go_id(parent)} ! term "
+                                       f"{parent}\n")
+                obo_file.write("\n")
+
+    return [go_id(number) for number in range(1, terms + 1)]
+
+
+def generate_gaf(filename, proteins, go_ids, rng, terms_per_protein=8):
+    """Write a GAF 2.2 gene association file.
+
+    Args:
+        filename(str): The output .gaf file path.
+        proteins(int): The number of proteins.
+        go_ids(list): The GO IDs to annotate the proteins with.
+        rng(Random): The seeded random number generator.
+        terms_per_protein(int): The largest number of annotations of a
+                                protein.
+    Returns:
+        None
+    """
+
+    with open(filename, "w") as gaf_file:
+        gaf_file.write("!gaf-version: 2.2\n!generated-by: benchmark.py\n")
+        for number in range(proteins):
+            for _ in range(rng.randint(1, terms_per_protein)):
+                term = rng.choice(go_ids)
+                gaf_file.write("\t".join([
+                    "UniProtKB", accession(number), f"GENE{number}", "",
+                    term, "GO_REF:0000002", rng.choice(EVIDENCE_CODES), "",
+                    ASPECTS[int(term[3:]) % 3], f"Protein {number}", "",
+                    "protein", "taxon:9606", "20260101", "UniProt", "",
+                    ""]) + "\n")
+
+
+def generate_outfmt6(filename, transcripts, proteins, rng, hits=3):
+    """Write a BLAST tabular file with up to hits hits per transcript, about
+    half of the transcripts have a hit over 99% identity.
+
+    Args:
+        filename(str): The output .outfmt6 file path.
+        transcripts(int): The number of transcripts.
+        proteins(int): The number of proteins.
+        rng(Random): The seeded random number generator.
+        hits(int): The largest number of hits of a transcript.
+    Returns:
+        None
+    """
+
+    with open(filename, "w") as blast_file:
+        for number in range(transcripts):
+            query = f"TRINITY_DN{number}_c0_g1_i1|m.{number * 3 + 1}"
+            for hit in range(rng.randint(1, hits)):
+                protein = rng.randrange(proteins)
+                identity = rng.choice((100.0, 99.5, 97.3, 85.1)) if hit \
+                    else rng.choice((100.0, 99.6, 72.4))
+                length = rng.randint(50, 900)
+                mismatches = round(length * (100 - identity) / 100)
+                evalue = rng.choice(("0.0", "1e-150", "3e-42", "2e-10"))
+                blast_file.write("\t".join(map(str, [
+                    query, f"gi|{protein + 1}|sp|{accession(protein)}.1|"
+                    f"PROT{protein}_HUMAN", f"{identity:.2f}", length,
+                    mismatches, 0, 1, length, 1, length, evalue,
+                    rng.randint(50, 1800)])) + "\n")
+
+
+def generate_matrix(filename, transcripts, rng, fraction=0.05):
+    """Write a differential expression matrix of a fraction of the
+    transcripts under the four conditions.
+
+    Args:
+        filename(str): The output .matrix file path.
+        transcripts(int): The number of transcripts.
+        rng(Random): The seeded random number generator.
+        fraction(float): The fraction of the transcripts in the matrix.
+    Returns:
+        None
+    """
+
+    count = max(1, int(transcripts * fraction))
+    with open(filename, "w") as matrix_file:
+        matrix_file.write("\tsp_ds\tsp_hs\tsp_log\tsp_plat\n")
+        for number in sorted(rng.sample(range(transcripts), count)):
+            values = [f"{rng.uniform(-8, 8):.3f}" for _ in range(4)]
+            matrix_file.write("\t".join([f"TRINITY_DN{number}_c0_g1_i1",
+                                         *values]) + "\n")
+
+
+def format_origin(sequence):
+    """Return the ORIGIN lines of a GenBank sequence."""
+
+    lines = []
+    for start in range(0, len(sequence), 60):
+        blocks = [sequence[i:i + 10].lower()
+                  for i in range(start, min(start + 60, len(sequence)), 10)]
+        lines.append(f"{start + 1:>9} " + " ".join(blocks))
+    return "\n".join(lines)
+
+
+def generate_genbank(filename, records, rng, min_length=500,
+                     max_length=5000):
+    """Write a GenBank file with one gene and one CDS feature per record.
+
+    Args:
+        filename(str): The output .gb file path.
+        records(int): The number of records.
+        rng(Random): The seeded random number generator.
+        min_length(int): The shortest sequence.
+        max_length(int): The longest sequence.
+    Returns:
+        list: The sequences of the records.
+    """
+
+    sequences = []
+    with open(filename, "w") as gb_file:
+        for number in range(records):
+            length = rng.randint(min_length, max_length)
+            sequence = "".join(rng.choices(NUCLEOTIDES, k=length))
+            sequences.append(sequence)
+            cds_start = rng.randint(1, length // 4)
+            cds_end = cds_start + (length - cds_start) // 3 * 3 - 1
+            gb_file.write(
+                f"LOCUS       NM_{number:06d}    {length} bp    mRNA    "
+                f"linear   PRI 01-JAN-2026\n"
+                f"DEFINITION  Homo sapiens generated gene {number} (GEN"
+                f"{number}), transcript\n            variant 1, mRNA.\n"
+                f"ACCESSION   NM_{number:06d}\n"
+                f"VERSION     NM_{number:06d}.1\n"
+                f"FEATURES             Location/Qualifiers\n"
+                f"     source          1..{length}\n"
+                f"     gene            1..{length}\n"
+                f"                     /gene=\"GEN{number}\"\n"
+                f"     CDS             {cds_start}..{cds_end}\n"
+                f"                     /gene=\"GEN{number}\"\n"
+                f"                     /protein_id=\"NP_{number:06d}.1\"\n"
+                f"ORIGIN      \n{format_origin(sequence)}\n//\n")
+
+    return sequences
+
+
+def generate_uniprot(filename, entries, go_ids, rng):
+    """Write a UniProt flat file of reviewed and unreviewed entries with GO
+    cross-references.
+
+    Args:
+        filename(str): The output .txt file path.
+        entries(int): The number of entries.
+        go_ids(list): The GO IDs of the cross-references.
+        rng(Random): The seeded random number generator.
+    Returns:
+        None
+    """
+
+    with open(filename, "w") as uniprot_file:
+        for number in range(entries):
+            sequence = "".join(rng.choices(AMINO_ACIDS,
+                                           k=rng.randint(50, 1500)))
+            status = "Reviewed" if number % 4 else "Unreviewed"
+            lines = [
+                f"ID   PROT{number}_HUMAN            {status};        "
+                f"{len(sequence)} AA.",
+                f"AC   {accession(number)};",
+                "DT   01-JAN-1990, integrated into UniProtKB/Swiss-Prot.",
+                f"DT   01-JAN-1990, sequence version {number % 3 + 1}.",
+                "DT   01-JAN-2026, entry version 100.",
+                f"DE   RecName: Full=Generated protein {number};",
+                f"GN   Name=GEN{number};",
+                "OS   Homo sapiens (Human).",
+                "OC   Eukaryota; Metazoa; Chordata; Mammalia; Primates.",
+                "OX   NCBI_TaxID=9606;",
+            ]
+            for term in rng.sample(go_ids, min(len(go_ids),
+                                               rng.randint(0, 6))):
+                aspect = ASPECTS[int(term[3:]) % 3]
+                lines.append(f"DR   GO; {term}; {aspect}:term; "
+                             f"{rng.choice(EVIDENCE_CODES)}:UniProtKB.")
+            lines.append(f"PE   {rng.randint(1, 5)}: Evidence at protein "
+                         "level;")
+            lines.append(f"SQ   SEQUENCE   {len(sequence)} AA;  0 MW;  "
+                         "0000000000000000 CRC64;")
+            for start in range(0, len(sequence), 60):
+                line = sequence[start:start + 60]
+                lines.append("     " + " ".join(
+                    line[i:i + 10] for i in range(0, len(line), 10)))
+            uniprot_file.write("\n".join(lines) + "\n//\n")
+
+
+def generate_files(directory, scale, seed=0):
+    """Write all the input files of a scale.
+
+    Args:
+        directory(str): The directory of the files.
+        scale(str): The scale name, a key of SCALES.
+        seed(int): The seed of the random number generator.
+    Returns:
+        dict: The file path of each file type and the transcript
+        sequences.
+    """
+
+    settings = SCALES[scale]
+    rng = random.Random(f"{seed}-{scale}")
+    files = {extension: os.path.join(directory, f"{scale}.{extension}")
+             for extension in ("obo", "gaf", "outfmt6", "matrix", "gb",
+                               "txt")}
+
+    go_ids = generate_obo(files["obo"], settings["terms"], settings["depth"],
+                          settings["fan_in"], rng)
+    generate_gaf(files["gaf"], settings["proteins"], go_ids, rng)
+    generate_outfmt6(files["outfmt6"], settings["transcripts"],
+                     settings["proteins"], rng)
+    generate_matrix(files["matrix"], settings["transcripts"], rng)
+    files["sequences"] = generate_genbank(files["gb"], settings["records"],
+                                          rng)
+    generate_uniprot(files["txt"], settings["proteins"], go_ids, rng)
+
+    return files
+
+
+def measure(function, repeat=3):
+    """Time a function and measure its peak memory.
+
+    Args:
+        function(callable): The function without arguments to benchmark.
+        repeat(int): The number of timed runs.
+    Returns:
+        tuple: The shortest run time in seconds and the peak memory in
+        bytes allocated by the function.
+    """
+
+    seconds = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return seconds, peak
+
+
+def run_benchmarks(files, repeat=3, only=None):
+    """Run every benchmark on the files of one scale.
+
+    Args:
+        files(dict): The files made by generate_files.
+        repeat(int): The number of timed runs of each benchmark.
+        only(list): The names of the benchmarks to run, all by default.
+    Returns:
+        dict: The seconds and the peak memory (KiB) of each benchmark.
+    """
+
+    # The inputs of the functions that do not load a file themselves
+    transcript_to_protein = transcript_protein_dict(files["outfmt6"])
+    gene_to_go = gene_go_dict(files["gaf"])
+    go_to_desc = go_name_dict(files["obo"])
+    go_dict = go_is_a_dict(files["obo"])
+    protein_go_ids = map_protein_to_go(files["gaf"])
+    uniprot_records = list(read_records(files["txt"]))
+    # Every 50th term stands in for the slim
+    slim = set(sorted(go_dict)[::50])
+    table = slim_table(go_dict, slim)
+
+    def parents():
+        for go_ids in protein_go_ids.values():
+            for term in go_ids:
+                find_parent_terms(term, go_dict)
+
+    def uniprot_entries():
+        for record in uniprot_records:
+            entry = UniprotEntry(record)
+            entry.fasta_header()
+            entry.sequence
+
+    def translate():
+        for sequence in files["sequences"]:
+            for frame in range(3):
+                translate_sequence(sequence, frame)
+
+    benchmarks = {
+        "Blast": lambda: Blast(files["outfmt6"]),
+        "Matrix": lambda: Matrix(files["matrix"]),
+        "transcript_protein_dict":
+            lambda: transcript_protein_dict(files["outfmt6"]),
+        "gene_go_dict": lambda: gene_go_dict(files["gaf"]),
+        "go_name_dict": lambda: go_name_dict(files["obo"]),
+        "wrtie_annotations": lambda: wrtie_annotations(
+            files["matrix"], transcript_to_protein, gene_to_go, go_to_desc,
+            report_filename),
+        "split_terms": lambda: sum(1 for _ in split_terms(files["obo"])),
+        "go_is_a_dict": lambda: go_is_a_dict(files["obo"]),
+        "map_protein_to_go": lambda: map_protein_to_go(files["gaf"]),
+        "find_parent_terms": parents,
+        "slim_table": lambda: slim_table(go_dict, slim),
+        "map_to_slim":
+            lambda: slim_counts(map_to_slim(protein_go_ids, table)),
+        "split_records": lambda: sum(1 for _ in split_records(files["gb"])),
+        "UniprotEntry": uniprot_entries,
+        "translate_sequence": translate,
+    }
+
+    results = {}
+    # The report of wrtie_annotations is removed even if a benchmark fails
+    with tempfile.TemporaryDirectory() as output_directory:
+        report_filename = os.path.join(output_directory, "report.tsv")
+        for name, function in benchmarks.items():
+            if only and name not in only:
+                continue
+            seconds, peak = measure(function, repeat)
+            results[name] = {"seconds": round(seconds, 6),
+                             "peak_kib": round(peak / 1024, 1)}
+
+    return results
+
+
+def compare(results, baseline, tolerance=0.25):
+    """Compare the results of a run with the baseline.
+
+    Args:
+        results(dict): The results of each scale and benchmark.
+        baseline(dict): The baseline results in the same layout.
+        tolerance(float): The allowed relative increase, e.g. 0.25 for 25%.
+    Returns:
+        list: The (scale, benchmark, metric, baseline value, new value) of
+        every regression.
+    """
+
+    regressions = []
+    for scale, benchmarks in results.items():
+        for name, metrics in benchmarks.items():
+            old_metrics = baseline.get(scale, {}).get(name)
+            if not old_metrics:
+                continue
+            for metric, value in metrics.items():
+                old_value = old_metrics.get(metric)
+                if old_value and value > old_value * (1 + tolerance):
+                    regressions.append((scale, name, metric, old_value,
+                                        value))
+    return regressions
+
+
+@profile_option
+def main():
+    """The main function of the script that generates the input files, runs
+    the benchmarks and compares them with the baseline, or saves them as
+    the baseline with --save.
+
+    Usage:
+        python benchmark.py [--scale small,medium] [--repeat 3] [--save]
+            [--baseline benchmark_baseline.json] [--tolerance 0.25]
+            [--only Blast,Matrix] [--data-dir DIR] [--seed 0]
+    """
+
+    options = {"--scale": "small", "--repeat": "3",
+               "--baseline": BASELINE_FILENAME, "--tolerance": "0.25",
+               "--only": "", "--data-dir": "", "--seed": "0"}
+    for option in options:
+        if option in sys.argv:
+            index = sys.argv.index(option)
+            if index + 1 >= len(sys.argv):
+                sys.exit(f"Please provide a value after {option}.")
+            options[option] = sys.argv[index + 1]
+            del sys.argv[index:index + 2]
+    save = "--save" in sys.argv
+
+    scales = options["--scale"].split(",")
+    for scale in scales:
+        if scale not in SCALES:
+            sys.exit(f"Sorry, {scale} is not a scale. Please choose from " +
+                     ", ".join(SCALES) + ".")
+    try:
+        repeat = int(options["--repeat"])
+        tolerance = float(options["--tolerance"])
+        seed = int(options["--seed"])
+    except ValueError:
+        sys.exit("Please provide --repeat, --tolerance and --seed as "
+                 "numbers.")
+    only = options["--only"].split(",") if options["--only"] else None
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        directory = options["--data-dir"] or temporary_directory
+        os.makedirs(directory, exist_ok=True)
+        for scale in scales:
+            files = generate_files(directory, scale, seed)
+            results[scale] = run_benchmarks(files, repeat, only)
+
+    baseline = {}
+    if os.path.exists(options["--baseline"]):
+        with open(options["--baseline"]) as baseline_file:
+            baseline = json.load(baseline_file)
+    elif not save:
+        print(f"No baseline found at {options['--baseline']}, run with "
+              f"--save to create one.", file=sys.stderr)
+
+    print("scale\tbenchmark\tseconds\tpeak_kib\tbaseline_seconds\t"
+          "baseline_peak_kib")
+    for scale, benchmarks in results.items():
+        for name, metrics in benchmarks.items():
+            old_metrics = baseline.get(scale, {}).get(name, {})
+            print("\t".join(map(str, [
+                scale, name, metrics["seconds"], metrics["peak_kib"],
+                old_metrics.get("seconds", "NA"),
+                old_metrics.get("peak_kib", "NA")])))
+
+    if save:
+        for scale, benchmarks in results.items():
+            baseline.setdefault(scale, {}).update(benchmarks)
+        with open(options["--baseline"], "w") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        print(f"Saved the baseline to {options['--baseline']}.")
+        return
+
+    regressions = compare(results, baseline, tolerance)
+    for scale, name, metric, old_value, value in regressions:
+        print(f"Regression: {name} ({scale}) {metric} {old_value} -> "
+              f"{value}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
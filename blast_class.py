@@ -52,6 +52,9 @@ class Blast:
 
     Arg:
         blast_filename(string): One blast file name.
+        transcripts(set): The transcript IDs to keep. The hits of the other
+                          transcripts are skipped before they are parsed.
+                          All the hits are kept by default.
 
     Attribute:
         hits(list): A list of Blast objects from .outfmt6 file.
@@ -60,12 +63,16 @@ class Blast:
         __iter__: Return iterator of the blast input.
     """
 
-    def __init__(self, blast_filename):
+    def __init__(self, blast_filename, transcripts=None):
         self.blast_filename = blast_filename
         with open(blast_filename) as blast_file:
-            blast_hits = blast_file.read()
-            blast_hits = blast_hits.rstrip("\n").split("\n")
-            self.blast_hit_list = [BlastHit(hit) for hit in blast_hits]
+            # Skip the blank lines and check the transcript of each line
+            # before the hit is parsed
+            self.blast_hit_list = [
+                BlastHit(hit.rstrip("\n")) for hit in blast_file
+                if hit.strip() and (
+                    transcripts is None or
+                    hit.partition("\t")[0].rpartition("|")[0] in transcripts)]
 
     def __repr__(self):
         return f"Blast({self.blast_filename})"
@@ -0,0 +1,92 @@
+"""Compact set membership for very large collections of IDs.
+
+A Bloom filter stores the IDs as bits of a fixed-size bit array, a few
+bits per ID, instead of storing the IDs themselves. It never misses an ID
+that was added, but may report an ID that was not added with the chosen
+false positive rate, so it is used to skip records before the exact
+lookup, never to replace it.
+
+This file contains below class:
+    * BloomFilter - A class defines the bit array and the following
+                    methods:
+                       * add: To add one ID.
+                       * update: To add every ID of an iterable.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import math
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """Probabilistic set of string IDs.
+
+    Args:
+        capacity(int): The expected number of IDs.
+        error_rate(float): The false positive rate at the capacity.
+
+    Attributes:
+        size(int): The number of bits.
+        hash_count(int): The number of bits set per ID.
+        count(int): The number of IDs added.
+
+    Methods:
+        add: Add one ID.
+        update: Add every ID of an iterable.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate)
+                               / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def __repr__(self):
+        return f"BloomFilter({self.size} bits, {self.count} IDs)"
+
+    def __len__(self):
+        return self.count
+
+    def _positions(self, item):
+        """Return the bit positions of an ID by double hashing."""
+
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size
+                for i in range(self.hash_count)]
+
+    def __contains__(self, item):
+        bits = self._bits
+        return all(bits[position >> 3] & 1 << (position & 7)
+                   for position in self._positions(item))
+
+    def add(self, item):
+        """Add one ID.
+
+        Args:
+            item(str): The ID.
+        Returns:
+            None
+        """
+
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items):
+        """Add every ID of an iterable.
+
+        Args:
+            items(iterable): The IDs.
+        Returns:
+            None
+        """
+
+        for item in items:
+            self.add(item)
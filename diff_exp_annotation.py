@@ -13,6 +13,7 @@ Date: December 2019
 
 from diff_class import Matrix
 from blast_class import Blast
+from profiling import profile_option, stage, input_size
 
 def tuple_to_string(transcript_info):
     """Accept a tuple and retrun it as a tab-separated string.
@@ -27,21 +28,31 @@ def tuple_to_string(transcript_info):
     return "\t".join(transcript_info.data_attributes())
 
 
+@profile_option
 def main():
     """ The main function of script"""
 
-    #Open the BLAST and differential expressions files and create its objects
+    #Open the differential expressions and BLAST files and create its
+    #objects, keeping only the BLAST hits of the transcripts in the matrix
     blast_filename = "blastp.outfmt6"
     diff_exp_filename = "diffExpr.P1e-3_C2.matrix"
-    blast = Blast(blast_filename)
-    matrix = Matrix(diff_exp_filename)
+    with stage("scan matrix", bytes_read=input_size(diff_exp_filename)) \
+            as current:
+        matrix = Matrix(diff_exp_filename)
+        transcripts = {info.transcript for info in matrix.expressions}
+        current.records = len(matrix.expressions)
+    with stage("load BLAST", bytes_read=input_size(blast_filename)) \
+            as current:
+        blast = Blast(blast_filename, transcripts)
+        current.records = len(blast.blast_hit_list)
 
     #Load transcript_id and sp_id within the good BlastHit into dictionary
     blast_dict = {blast.transcript_id: blast.sp_id \
                  for blast in blast.blast_hit_list if blast.hit_good_match()}
 
     #Perform lookup and produce an output annotation file
-    with open("output.txt", "w") as output:
+    with stage("write report", len(matrix.expressions)), \
+            open("output.txt", "w") as output:
         for info in matrix.expressions:
             matrix_info = blast_dict.get(info.transcript, info.transcript) \
                                              + "\t" + tuple_to_string(info)
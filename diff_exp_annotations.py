@@ -7,6 +7,8 @@ expressed genes under 4 stress conditions with their association protein name
 , GO IDs, and GO description.
 
 This file contains below functions:
+    * matrix_transcripts - accept differential expression .matrix file return
+                           the set of its transcript IDs.
     * transcript_protein_dict - accept blast .outfmt6 file return a dictionary
                                 that maps transcript ID to SwissPort ID.
     * gene_go_dict - accept GO annotation .gaf file return a dictionary that
@@ -18,15 +20,81 @@ Author: Jia Yi Terri Shen
 Date: November 2019
 """
 
+import os
 import re
 
+from bloom_filter import BloomFilter
+from profiling import profile_option, profiled
 
-def transcript_protein_dict(blast_filename):
+# Matrices with more transcripts are kept in a Bloom filter instead of a set
+MAX_SET_SIZE = 5000000
+
+
+def _count_rows(filename, buffer_size=1 << 20):
+    """Return the number of lines of a file, counted in binary chunks."""
+
+    rows = 0
+    last = b"\n"
+    with open(filename, "rb") as input_file:
+        for chunk in iter(lambda: input_file.read(buffer_size), b""):
+            rows += chunk.count(b"\n")
+            last = chunk[-1:]
+    # A last line without a newline
+    return rows + (last != b"\n")
+
+
+@profiled("scan matrix")
+def matrix_transcripts(diff_exp_filename, max_set_size=MAX_SET_SIZE):
+    """Load the transcript IDs of the differential expression matrix, the
+    only transcripts looked up by wrtie_annotations.
+
+    Matrices that may have more rows than max_set_size, judged by their
+    file size, are counted first. When the row count is over
+    max_set_size the IDs go straight into a Bloom filter sized to the row
+    count, so the exact set is never built and the false positive rate
+    stays at the filter's error rate.
+
+    Args:
+        diff_exp_filename (str): File path to the .matrix file.
+        max_set_size (int): The largest number of IDs kept in a set.
+
+    Returns:
+        set: The transcript IDs, or a BloomFilter of them for very large
+             matrices. None if the file is not a .matrix file.
+    """
+
+    if not diff_exp_filename.endswith(".matrix"):
+        return None
+
+    transcripts = set()
+    # Every row takes at least two bytes, the ID and its newline
+    if os.path.getsize(diff_exp_filename) // 2 > max_set_size:
+        rows = _count_rows(diff_exp_filename) - 1
+        if rows > max_set_size:
+            transcripts = BloomFilter(rows)
+
+    with open(diff_exp_filename) as diff_exp_file:
+        diff_exp_file.readline()  # skip header
+
+        for transcript_info in diff_exp_file:
+            transcript = transcript_info.split("\t", 1)[0].rstrip()
+            if transcript:
+                transcripts.add(transcript)
+
+    return transcripts
+
+
+@profiled("load BLAST")
+def transcript_protein_dict(blast_filename, transcripts=None):
     """Load transcript IDs of query sequence (qseqid) and SwissProt ID
     of subject sequence (sseqid) without version number to the dictionary.
 
     Args:
         filename (str): File path to the blast output .outfmt6 file.
+        transcripts (set): The transcript IDs to keep, e.g. from
+                           matrix_transcripts. The other BLAST hits are
+                           skipped before they are parsed. All the hits
+                           are kept by default.
 
     Returns:
         dictionary: A dictionary matching the transctipt(key) to sp_id
@@ -41,6 +109,12 @@ def transcript_protein_dict(blast_filename):
     else:
         blast_file = open(blast_filename)
         for line in blast_file:
+            # Skip the transcripts that are never looked up
+            if transcripts is not None and \
+                    line.partition("\t")[0].rpartition("|")[0] \
+                    not in transcripts:
+                continue
+
             qseqid, sseqid, pident, *others = line.split("\t")
 
             # Only screen for identity over 99
@@ -57,6 +131,7 @@ def transcript_protein_dict(blast_filename):
     return transcript_to_protein
 
 
+@profiled("load GAF")
 def gene_go_dict(gene_to_go_filename):
     """Load protein IDs and corresponding unique GO terms to the dictionary.
 
@@ -74,6 +149,9 @@ def gene_go_dict(gene_to_go_filename):
     else:
         gene_to_go_file = open(gene_to_go_filename)
         for line in gene_to_go_file:
+            # Skip the GAF header lines starting with "!"
+            if line.startswith("!"):
+                continue
             column_info = re.split(r"\t", line)
             object_id = column_info[1]
             go_id = column_info[4]
@@ -89,6 +167,7 @@ def gene_go_dict(gene_to_go_filename):
     return gene_to_go
 
 
+@profiled("load OBO")
 def go_name_dict(go_terms_filename):
     """Load GO IDs and their names to the dictionary.
 
@@ -122,6 +201,7 @@ def go_name_dict(go_terms_filename):
     return go_to_desc
 
 
+@profiled("write report", count=None)
 def wrtie_annotations(diff_exp_filename, transcript_to_protein, gene_to_go,
                       go_to_desc, report_filename):
     """Loop through the differential expression file and dictionaries then
@@ -176,6 +256,7 @@ def wrtie_annotations(diff_exp_filename, transcript_to_protein, gene_to_go,
     return report_file
 
 
+@profile_option
 def main():
     "The main function of the script."
 
@@ -186,8 +267,10 @@ def main():
     go_terms_filename = "go-basic.obo"
     report_filename = "report.tsv"
 
-    # Make dictionaries
-    transcript_to_protein = transcript_protein_dict(blast_filename)
+    # Make dictionaries of the transcripts in the matrix only
+    transcripts = matrix_transcripts(diff_exp_filename)
+    transcript_to_protein = transcript_protein_dict(blast_filename,
+                                                    transcripts)
     gene_to_go = gene_go_dict(gene_to_go_filename)
     go_to_desc = go_name_dict(go_terms_filename)
 
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Build samtools faidx compatible .fai indexes and read any record or
+subsequence of an indexed FASTA file.
+
+The .fai index has one line per record with the name, length, byte offset
+of the first base, bases per line and bytes per line. The reader maps the
+FASTA file into memory and converts a range of bases into a range of bytes
+with the fixed line widths, so only the requested bases are copied.
+
+This file contains below functions and class:
+    * build_fai - writes the .fai index of a FASTA file.
+    * parse_region - returns the name, start and end of a region string.
+    * IndexedFasta - A class defines the random access to a FASTA file and
+                     the following method:
+                        * fetch: To read a record or a subsequence.
+                        * header: To read the header of a record.
+    * main - prints the requested regions of a FASTA file.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import os
+import mmap
+
+from profiling import profile_option
+
+
+def build_fai(filename, fai_filename=None):
+    """Scan the FASTA file and write its samtools faidx compatible index.
+
+    Args:
+        filename(string): A file path to the FASTA file.
+        fai_filename(string): A file path to the index, <filename>.fai by
+                              default.
+    Returns:
+        int: The number of records indexed.
+    Raises:
+        ValueError: If the lines of a record do not have the same length.
+    """
+
+    fai_filename = fai_filename or filename + ".fai"
+    entries = []
+
+    with open(filename, "rb") as fasta_file:
+        position = 0
+        entry = None
+        last_line = False
+        blank_line = False
+
+        for line in fasta_file:
+            line_start = position
+            position += len(line)
+
+            if line.startswith(b">"):
+                if entry:
+                    entries.append(entry)
+                header = line[1:].split()
+                name = header[0].decode() if header else ""
+                entry = [name, 0, position, 0, 0]
+                last_line = blank_line = False
+                continue
+
+            bases = len(line.rstrip(b"\r\n"))
+            if entry is None:
+                continue
+            if not bases:
+                blank_line = True
+                continue
+            if last_line or blank_line:
+                raise ValueError(f"Different line length in sequence "
+                                 f"'{entry[0]}' at byte {line_start}.")
+
+            terminator = len(line) - bases
+            if not entry[3]:
+                entry[3], entry[4] = bases, len(line)
+            elif bases > entry[3] or \
+                    terminator and terminator != entry[4] - entry[3]:
+                raise ValueError(f"Different line length in sequence "
+                                 f"'{entry[0]}' at byte {line_start}.")
+            # Only the last line of a record may be shorter
+            if bases < entry[3] or not terminator:
+                last_line = True
+            entry[1] += bases
+
+        if entry:
+            entries.append(entry)
+
+    with open(fai_filename, "w", encoding="utf-8") as fai_file:
+        for entry in entries:
+            fai_file.write("\t".join(map(str, entry)) + "\n")
+
+    return len(entries)
+
+
+def parse_region(region):
+    """Split a samtools style region, e.g. chr1:1000-2000, chr1:1000 or
+    chr1, into the name and the 0-based half-open start and end.
+
+    Args:
+        region(str): The region with 1-based inclusive coordinates.
+    Returns:
+        tuple: The name, start and end (None for the end of the record).
+    """
+
+    name, _, span = region.rpartition(":")
+    if not name or not span.replace(",", "").replace("-", "").isdigit():
+        return region, 0, None
+
+    span = span.replace(",", "")
+    start, _, end = span.partition("-")
+    return name, max(int(start) - 1, 0), int(end) if end else None
+
+
+class IndexedFasta:
+    """Random access to the records of a FASTA file with a .fai index.
+
+    The index is built when it does not exist or is older than the FASTA
+    file.
+
+    Args:
+        filename(string): A file path to the FASTA file.
+        fai_filename(string): A file path to the index, <filename>.fai by
+                              default.
+
+    Attributes:
+        filename(str): The FASTA file path.
+        index(dict): The length, offset, bases per line and bytes per line
+                     of each record name.
+
+    Methods:
+        fetch: Return a record or a subsequence.
+        fetch_region: Return the subsequence of a region string.
+        header: Return the header line of a record.
+        close: Close the FASTA file.
+    """
+
+    def __init__(self, filename, fai_filename=None):
+        self.filename = filename
+        fai_filename = fai_filename or filename + ".fai"
+
+        if not os.path.exists(fai_filename) or \
+                os.path.getmtime(fai_filename) < os.path.getmtime(filename):
+            build_fai(filename, fai_filename)
+
+        self.index = {}
+        with open(fai_filename, encoding="utf-8") as fai_file:
+            for line in fai_file:
+                name, *values = line.rstrip("\n").split("\t")
+                if name not in self.index:
+                    self.index[name] = tuple(map(int, values[:4]))
+
+        self._fasta_file = open(filename, "rb")
+        self._fasta_map = mmap.mmap(self._fasta_file.fileno(), 0,
+                                    access=mmap.ACCESS_READ) \
+            if os.path.getsize(filename) else b""
+
+    def __repr__(self):
+        return f"IndexedFasta({self.filename})"
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def fetch(self, name, start=0, end=None):
+        """Return the bases from start to end of a record.
+
+        Args:
+            name(str): The record name, the first word of the header.
+            start(int): The 0-based start.
+            end(int): The exclusive end, the end of the record by default.
+        Returns:
+            str: The subsequence on one line.
+        Raises:
+            KeyError: If the record is not in the index.
+        """
+
+        length, offset, line_bases, line_width = self.index[name]
+        end = length if end is None else min(end, length)
+        start = max(start, 0)
+        if start >= end:
+            return ""
+
+        byte_start = offset + start // line_bases * line_width \
+            + start % line_bases
+        byte_end = offset + end // line_bases * line_width + end % line_bases
+        bases = self._fasta_map[byte_start:byte_end]
+
+        return bases.replace(b"\n", b"").replace(b"\r", b"").decode()
+
+    def header(self, name):
+        """Return the header line of a record.
+
+        Args:
+            name(str): The record name, the first word of the header.
+        Returns:
+            str: The header without ">" and the line terminator.
+        Raises:
+            KeyError: If the record is not in the index.
+        """
+
+        offset = self.index[name][1]
+        line_end = offset - 1
+        line_start = self._fasta_map.rfind(b"\n", 0, line_end) + 1
+        return self._fasta_map[line_start + 1:line_end].rstrip(b"\r") \
+            .decode()
+
+    def fetch_region(self, region):
+        """Return the subsequence of a samtools style region string.
+
+        Args:
+            region(str): A region, e.g. chr1:1000-2000 (1-based inclusive).
+        Returns:
+            str: The subsequence on one line.
+        """
+
+        if region in self.index:
+            return self.fetch(region)
+        return self.fetch(*parse_region(region))
+
+    def close(self):
+        """Close the FASTA file."""
+
+        if self._fasta_map:
+            self._fasta_map.close()
+        self._fasta_file.close()
+
+
+@profile_option
+def main():
+    """The main function of the script that indexes a FASTA file and prints
+    the requested regions in FASTA format.
+
+    Usage:
+        python fasta_index.py sequences.fasta [chr1:1000-2000 ...]
+    """
+
+    if len(sys.argv) < 2:
+        sys.exit("Provide a FASTA file to index.")
+    elif not os.path.exists(sys.argv[1]):
+        sys.exit(sys.argv[1] + " not found. Check the file path and try again.")
+
+    try:
+        with IndexedFasta(sys.argv[1]) as fasta:
+            for region in sys.argv[2:]:
+                try:
+                    print(">" + region)
+                    print(fasta.fetch_region(region))
+                except KeyError:
+                    sys.exit(region + " not found in " + sys.argv[1])
+    except ValueError as error:
+        sys.exit(str(error))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Write FASTA files with fixed-width sequence lines.
+
+The sequences are wrapped by slicing them into fixed-width lines, which is
+much faster than textwrap on long sequences since there are no words to
+look for. The records are collected in a buffer and written in batches, and
+a samtools faidx compatible .fai index can be written while the FASTA file
+is written.
+
+This file contains below function and class:
+    * wrap_sequence - returns a sequence wrapped into fixed-width lines.
+    * FastaWriter - A class defines a buffered FASTA file writer and the
+                    following methods:
+                       * write: To add one record to the FASTA file.
+                       * flush: To write the buffered records.
+                       * close: To flush and close the files.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+
+def wrap_sequence(sequence, width=60):
+    """Wrap a sequence into lines of a fixed width.
+
+    Args:
+        sequence(str): A sequence without whitespaces.
+        width(int): The number of characters per line.
+    Returns:
+        str: The lines joined by new lines, without a trailing new line.
+    """
+
+    return "\n".join([sequence[i:i + width]
+                      for i in range(0, len(sequence), width)])
+
+
+class FastaWriter:
+    """Buffered writer of FASTA records.
+
+    Args:
+        output(str or file): A file path or an open text file.
+        width(int): The number of sequence characters per line.
+        fai(str or bool): A file path to write the .fai index to, or True
+                          to write it to <output>.fai.
+        blank_line(bool): Write an empty line after every record.
+        buffer_size(int): The number of characters buffered before they
+                          are written.
+        offset(int): The byte offset of the first record, when writing to
+                     a file that already has content.
+
+    Attributes:
+        count(int): The number of records written.
+        offset(int): The number of bytes written.
+
+    Methods:
+        write: Add one record to the FASTA file.
+        flush: Write the buffered records.
+        close: Flush the buffer and close the files opened by the writer.
+    """
+
+    def __init__(self, output, width=60, fai=None, blank_line=False,
+                 buffer_size=1 << 20, offset=0):
+        self.width = width
+        self.blank_line = blank_line
+        self.buffer_size = buffer_size
+        self.count = 0
+        self.offset = offset
+
+        # The offsets count the UTF-8 bytes of the headers
+        self._owns_output = isinstance(output, str)
+        self._output = open(output, "w", encoding="utf-8") \
+            if self._owns_output else output
+        if fai is True:
+            fai = output + ".fai"
+        self._fai = open(fai, "w", encoding="utf-8") if fai else None
+
+        self._buffer = []
+        self._buffered = 0
+
+    def __repr__(self):
+        return f"FastaWriter({self._output.name!r})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, header, sequence):
+        """Add one record to the FASTA file.
+
+        Args:
+            header(str): The header with or without the leading ">".
+            sequence(str): The sequence on one line.
+        Returns:
+            None
+        """
+
+        if header.startswith(">"):
+            header = header[1:]
+        header_line = ">" + header + "\n"
+        header_bytes = len(header_line) if header_line.isascii() \
+            else len(header_line.encode())
+
+        record = header_line + wrap_sequence(sequence, self.width) + "\n"
+        if self.blank_line:
+            record += "\n"
+
+        if self._fai:
+            line_bases = min(self.width, len(sequence))
+            name = header.split()[0] if header.strip() else header
+            self._fai.write(f"{name}\t{len(sequence)}\t"
+                            f"{self.offset + header_bytes}\t{line_bases}\t"
+                            f"{line_bases + 1}\n")
+
+        self.offset += header_bytes + len(record) - len(header_line)
+        self.count += 1
+
+        self._buffer.append(record)
+        self._buffered += len(record)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records to the output file."""
+
+        if self._buffer:
+            self._output.write("".join(self._buffer))
+            self._buffer = []
+            self._buffered = 0
+
+    def close(self):
+        """Flush the buffer and close the files opened by the writer."""
+
+        self.flush()
+        if self._fai:
+            self._fai.close()
+        if self._owns_output:
+            self._output.close()
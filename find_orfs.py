@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Find the open reading frames (ORFs) of DNA sequences in all six frames.
+
+Every start and stop codon position of a sequence is indexed per reading
+frame in one scan, then the ORFs are enumerated by walking the start and
+stop positions of each frame side by side, so only the coding regions are
+translated. The ORFs are yielded one at a time which keeps memory low for
+genome-scale inputs.
+
+This file contains below functions:
+    * reverse_complement - returns the reverse complement of a sequence.
+    * index_codons - returns the start and stop codon positions per frame.
+    * find_orfs - yields the ORFs of a sequence in all six frames.
+    * main - writes the ORFs of a multi-FASTA file into a .tsv file.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import re
+from collections import namedtuple
+
+from genetic_code import get_code
+from translate_mrna import read_fasta
+from profiling import profile_option
+
+START_CODONS = ("ATG",)
+STOP_CODONS = ("TAA", "TAG", "TGA")
+COMPLEMENT = str.maketrans("ACGTUNacgtun", "TGCAANtgcaan")
+
+Orf = namedtuple("Orf", ["strand", "frame", "start", "end", "has_stop",
+                         "peptide"])
+
+
+def reverse_complement(sequence):
+    """Return the reverse complement of a DNA sequence.
+
+    Args:
+        sequence(string): A DNA sequence.
+    Returns:
+        string: The reverse complement of the sequence.
+    """
+
+    return sequence.translate(COMPLEMENT)[::-1]
+
+
+def index_codons(sequence, starts=START_CODONS, stops=STOP_CODONS):
+    """Scan the sequence once and record the position of every start and
+    stop codon in each of the three forward reading frames.
+
+    Args:
+        sequence(string): An upper case DNA sequence.
+        starts(tuple): The start codons.
+        stops(tuple): The stop codons.
+    Returns:
+        tuple: Two tuples of three sorted position lists, the start codons
+        and the stop codons of reading frames 0, 1 and 2.
+    """
+
+    codon_pattern = re.compile("(?=(" + "|".join(starts + stops) + "))")
+    stop_set = set(stops)
+
+    start_index = ([], [], [])
+    stop_index = ([], [], [])
+    for match in codon_pattern.finditer(sequence):
+        position = match.start()
+        if match.group(1) in stop_set:
+            stop_index[position % 3].append(position)
+        else:
+            start_index[position % 3].append(position)
+
+    return start_index, stop_index
+
+
+def _frame_orfs(sequence, starts, stops, frame, min_length, longest_only,
+                allow_partial):
+    """Yield (start, end, has_stop) of the ORFs of one frame, end exclusive
+    and excluding the stop codon."""
+
+    last_codon_end = frame + (len(sequence) - frame) // 3 * 3
+    stop_number = 0
+    used_stop = None
+
+    for start in starts:
+        # Move to the first stop codon downstream of this start codon.
+        while stop_number < len(stops) and stops[stop_number] < start:
+            stop_number += 1
+
+        if stop_number < len(stops):
+            end = stops[stop_number]
+            has_stop = True
+        elif allow_partial:
+            end = last_codon_end
+            has_stop = False
+        else:
+            return
+
+        # Nested ORFs share the stop codon of the longest one.
+        if longest_only and end == used_stop:
+            continue
+        used_stop = end
+
+        if (end - start) // 3 >= min_length:
+            yield start, end, has_stop
+
+
+def find_orfs(sequence, min_length=30, longest_only=False,
+              allow_partial=True, table_id=1, alt_starts=False):
+    """Find the ORFs on both strands of the sequence.
+
+    Args:
+        sequence(string): A DNA or RNA sequence.
+        min_length(int): The minimum peptide length in amino acids.
+        longest_only(bool): Only report the longest ORF per stop codon
+                            instead of every nested ORF.
+        allow_partial(bool): Report the ORFs running off the end of the
+                             sequence without a stop codon.
+        table_id(int): The NCBI translation table ID which defines the stop
+                       codons, and the start codons with alt_starts.
+        alt_starts(bool): Also start ORFs at the alternative start codons
+                          of the table, e.g. TTG and CTG in table 1,
+                          instead of ATG only. The start codon is always
+                          translated as M, like an initiator tRNA would.
+    Yields:
+        Orf: The strand ("+" or "-"), the frame (1 to 3 or -1 to -3), the
+        0-based start and exclusive end on the forward strand including
+        the stop codon, if a stop codon was found, and the peptide.
+    """
+
+    code = get_code(table_id)
+    starts = code.start_codons if alt_starts else START_CODONS
+    sequence = sequence.upper().replace("U", "T")
+    length = len(sequence)
+
+    for strand, strand_seq in (("+", sequence),
+                               ("-", reverse_complement(sequence))):
+        start_index, stop_index = index_codons(
+            strand_seq, starts, code.stop_codons)
+
+        for frame in range(3):
+            for start, end, has_stop in _frame_orfs(
+                    strand_seq, start_index[frame], stop_index[frame], frame,
+                    min_length, longest_only, allow_partial):
+                peptide = "M" + code.translate(strand_seq[start + 3:end])
+                orf_end = end + 3 if has_stop else end
+
+                if strand == "+":
+                    yield Orf(strand, frame + 1, start, orf_end, has_stop,
+                              peptide)
+                else:
+                    yield Orf(strand, -(frame + 1), length - orf_end,
+                              length - start, has_stop, peptide)
+
+
+@profile_option
+def main():
+    """The main function of the script that writes the ORFs of every record
+    of a multi-FASTA file into a .tsv file.
+
+    Usage:
+        python find_orfs.py sequences.fasta [output_name] [--min-length N]
+                            [--longest] [--table N] [--alt-starts]
+    """
+
+    min_length = 30
+    if "--min-length" in sys.argv:
+        index = sys.argv.index("--min-length")
+        try:
+            min_length = int(sys.argv[index + 1])
+        except (IndexError, ValueError):
+            sys.exit("Please provide the minimum length as an integer.")
+        del sys.argv[index:index + 2]
+
+    table_id = 1
+    if "--table" in sys.argv:
+        index = sys.argv.index("--table")
+        try:
+            table_id = get_code(sys.argv[index + 1]).table_id
+        except (IndexError, ValueError) as error:
+            sys.exit(f"Please provide a valid NCBI translation table. {error}")
+        del sys.argv[index:index + 2]
+
+    longest_only = "--longest" in sys.argv
+    if longest_only:
+        sys.argv.remove("--longest")
+
+    alt_starts = "--alt-starts" in sys.argv
+    if alt_starts:
+        sys.argv.remove("--alt-starts")
+
+    if len(sys.argv) < 2:
+        sys.exit("Provide a FASTA file to search for ORFs.")
+
+    input_file = sys.argv[1]
+    output_filename = (sys.argv[2] if len(sys.argv) > 2 else "orfs") + ".tsv"
+
+    try:
+        with open(output_filename, "w") as output:
+            output.write("record\tstrand\tframe\tstart\tend\tlength\t"
+                         "has_stop\tpeptide\n")
+            for header, sequence in read_fasta(input_file):
+                name = header.split()[0] if header.strip() else header
+                for orf in find_orfs(sequence, min_length, longest_only,
+                                     table_id=table_id,
+                                     alt_starts=alt_starts):
+                    row = [name, orf.strand, orf.frame, orf.start + 1,
+                           orf.end, len(orf.peptide), orf.has_stop,
+                           orf.peptide]
+                    output.write("\t".join(map(str, row)) + "\n")
+    except FileNotFoundError:
+        sys.exit(input_file + " not found. Check the file path and try again.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""Parse the FEATURES table of GenBank records and query the features by
+coordinates.
+
+The feature locations (including join, order and complement) of a record
+are parsed into compact arrays, one entry per feature plus one entry per
+location part. The features are indexed by an implicit augmented interval
+tree: the features are sorted by start and every node of the implicit
+binary tree over the sorted array stores the maximum end of its subtree,
+so the features overlapping a position or a range are found in
+O(log n + k) time.
+
+All the coordinates are 0-based and half-open like Python slices, i.e. the
+GenBank location 10..20 is stored as start 9 and end 20.
+
+This file contains below classes and functions:
+    * parse_location - returns the parts of a GenBank location string.
+    * FeatureTable - A class defines the features of one GenBank record.
+    * FeatureIndex - A class defines the interval index over a
+                     FeatureTable and the following methods:
+                        * overlap: To find the features overlapping a range.
+                        * at: To find the features covering a position.
+    * extract_cds - yields the CDS sequences of a GenBank record.
+    * main - writes the CDS sequences of a GenBank file, or maps variant
+             positions to the features overlapping them.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import os
+import re
+from array import array
+
+from parse_fasta import split_records, get_origin
+from fasta_writer import FastaWriter
+from find_orfs import reverse_complement
+from profiling import profile_option
+
+FEATURE_TYPES = ("CDS", "gene", "mRNA")
+NAME_QUALIFIERS = ("protein_id", "gene", "locus_tag", "product")
+
+LOCATION_TOKEN = re.compile(r"\w+\(|\)|,|[^,()]+")
+LOCATION_RANGE = re.compile(r"<?(\d+)(?:(?:\.\.|\^|\.)>?(\d+))?")
+
+
+def parse_location(location):
+    """Parse a GenBank location into its parts in transcription order.
+
+    Args:
+        location(str): A location, e.g. complement(join(1..5,10..>20)).
+    Returns:
+        list: The (start, end, strand) of each part, 0-based half-open with
+        strand 1 or -1. The parts on other records (J00194.1:1..10) are
+        skipped.
+    """
+
+    tokens = LOCATION_TOKEN.findall(location.replace(" ", ""))
+
+    def parse(position):
+        token = tokens[position]
+        if token == "complement(":
+            parts, position = parse(position + 1)
+            parts = [(start, end, -strand)
+                     for start, end, strand in reversed(parts)]
+            return parts, position + 1
+        if token.endswith("("):
+            # join, order and the other operators list their parts in order
+            parts = []
+            position += 1
+            while position < len(tokens) and tokens[position] != ")":
+                if tokens[position] == ",":
+                    position += 1
+                    continue
+                sub_parts, position = parse(position)
+                parts.extend(sub_parts)
+            return parts, position + 1
+
+        part_range = LOCATION_RANGE.fullmatch(token)
+        if not part_range:
+            return [], position + 1
+        start = int(part_range.group(1))
+        end = int(part_range.group(2) or start)
+        return [(start - 1, end, 1)], position + 1
+
+    parts = []
+    position = 0
+    while position < len(tokens):
+        if tokens[position] in (",", ")"):
+            position += 1
+            continue
+        sub_parts, position = parse(position)
+        parts.extend(sub_parts)
+
+    return parts
+
+
+def _feature_lines(record):
+    """Yield the feature key, location and qualifier lines of each feature
+    in the FEATURES table of a record."""
+
+    in_features = False
+    key = None
+    location = []
+    qualifiers = []
+
+    for line in record.split("\n"):
+        if line.startswith("FEATURES"):
+            in_features = True
+            continue
+        if not in_features:
+            continue
+        if line and not line.startswith(" "):
+            break
+
+        if len(line) > 5 and line[5] != " ":
+            if key:
+                yield key, "".join(location), qualifiers
+            key = line[5:21].strip()
+            location = [line[21:].strip()]
+            qualifiers = []
+        elif key:
+            value = line[21:].strip()
+            if value.startswith("/"):
+                qualifiers.append(value)
+            elif qualifiers:
+                qualifiers[-1] += " " + value
+            else:
+                location.append(value)
+
+    if key:
+        yield key, "".join(location), qualifiers
+
+
+class FeatureTable:
+    """Collection of the features of one GenBank record in compact arrays.
+
+    Args:
+        record(string): A multi-line GenBank record.
+        feature_types(tuple): The feature keys to keep, or None for all.
+
+    Attributes:
+        types(list): The feature key of each feature.
+        names(list): The first protein_id, gene, locus_tag or product
+                     qualifier of each feature.
+        starts(array): The smallest start of the parts of each feature.
+        ends(array): The largest end of the parts of each feature.
+        strands(array): The strand of the first part of each feature.
+        part_offsets(array): The first part of each feature, the parts of
+                             feature i are part_offsets[i] to
+                             part_offsets[i + 1].
+        part_starts(array): The start of each part.
+        part_ends(array): The end of each part.
+        part_strands(array): The strand of each part.
+
+    Methods:
+        parts: Return the parts of a feature.
+    """
+
+    def __init__(self, record, feature_types=FEATURE_TYPES):
+        self.types = []
+        self.names = []
+        self.starts = array("q")
+        self.ends = array("q")
+        self.strands = array("b")
+        self.part_offsets = array("q", [0])
+        self.part_starts = array("q")
+        self.part_ends = array("q")
+        self.part_strands = array("b")
+
+        for key, location, qualifiers in _feature_lines(record):
+            if feature_types and key not in feature_types:
+                continue
+            parts = parse_location(location)
+            if not parts:
+                continue
+
+            self.types.append(key)
+            self.names.append(self._name(qualifiers))
+            self.starts.append(min(start for start, _, _ in parts))
+            self.ends.append(max(end for _, end, _ in parts))
+            self.strands.append(parts[0][2])
+            for start, end, strand in parts:
+                self.part_starts.append(start)
+                self.part_ends.append(end)
+                self.part_strands.append(strand)
+            self.part_offsets.append(len(self.part_starts))
+
+    def __repr__(self):
+        return f"FeatureTable({len(self)} features)"
+
+    def __len__(self):
+        return len(self.types)
+
+    @staticmethod
+    def _name(qualifiers):
+        """Return the value of the first naming qualifier found."""
+
+        values = {}
+        for qualifier in qualifiers:
+            name, _, value = qualifier[1:].partition("=")
+            if name in NAME_QUALIFIERS and name not in values:
+                values[name] = value.strip('"')
+        for name in NAME_QUALIFIERS:
+            if name in values:
+                return values[name]
+        return ""
+
+    def parts(self, feature):
+        """Return the (start, end, strand) parts of a feature.
+
+        Args:
+            feature(int): The feature number.
+        Returns:
+            list: The parts in transcription order.
+        """
+
+        first, last = self.part_offsets[feature], \
+            self.part_offsets[feature + 1]
+        return list(zip(self.part_starts[first:last],
+                        self.part_ends[first:last],
+                        self.part_strands[first:last]))
+
+
+class FeatureIndex:
+    """Interval index over the features of a FeatureTable.
+
+    Args:
+        table(FeatureTable): The features to index.
+
+    Attributes:
+        table(FeatureTable): The indexed features.
+
+    Methods:
+        overlap: Return the features overlapping a range.
+        at: Return the features covering a position.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self._order = array("q", sorted(range(len(table)),
+                                        key=table.starts.__getitem__))
+        self._starts = array("q", (table.starts[i] for i in self._order))
+        self._ends = array("q", (table.ends[i] for i in self._order))
+        self._max_ends = array("q", self._ends)
+        self._root_level = self._augment()
+
+    def __repr__(self):
+        return f"FeatureIndex({self.table!r})"
+
+    def _augment(self):
+        """Store the maximum end of each subtree of the implicit tree in
+        _max_ends and return the level of the root."""
+
+        size = len(self._ends)
+        if not size:
+            return -1
+
+        max_ends = self._max_ends
+        last_i = 0
+        last = self._ends[0]
+        for i in range(0, size, 2):
+            last_i, last = i, self._ends[i]
+
+        level = 1
+        while 1 << level <= size:
+            half = 1 << (level - 1)
+            for i in range((half << 1) - 1, size, half << 2):
+                right = max_ends[i + half] if i + half < size else last
+                max_ends[i] = max(self._ends[i], max_ends[i - half], right)
+            last_i = last_i - half if last_i >> level & 1 else last_i + half
+            if last_i < size and max_ends[last_i] > last:
+                last = max_ends[last_i]
+            level += 1
+
+        return level - 1
+
+    def overlap(self, start, end):
+        """Return the features overlapping the range start to end.
+
+        Args:
+            start(int): The 0-based start of the range.
+            end(int): The exclusive end of the range.
+        Returns:
+            list: The feature numbers in the FeatureTable, sorted by start.
+        """
+
+        size = len(self._starts)
+        if size == 0:
+            return []
+
+        hits = []
+        starts, ends, max_ends = self._starts, self._ends, self._max_ends
+        stack = [(self._root_level, (1 << self._root_level) - 1, False)]
+        while stack:
+            level, node, left_done = stack.pop()
+            if level <= 3:
+                # Scan the small subtree as a sorted list
+                first = node >> level << level
+                last = min(first + (1 << (level + 1)) - 1, size)
+                for i in range(first, last):
+                    if starts[i] >= end:
+                        break
+                    if start < ends[i]:
+                        hits.append(i)
+            elif not left_done:
+                stack.append((level, node, True))
+                left = node - (1 << (level - 1))
+                if left >= size or max_ends[left] > start:
+                    stack.append((level - 1, left, False))
+            elif node < size and starts[node] < end:
+                if start < ends[node]:
+                    hits.append(node)
+                stack.append((level - 1, node + (1 << (level - 1)), False))
+
+        return [self._order[i] for i in hits]
+
+    def at(self, position):
+        """Return the features covering a 0-based position.
+
+        Args:
+            position(int): The 0-based position.
+        Returns:
+            list: The feature numbers in the FeatureTable, sorted by start.
+        """
+
+        return self.overlap(position, position + 1)
+
+
+def extract_cds(record, table=None):
+    """Extract the CDS sequences of a GenBank record.
+
+    Args:
+        record(string): A multi-line GenBank record.
+        table(FeatureTable): The parsed features, parsed from the record if
+                             not given.
+    Yields:
+        tuple: The name of the CDS and its spliced sequence in the sense
+        orientation.
+    """
+
+    table = table or FeatureTable(record, ("CDS",))
+    sequence = get_origin(record)
+
+    for feature, feature_type in enumerate(table.types):
+        if feature_type != "CDS":
+            continue
+        pieces = []
+        for start, end, strand in table.parts(feature):
+            piece = sequence[start:end]
+            pieces.append(piece if strand == 1 else reverse_complement(piece))
+        yield table.names[feature], "".join(pieces)
+
+
+@profile_option
+def main():
+    """The main function of the script that writes the CDS sequences of a
+    GenBank file to a FASTA file, or with --variants maps the positions of a
+    tab-separated file (accession and 1-based position per line) to the
+    features overlapping them.
+
+    Usage:
+        python genbank_features.py input.gb [output_name]
+        python genbank_features.py input.gb [output_name] --variants file.tsv
+    """
+
+    variants_filename = None
+    if "--variants" in sys.argv:
+        index = sys.argv.index("--variants")
+        if index + 1 >= len(sys.argv):
+            sys.exit("Please provide a variants .tsv file.")
+        variants_filename = sys.argv[index + 1]
+        del sys.argv[index:index + 2]
+
+    if len(sys.argv) < 2 or not sys.argv[1].endswith(".gb"):
+        sys.exit("Provide a GenBank file to parse the features from.")
+    input_file = sys.argv[1]
+    if not os.path.exists(input_file):
+        sys.exit(input_file + " not found. Check the file path and try again.")
+
+    variants = {}
+    if variants_filename:
+        try:
+            with open(variants_filename) as variants_file:
+                for line in variants_file:
+                    if line.strip():
+                        accession, position = line.split("\t")[:2]
+                        variants.setdefault(accession, []).append(
+                            int(position))
+        except FileNotFoundError:
+            sys.exit(variants_filename + " not found. Check the file path " +
+                     "and try again.")
+
+    output_filename = (sys.argv[2] if len(sys.argv) > 2 else
+                       ("features" if variants_filename else "cds"))
+    output_filename += ".tsv" if variants_filename else ".fasta"
+
+    # Map the variant positions to the features overlapping them
+    if variants_filename:
+        with open(output_filename, "w") as output:
+            for record in split_records(input_file):
+                accession = "".join(re.findall(r"^VERSION\s*(\S+)", record,
+                                               re.M))
+                if accession not in variants:
+                    continue
+                table = FeatureTable(record)
+                feature_index = FeatureIndex(table)
+                for position in variants[accession]:
+                    for feature in feature_index.at(position - 1):
+                        output.write("\t".join([
+                            accession, str(position), table.types[feature],
+                            table.names[feature],
+                            str(table.starts[feature] + 1),
+                            str(table.ends[feature])]) + "\n")
+        return
+
+    with FastaWriter(output_filename, width=70) as writer:
+        for record in split_records(input_file):
+            accession = "".join(re.findall(r"^VERSION\s*(\S+)", record, re.M))
+            for name, sequence in extract_cds(record):
+                writer.write(accession + " " + name, sequence)
+
+if __name__ == "__main__":
+    main()
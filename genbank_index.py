@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""Build a persistent accession index for random access into GenBank files.
+
+The index maps the VERSION accession of every record to the byte offset and
+length of the record in the GenBank file. It is stored next to the input as
+a compact binary file (<input>.gb.gbi) sorted by accession, so that a record
+is found by a binary search over the memory-mapped index and read with a
+single seek instead of parsing the whole file.
+
+The index file contains a header (magic, key width, record count and the
+size of the indexed GenBank file) followed by fixed-width entries of the
+null-padded accession, the byte offset and the length of each record.
+
+This file contains below class and functions:
+    * build_index - writes the index of a GenBank file.
+    * GenbankIndex - A class defines the random access to a GenBank file
+                     and the following methods:
+                        * get_record: To read one record by accession.
+                        * get_fasta: To convert one record to FASTA.
+    * main - prints the FASTA records of the requested accessions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import os
+import mmap
+import struct
+
+from parse_fasta import record_offsets, decode_records, convert_record
+from profiling import profile_option
+
+INDEX_MAGIC = b"GBI1"
+HEADER = struct.Struct(">4sIIQ")
+
+
+def index_filename(filename):
+    """Return the index file path of a GenBank file."""
+
+    return filename + ".gbi"
+
+
+def build_index(filename, index_path=None):
+    """Scan the GenBank file for the record boundaries and the VERSION line
+    of each record and write the sorted binary index.
+
+    Args:
+        filename(string): A file path to the GenBank file.
+        index_path(string): A file path to the index, <filename>.gbi by
+                            default.
+    Returns:
+        int: The number of records indexed.
+    """
+
+    index_path = index_path or index_filename(filename)
+    entries = {}
+
+    with open(filename, "rb") as gb_file:
+        if os.path.getsize(filename):
+            gb_map = mmap.mmap(gb_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            gb_map = b""
+
+        for start, end in record_offsets(filename):
+            if gb_map.find(b"LOCUS", start, end) == -1:
+                continue
+
+            version = gb_map.find(b"\nVERSION", start, end)
+            if version == -1:
+                continue
+            line_end = gb_map.find(b"\n", version + 1, end)
+            fields = gb_map[version + 1:line_end if line_end != -1 else end] \
+                .split()
+            if len(fields) > 1 and fields[1] not in entries:
+                entries[fields[1]] = (start, end - start)
+
+        if gb_map:
+            gb_map.close()
+
+    key_width = max(map(len, entries), default=1)
+    entry_struct = struct.Struct(f">{key_width}sQQ")
+    with open(index_path, "wb") as index_file:
+        index_file.write(HEADER.pack(INDEX_MAGIC, key_width, len(entries),
+                                     os.path.getsize(filename)))
+        for key in sorted(entries):
+            index_file.write(entry_struct.pack(key, *entries[key]))
+
+    return len(entries)
+
+
+class GenbankIndex:
+    """Random access to the records of an indexed GenBank file.
+
+    The index is built when it does not exist or the GenBank file changed
+    size since it was built.
+
+    Args:
+        filename(string): A file path to the GenBank file.
+        index_path(string): A file path to the index, <filename>.gbi by
+                            default.
+
+    Attributes:
+        filename(str): The GenBank file path.
+        index_path(str): The index file path.
+
+    Methods:
+        get_record: Return the GenBank record of an accession.
+        get_fasta: Return the FASTA record of an accession.
+        close: Close the index and GenBank files.
+    """
+
+    def __init__(self, filename, index_path=None):
+        self.filename = filename
+        self.index_path = index_path or index_filename(filename)
+
+        if not self._is_current():
+            build_index(filename, self.index_path)
+
+        self._index_file = open(self.index_path, "rb")
+        self._index = mmap.mmap(self._index_file.fileno(), 0,
+                                access=mmap.ACCESS_READ)
+        _, self._key_width, self._count, _ = HEADER.unpack_from(self._index)
+        self._entry = struct.Struct(f">{self._key_width}sQQ")
+        self._gb_file = open(filename, "rb")
+
+    def __repr__(self):
+        return f"GenbankIndex({self.filename})"
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, accession):
+        return self._find(accession) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _is_current(self):
+        """Return True if the index exists and matches the GenBank file."""
+
+        try:
+            with open(self.index_path, "rb") as index_file:
+                magic, _, _, gb_size = HEADER.unpack(
+                    index_file.read(HEADER.size))
+        except (FileNotFoundError, struct.error):
+            return False
+        return magic == INDEX_MAGIC and \
+            gb_size == os.path.getsize(self.filename) and \
+            os.path.getmtime(self.index_path) >= \
+            os.path.getmtime(self.filename)
+
+    def _find(self, accession):
+        """Binary search the index for an accession and return its offset
+        and length, or None if it is not indexed."""
+
+        key = accession.encode("ascii").ljust(self._key_width, b"\0")
+        if len(key) > self._key_width:
+            return None
+
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, offset, length = self._entry.unpack_from(
+                self._index, HEADER.size + middle * self._entry.size)
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                return offset, length
+        return None
+
+    def get_record(self, accession):
+        """Return the GenBank record of an accession.
+
+        Args:
+            accession(str): The VERSION accession, e.g. NM_000546.6.
+        Returns:
+            string: The multi-line GenBank record with "\n" line endings.
+        Raises:
+            KeyError: If the accession is not in the index.
+        """
+
+        location = self._find(accession)
+        if location is None:
+            raise KeyError(accession)
+
+        offset, length = location
+        self._gb_file.seek(offset)
+        return decode_records(self._gb_file.read(length))
+
+    def get_fasta(self, accession):
+        """Return the FASTA header and sequence of an accession.
+
+        Args:
+            accession(str): The VERSION accession, e.g. NM_000546.6.
+        Returns:
+            string: The FASTA record made by get_header and get_sequence.
+        """
+
+        return convert_record(self.get_record(accession))
+
+    def close(self):
+        """Close the index and GenBank files."""
+
+        self._index.close()
+        self._index_file.close()
+        self._gb_file.close()
+
+
+@profile_option
+def main():
+    """The main function of the script that prints the FASTA records of the
+    requested accessions. The accessions are given on the command line or
+    one per line in a .txt file.
+
+    Usage:
+        python genbank_index.py input.gb NM_000546.6 [accessions.txt ...]
+    """
+
+    if len(sys.argv) < 2 or not sys.argv[1].endswith(".gb"):
+        sys.exit("Provide a GenBank file to index.")
+    elif not os.path.exists(sys.argv[1]):
+        sys.exit(sys.argv[1] + " not found. Check the file path and try again.")
+
+    accessions = []
+    for argument in sys.argv[2:]:
+        if argument.endswith(".txt"):
+            with open(argument) as accession_file:
+                accessions.extend(line.strip() for line in accession_file
+                                  if line.strip())
+        else:
+            accessions.append(argument)
+
+    with GenbankIndex(sys.argv[1]) as gb_index:
+        for accession in accessions:
+            try:
+                sys.stdout.write(gb_index.get_fasta(accession) + "\n\n")
+            except KeyError:
+                print(accession + " not found in " + sys.argv[1],
+                      file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
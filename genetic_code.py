@@ -0,0 +1,228 @@
+"""Registry of the NCBI genetic codes (translation tables).
+
+Each NCBI translation table is compiled once at import into a flat
+125-entry lookup table indexed by 25 * first + 5 * second + third base,
+where the bases T, C, A, G are 0 to 3 and any other letter (N) is 4. A codon
+containing N is translated when every possible codon gives the same amino
+acid (e.g. GCN is A) and to X otherwise.
+
+The translation works on bytes only: the sequence is converted to the base
+indexes with bytes.translate, the three codon positions are read as big
+integers and combined with one multiplication and addition each, and the
+resulting codon indexes are converted to amino acids with bytes.translate
+again. No NumPy is needed.
+
+This file contains below class and functions:
+    * GeneticCode - A class defines one compiled translation table.
+    * get_code - returns the compiled translation table of a table ID.
+    * translate - translates a DNA or RNA sequence with a table ID.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+from itertools import product
+
+BASES = "TCAG"
+
+# Table ID: (name, amino acids, start codons) in the NCBI TTTT..GGG order.
+NCBI_TABLES = {
+    1: ("Standard",
+        "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "---M---------------M---------------M----------------------------"),
+    2: ("Vertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG",
+        "--------------------------------MMMM---------------M------------"),
+    3: ("Yeast Mitochondrial",
+        "FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "----------------------------------MM---------------M------------"),
+    4: ("Mold, Protozoan and Coelenterate Mitochondrial; Mycoplasma",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "--MM---------------M------------MMMM---------------M------------"),
+    5: ("Invertebrate Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG",
+        "---M----------------------------MMMM---------------M------------"),
+    6: ("Ciliate, Dasycladacean and Hexamita Nuclear",
+        "FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+        "-----------------------------------M----------------------------"),
+    9: ("Echinoderm and Flatworm Mitochondrial",
+        "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+        "-----------------------------------M---------------M------------"),
+    10: ("Euplotid Nuclear",
+         "FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    11: ("Bacterial, Archaeal and Plant Plastid",
+         "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "---M---------------M------------MMMM---------------M------------"),
+    12: ("Alternative Yeast Nuclear",
+         "FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-------------------M---------------M----------------------------"),
+    13: ("Ascidian Mitochondrial",
+         "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG",
+         "---M------------------------------MM---------------M------------"),
+    14: ("Alternative Flatworm Mitochondrial",
+         "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    15: ("Blepharisma Macronuclear",
+         "FFLLSSSSYY*QCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    16: ("Chlorophycean Mitochondrial",
+         "FFLLSSSSYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    21: ("Trematode Mitochondrial",
+         "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+         "-----------------------------------M---------------M------------"),
+    22: ("Scenedesmus obliquus Mitochondrial",
+         "FFLLSS*SYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    23: ("Thraustochytrium Mitochondrial",
+         "FF*LSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "--------------------------------M--M---------------M------------"),
+    24: ("Rhabdopleuridae Mitochondrial",
+         "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG",
+         "---M---------------M---------------M---------------M------------"),
+    25: ("Candidate Division SR1 and Gracilibacteria",
+         "FFLLSSSSYY**CCGWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "---M-------------------------------M---------------M------------"),
+    26: ("Pachysolen tannophilus Nuclear",
+         "FFLLSSSSYY**CC*WLLLAPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-------------------M---------------M----------------------------"),
+    27: ("Karyorelict Nuclear",
+         "FFLLSSSSYYQQCCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    28: ("Condylostoma Nuclear",
+         "FFLLSSSSYYQQCCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    29: ("Mesodinium Nuclear",
+         "FFLLSSSSYYYYCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    30: ("Peritrich Nuclear",
+         "FFLLSSSSYYEECC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    31: ("Blastocrithidia Nuclear",
+         "FFLLSSSSYYEECCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "-----------------------------------M----------------------------"),
+    32: ("Balanophoraceae Plastid",
+         "FFLLSSSSYY*WCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+         "---M---------------M------------MMMM---------------M------------"),
+    33: ("Cephalodiscidae Mitochondrial",
+         "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG",
+         "---M---------------M---------------M---------------M------------"),
+}
+
+# Map every byte to its base index: T/U = 0, C = 1, A = 2, G = 3, other = 4.
+BASE_INDEX = bytearray([4] * 256)
+for index, bases in enumerate(("TtUu", "Cc", "Aa", "Gg")):
+    for base in bases.encode("ascii"):
+        BASE_INDEX[base] = index
+BASE_INDEX = bytes(BASE_INDEX)
+
+
+class GeneticCode:
+    """Collection of the compiled lookup tables of one NCBI genetic code.
+
+    Args:
+        table_id(int): The NCBI translation table ID.
+        name(str): The name of the genetic code.
+        amino_acids(str): The 64 amino acids in the NCBI codon order.
+        starts(str): The 64 start codon flags in the NCBI codon order.
+
+    Attributes:
+        table_id(int): The NCBI translation table ID.
+        name(str): The name of the genetic code.
+        forward(dict): The amino acid of each of the 64 codons.
+        start_codons(tuple): The start codons.
+        stop_codons(tuple): The stop codons.
+        lookup(bytes): The amino acid of each of the 125 codon indexes,
+                       padded to 256 bytes to be used by bytes.translate.
+
+    Methods:
+        translate: Return the translation of a DNA or RNA sequence.
+    """
+
+    def __init__(self, table_id, name, amino_acids, starts):
+        self.table_id = table_id
+        self.name = name
+
+        codons = ["".join(codon) for codon in product(BASES, repeat=3)]
+        self.forward = dict(zip(codons, amino_acids))
+        self.start_codons = tuple(codon for codon, flag in zip(codons, starts)
+                                  if flag == "M")
+        self.stop_codons = tuple(codon for codon in codons
+                                 if self.forward[codon] == "*")
+
+        # Resolve the codons with N when all the possible codons agree.
+        lookup = bytearray(256)
+        for first, second, third in product(range(5), repeat=3):
+            choices = {self.forward[BASES[a] + BASES[b] + BASES[c]]
+                       for a in (range(4) if first == 4 else (first,))
+                       for b in (range(4) if second == 4 else (second,))
+                       for c in (range(4) if third == 4 else (third,))}
+            amino_acid = choices.pop() if len(choices) == 1 else "X"
+            lookup[25 * first + 5 * second + third] = ord(amino_acid)
+        self.lookup = bytes(lookup)
+
+    def __repr__(self):
+        return f"GeneticCode({self.table_id}, {self.name!r})"
+
+    def translate(self, sequence):
+        """Translate a DNA or RNA sequence from its first base.
+
+        The trailing one or two bases that do not make a codon are ignored.
+
+        Args:
+            sequence(str or bytes): A DNA or RNA sequence in any case.
+        Returns:
+            str: The amino acid sequence with "*" for the stop codons.
+        """
+
+        if isinstance(sequence, str):
+            sequence = sequence.encode("ascii", "replace")
+        codon_count = len(sequence) // 3
+        if not codon_count:
+            return ""
+
+        bases = sequence[:codon_count * 3].translate(BASE_INDEX)
+
+        # Each byte of the combined integer stays below 125, so there are
+        # no carries between codons.
+        first = int.from_bytes(bases[0::3], "big")
+        second = int.from_bytes(bases[1::3], "big")
+        third = int.from_bytes(bases[2::3], "big")
+        codon_indexes = (25 * first + 5 * second + third).to_bytes(
+            codon_count, "big")
+
+        return codon_indexes.translate(self.lookup).decode("ascii")
+
+
+GENETIC_CODES = {table_id: GeneticCode(table_id, *table)
+                 for table_id, table in NCBI_TABLES.items()}
+
+
+def get_code(table_id=1):
+    """Return the compiled genetic code of an NCBI translation table.
+
+    Args:
+        table_id(int): The NCBI translation table ID.
+    Returns:
+        GeneticCode: The compiled genetic code.
+    """
+
+    try:
+        return GENETIC_CODES[int(table_id)]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unknown NCBI translation table: {table_id}. "
+                         f"Choose one of {sorted(GENETIC_CODES)}.") from None
+
+
+def translate(sequence, table_id=1):
+    """Translate a DNA or RNA sequence with an NCBI translation table.
+
+    Args:
+        sequence(str or bytes): A DNA or RNA sequence.
+        table_id(int): The NCBI translation table ID.
+    Returns:
+        str: The amino acid sequence with "*" for the stop codons.
+    """
+
+    return get_code(table_id).translate(sequence)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Map GO annotations onto a GO slim, e.g. goslim_generic.
+
+A GO slim is a small subset of broad GO terms. Every annotation is mapped
+to the slim terms among its GO term and the ancestors of the term. The
+slim terms of every GO term are found once, in one walk of the is_a DAG
+where each term reuses the slim terms of its parents, so mapping a whole
+proteome is one pass of table lookups.
+
+The slim is read from a slim .obo file (e.g. goslim_generic.obo) with
+--slim, or from the terms of go.obo tagged with a subset (goslim_generic
+by default) with --subset. The script writes the number of proteins, or of
+transcripts with --blast, mapped to every slim term, e.g.
+
+    python go_slim.py go-basic.obo genes.gaf counts --slim goslim_generic.obo
+    python go_slim.py go-basic.obo genes.gaf counts --blast blastp.outfmt6 \
+        --matrix diffExpr.P1e-3_C2.matrix --mapping transcripts_slim.tsv
+
+This file contains below functions:
+    * slim_terms - accept .obo file and return the GO IDs of a slim.
+    * slim_table - accept the is_a dictionary and the slim and return the
+                   slim terms of every GO term.
+    * map_to_slim - accept a dictionary of GO terms, e.g. from
+                    map_protein_to_go, and return the slim terms of each key.
+    * map_transcripts_to_slim - accept the transcript to protein and protein
+                                to GO terms dictionaries of the annotation
+                                report and return the slim terms of each
+                                transcript.
+    * slim_counts - return the number of keys mapped to every slim term.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import os
+import re
+from collections import Counter
+
+from diff_exp_annotations import (matrix_transcripts, transcript_protein_dict,
+                                  go_name_dict)
+from parse_humun_genes_go import (split_terms, parse_go_term,
+                                  map_protein_to_go, go_is_a_dict)
+from profiling import profile_option, stage, input_size
+
+DEFAULT_SUBSET = "goslim_generic"
+EMPTY = frozenset()
+
+
+def slim_terms(filename, subset=None):
+    """Load the GO IDs of a slim.
+
+    Args:
+        filename(string): A file path to a slim .obo file, or to the full GO
+                          terms file with subset.
+        subset(string): Keep only the terms tagged with this subset, e.g.
+                        goslim_generic. Every term is kept by default.
+    Return:
+        set: The GO IDs of the slim.
+    """
+
+    subset_pattern = re.compile(r"^subset:\s+(\S+)", re.M)
+
+    slim = set()
+    for record in split_terms(filename):
+        go_id, _ = parse_go_term(record)
+        if not go_id:
+            continue
+        if subset is None or subset in subset_pattern.findall(record):
+            slim.add(go_id[0])
+    return slim
+
+
+def slim_table(go_dict, slim):
+    """Find the slim terms of every GO term, which are the slim terms among
+    the term itself and all its parent terms.
+
+    The terms are visited parents first, so the slim terms of a term are
+    the union of the slim terms of its direct parents and every term is
+    visited once. Terms with the same slim terms share one frozenset.
+
+    Args:
+        go_dict(dictionary): The is_a parent terms of every GO term.
+        slim(set): The GO IDs of the slim.
+    Return:
+        dictionary: The frozenset of slim terms of each GO ID.
+    """
+
+    table = {}
+    shared = {EMPTY: EMPTY}
+
+    for go_id in go_dict:
+        # Walk up with a stack instead of recursion, the DAG is deep
+        stack = [go_id]
+        while stack:
+            term = stack[-1]
+            if term in table:
+                stack.pop()
+                continue
+
+            parents = go_dict.get(term, ())
+            pending = [parent for parent in parents if parent not in table]
+            if pending:
+                stack.extend(pending)
+                continue
+
+            stack.pop()
+            slims = set()
+            for parent in parents:
+                slims |= table[parent]
+            if term in slim:
+                slims.add(term)
+            slims = frozenset(slims)
+            table[term] = shared.setdefault(slims, slims)
+
+    return table
+
+
+def map_to_slim(go_terms, table):
+    """Map every key to the slim terms of its GO terms.
+
+    Args:
+        go_terms(dictionary): The GO terms of each key, e.g. the protein IDs
+                              from map_protein_to_go.
+        table(dictionary): The slim terms of every GO term from slim_table.
+    Return:
+        dictionary: The set of slim terms of each key. GO terms missing
+        from the table, e.g. obsolete terms, are not mapped.
+    """
+
+    mapping = {}
+    for key, go_ids in go_terms.items():
+        slims = set()
+        for go_id in go_ids:
+            slims |= table.get(go_id, EMPTY)
+        mapping[key] = slims
+    return mapping
+
+
+def map_transcripts_to_slim(transcript_to_protein, gene_to_go, table):
+    """Map every transcript of the annotation report to the slim terms of
+    the GO terms of its protein.
+
+    Args:
+        transcript_to_protein(dictionary): The protein ID of each transcript,
+                                           from transcript_protein_dict.
+        gene_to_go(dictionary): The GO terms of each protein ID.
+        table(dictionary): The slim terms of every GO term from slim_table.
+    Return:
+        dictionary: The set of slim terms of each transcript.
+    """
+
+    # Proteins hit by several transcripts are mapped once
+    proteins = {protein: gene_to_go.get(protein, ())
+                for protein in set(transcript_to_protein.values())}
+    protein_slims = map_to_slim(proteins, table)
+
+    return {transcript: protein_slims[protein]
+            for transcript, protein in transcript_to_protein.items()}
+
+
+def slim_counts(mapping):
+    """Count the keys mapped to every slim term.
+
+    Args:
+        mapping(dictionary): The slim terms of each key from map_to_slim.
+    Return:
+        Counter: The number of keys of each slim term.
+    """
+
+    counts = Counter()
+    for slims in mapping.values():
+        counts.update(slims)
+    return counts
+
+
+@profile_option
+def main():
+    """The main function of the script that maps the proteins of a GAF file,
+    or the transcripts of the annotation report, to a GO slim and writes the
+    number mapped to every slim term.
+
+    Usage:
+        python go_slim.py <go.obo> <genes.gaf> [<output>]
+            [--slim goslim.obo | --subset goslim_generic]
+            [--blast blastp.outfmt6 [--matrix diffExpr.matrix]]
+            [--mapping mapping.tsv]
+    """
+
+    options = {"--slim": None, "--subset": None, "--blast": None,
+               "--matrix": None, "--mapping": None}
+    for option in options:
+        if option in sys.argv:
+            index = sys.argv.index(option)
+            if index + 1 >= len(sys.argv):
+                sys.exit(f"Please provide a value for {option}.")
+            options[option] = sys.argv[index + 1]
+            del sys.argv[index:index + 2]
+
+    if len(sys.argv) not in (3, 4):
+        sys.exit("Please provide the GO terms .obo file and the gene "
+                 "association .gaf file.")
+
+    go_filename, gaf_filename = sys.argv[1:3]
+    slim_filename = options["--slim"] or go_filename
+    subset = None if options["--slim"] else \
+        options["--subset"] or DEFAULT_SUBSET
+    for filename in (go_filename, gaf_filename, slim_filename,
+                     options["--blast"], options["--matrix"]):
+        if filename and not os.path.exists(filename):
+            sys.exit(filename + " not found. Check the file path and try "
+                     "again.")
+
+    go_dict = go_is_a_dict(go_filename)
+    go_to_desc = go_name_dict(go_filename)
+
+    with stage("load slim", bytes_read=input_size(slim_filename)) as current:
+        slim = slim_terms(slim_filename, subset)
+        current.records = len(slim)
+    if not slim:
+        sys.exit("No slim terms found in " + slim_filename)
+
+    with stage("slim table") as current:
+        table = slim_table(go_dict, slim)
+        current.records = len(table)
+
+    # Map the proteins, or the transcripts through their BLAST hits
+    gene_to_go = map_protein_to_go(gaf_filename)
+    if options["--blast"]:
+        transcripts = matrix_transcripts(options["--matrix"]) \
+            if options["--matrix"] else None
+        transcript_to_protein = transcript_protein_dict(options["--blast"],
+                                                        transcripts)
+        with stage("map to slim", len(transcript_to_protein)):
+            mapping = map_transcripts_to_slim(transcript_to_protein,
+                                              gene_to_go, table)
+    else:
+        with stage("map to slim", len(gene_to_go)):
+            mapping = map_to_slim(gene_to_go, table)
+
+    with stage("write report", len(slim)):
+        counts = slim_counts(mapping)
+
+        output = open(sys.argv[3] + ".tsv", "w") if len(sys.argv) == 4 \
+            else sys.stdout
+        for go_id in sorted(slim):
+            output.write(f"{go_id}\t{go_to_desc.get(go_id, 'NA')}\t"
+                         f"{counts[go_id]}\n")
+        if output is not sys.stdout:
+            output.close()
+
+        if options["--mapping"]:
+            with open(options["--mapping"], "w") as mapping_file:
+                for key in sorted(mapping):
+                    slims = ",".join(sorted(mapping[key])) or "NA"
+                    mapping_file.write(f"{key}\t{slims}\n")
+
+
+if __name__ == "__main__":
+    main()
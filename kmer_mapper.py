@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""Map translated transcripts to near-identical SwissProt proteins with a
+k-mer index instead of a full BLAST search.
+
+The protein k-mers sampled every few residues of the SwissProt FASTA file
+(written by parse_uniprot_to_fasta.py) are hashed to 32 bits and stored
+with the number of their protein as one 64-bit integer per k-mer in a
+sorted array, which is saved next to the FASTA file (<input>.kmi). Every
+k-mer of a translated transcript is looked up by a binary search, the
+proteins sharing the most k-mers are aligned without gaps along their best
+diagonal and the hits are scored with BLOSUM62 like the ungapped BLAST
+extension.
+
+The hits are written in the BLAST tabular format (-outfmt 6), so the
+output is read by Blast and transcript_protein_dict without any change.
+The query is named <transcript>|m.<frame> and the subject
+gi|<protein number>|sp|<accession>.<version>|<entry name> like the legacy
+NCBI SwissProt database, where the protein number is the position of the
+protein in the FASTA file.
+
+The index only finds proteins sharing exact k-mers with the transcript, so
+it replaces BLAST for the near-identical (>= 95% identity) matches kept by
+transcript_protein_dict, not for distant homologs.
+
+This file contains below functions and class:
+    * build_kmer_index - writes the k-mer index of a protein FASTA file.
+    * KmerIndex - A class defines the k-mer index and the following
+                  methods:
+                     * candidates: To find the proteins sharing k-mers.
+                     * map_protein: To align a protein to its candidates.
+    * ungapped_alignment - returns the best ungapped alignment of a diagonal.
+    * map_transcripts - writes the hits of a transcript FASTA file.
+    * main - maps a transcript FASTA file to a SwissProt FASTA file.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import os
+import re
+import math
+import struct
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool
+
+from fasta_index import IndexedFasta
+from translate_mrna import read_fasta, translate_record
+from profiling import profile_option, stage, input_size
+
+INDEX_MAGIC = b"KMI1"
+HEADER = struct.Struct(">4sIIQQ")
+
+AMINO_ACIDS = "ARNDCQEGHILKMFPSTWYV"
+# Every residue outside the 20 amino acids breaks a k-mer
+RESIDUES = bytes(byte if chr(byte) in AMINO_ACIDS else ord("*")
+                 for byte in range(256))
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+MASK = (1 << 64) - 1
+
+BLOSUM62_ROWS = """
+ 4 -1 -2 -2  0 -1 -1  0 -2 -1 -1 -1 -1 -2 -1  1  0 -3 -2  0
+-1  5  0 -2 -3  1  0 -2  0 -3 -2  2 -1 -3 -2 -1 -1 -3 -2 -3
+-2  0  6  1 -3  0  0  0  1 -3 -3  0 -2 -3 -2  1  0 -4 -2 -3
+-2 -2  1  6 -3  0  2 -1 -1 -3 -4 -1 -3 -3 -1  0 -1 -4 -3 -3
+ 0 -3 -3 -3  9 -3 -4 -3 -3 -1 -1 -3 -1 -2 -3 -1 -1 -2 -2 -1
+-1  1  0  0 -3  5  2 -2  0 -3 -2  1  0 -3 -1  0 -1 -2 -1 -2
+-1  0  0  2 -4  2  5 -2  0 -3 -3  1 -2 -3 -1  0 -1 -3 -2 -2
+ 0 -2  0 -1 -3 -2 -2  6 -2 -4 -4 -2 -3 -3 -2  0 -2 -2 -3 -3
+-2  0  1 -1 -3  0  0 -2  8 -3 -3 -1 -2 -1 -2 -1 -2 -2  2 -3
+-1 -3 -3 -3 -1 -3 -3 -4 -3  4  2 -3  1  0 -3 -2 -1 -3 -1  3
+-1 -2 -3 -4 -1 -2 -3 -4 -3  2  4 -2  2  0 -3 -2 -1 -2 -1  1
+-1  2  0 -1 -3  1  1 -2 -1 -3 -2  5 -1 -3 -1  0 -1 -3 -2 -2
+-1 -1 -2 -3 -1  0 -2 -3 -2  1  2 -1  5  0 -2 -1 -1 -1 -1  1
+-2 -3 -3 -3 -2 -3 -3 -3 -1  0  0 -3  0  6 -4 -2 -2  1  3 -1
+-1 -2 -2 -1 -3 -1 -1 -2 -2 -3 -3 -1 -2 -4  7 -1 -1 -4 -3 -2
+ 1 -1  1  0 -1  0  0  0 -1 -2 -2  0 -1 -2 -1  4  1 -3 -2 -2
+ 0 -1  0 -1 -1 -1 -1 -2 -2 -1 -1 -1 -1 -2 -1  1  5 -2 -2  0
+-3 -3 -4 -4 -2 -2 -3 -2 -2 -3 -2 -3 -1  1 -4 -3 -2 11  2 -3
+-2 -2 -2 -3 -2 -1 -2 -3  2 -1 -1 -2 -1  3 -3 -2 -2  2  7 -1
+ 0 -3 -3 -3 -1 -2 -2 -3 -3  3  1 -2  1 -1 -2 -2  0 -3 -1  4
+"""
+BLOSUM62 = {(first, second): int(score)
+            for first, row in zip(AMINO_ACIDS, BLOSUM62_ROWS.split("\n")[1:])
+            for second, score in zip(AMINO_ACIDS, row.split())}
+UNKNOWN_SCORE = -1
+
+# Karlin-Altschul parameters of the ungapped BLOSUM62 scores
+LAMBDA = 0.3176
+KAPPA = 0.134
+
+UNIPROT_ID = re.compile(r"(?:sp|tr)\|([^|]+)\|(\S+)")
+SEQ_VERSION = re.compile(r"\bSV=(\d+)")
+
+
+def index_filename(filename):
+    """Return the k-mer index file path of a protein FASTA file."""
+
+    return filename + ".kmi"
+
+
+def kmer_hashes(sequence, k, step=1):
+    """Yield the position and the 32-bit hash of the k-mers of a protein.
+
+    Args:
+        sequence(str): A protein sequence.
+        k(int): The k-mer length, at most 8 residues.
+        step(int): The distance between the k-mers.
+    Yields:
+        tuple: The 0-based position and the hash of each k-mer without
+        unknown residues.
+    """
+
+    residues = sequence.upper().encode("ascii", "replace").translate(RESIDUES)
+    for position in range(0, len(residues) - k + 1, step):
+        kmer = residues[position:position + k]
+        if kmer.isalpha():
+            code = int.from_bytes(kmer, "big")
+            yield position, (code * HASH_MULTIPLIER & MASK) >> 32
+
+
+def build_kmer_index(filename, k=6, step=4, index_path=None):
+    """Hash the k-mers of every protein of a FASTA file and write the sorted
+    k-mer index.
+
+    The entries are sorted in 256 buckets of the high hash byte, so only
+    one bucket at a time is held in a list while the index is sorted.
+
+    Args:
+        filename(string): A file path to the protein FASTA file.
+        k(int): The k-mer length, at most 8 residues.
+        step(int): The distance between the indexed k-mers of a protein.
+        index_path(string): A file path to the index, <filename>.kmi by
+                            default.
+    Returns:
+        int: The number of k-mers indexed.
+    Raises:
+        ValueError: If the k-mer length is not between 1 and 8.
+    """
+
+    if not 1 <= k <= 8:
+        raise ValueError(f"The k-mer length {k} is not between 1 and 8.")
+
+    index_path = index_path or index_filename(filename)
+    buckets = [array("Q") for _ in range(256)]
+
+    with IndexedFasta(filename) as fasta:
+        for protein, name in enumerate(fasta):
+            for _, kmer_hash in kmer_hashes(fasta.fetch(name), k, step):
+                buckets[kmer_hash >> 24].append(kmer_hash << 32 | protein)
+
+    entries = array("Q")
+    for number, bucket in enumerate(buckets):
+        entries.extend(sorted(set(bucket)))
+        buckets[number] = None
+
+    if sys.byteorder == "big":
+        entries.byteswap()
+    with open(index_path, "wb") as index_file:
+        index_file.write(HEADER.pack(INDEX_MAGIC, k, step, len(entries),
+                                     os.path.getsize(filename)))
+        entries.tofile(index_file)
+
+    return len(entries)
+
+
+def ungapped_alignment(query, subject, diagonal):
+    """Find the highest-scoring ungapped segment of a diagonal.
+
+    Args:
+        query(str): The query protein.
+        subject(str): The subject protein.
+        diagonal(int): The subject position minus the query position.
+    Returns:
+        tuple: The score, the 0-based query start and end, and the number
+        of identical residues of the segment.
+    """
+
+    query_start = max(0, -diagonal)
+    query_end = min(len(query), len(subject) - diagonal)
+
+    best = (0, query_start, query_start, 0)
+    score = identities = 0
+    segment_start = query_start
+    for position in range(query_start, query_end):
+        first, second = query[position], subject[position + diagonal]
+        score += BLOSUM62.get((first, second), UNKNOWN_SCORE)
+        identities += first == second
+        if score <= 0:
+            score = identities = 0
+            segment_start = position + 1
+        elif score > best[0]:
+            best = (score, segment_start, position + 1, identities)
+
+    return best
+
+
+class KmerIndex:
+    """Sorted k-mer index of the proteins of a FASTA file.
+
+    The index is built when it does not exist, the FASTA file changed since
+    it was built or the k-mer length or step changed.
+
+    Args:
+        filename(string): A file path to the protein FASTA file.
+        k(int): The k-mer length, at most 8 residues.
+        step(int): The distance between the indexed k-mers of a protein.
+        index_path(string): A file path to the index, <filename>.kmi by
+                            default.
+
+    Attributes:
+        filename(str): The protein FASTA file path.
+        k(int): The k-mer length.
+        step(int): The distance between the indexed k-mers.
+        subject_ids(list): The BLAST subject ID of each protein.
+        database_size(int): The number of residues of all the proteins.
+
+    Methods:
+        candidates: Return the proteins sharing k-mers with a protein.
+        map_protein: Return the ungapped hits of a protein.
+        close: Close the protein FASTA file.
+    """
+
+    def __init__(self, filename, k=6, step=4, index_path=None):
+        self.filename = filename
+        self.k = k
+        self.step = step
+        self.index_path = index_path or index_filename(filename)
+
+        if not self._is_current():
+            build_kmer_index(filename, k, step, self.index_path)
+
+        self._entries = array("Q")
+        with open(self.index_path, "rb") as index_file:
+            _, _, _, count, _ = HEADER.unpack(index_file.read(HEADER.size))
+            self._entries.fromfile(index_file, count)
+        if sys.byteorder == "big":
+            self._entries.byteswap()
+
+        self._fasta = IndexedFasta(filename)
+        self._names = list(self._fasta)
+        self.subject_ids = [self._subject_id(number, name)
+                            for number, name in enumerate(self._names)]
+        self.database_size = sum(length for length, *_ in
+                                 self._fasta.index.values())
+
+    def __repr__(self):
+        return f"KmerIndex({self.filename})"
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _is_current(self):
+        """Return True if the index exists and matches the FASTA file and
+        the k-mer settings."""
+
+        try:
+            with open(self.index_path, "rb") as index_file:
+                magic, k, step, _, fasta_size = HEADER.unpack(
+                    index_file.read(HEADER.size))
+        except (FileNotFoundError, struct.error):
+            return False
+        return magic == INDEX_MAGIC and k == self.k and \
+            step == self.step and \
+            fasta_size == os.path.getsize(self.filename) and \
+            os.path.getmtime(self.index_path) >= \
+            os.path.getmtime(self.filename)
+
+    def _subject_id(self, number, name):
+        """Return the legacy NCBI style subject ID of a UniProt record."""
+
+        uniprot_id = UNIPROT_ID.match(name)
+        if not uniprot_id:
+            return name
+        version = SEQ_VERSION.search(self._fasta.header(name))
+        accession, entry_name = uniprot_id.groups()
+        return f"gi|{number + 1}|sp|{accession}." \
+               f"{version.group(1) if version else 1}|{entry_name}"
+
+    def candidates(self, protein):
+        """Count the k-mers a protein shares with every indexed protein.
+
+        Args:
+            protein(str): A protein sequence.
+        Returns:
+            dict: The query positions of the shared k-mers of each protein
+            number.
+        """
+
+        entries = self._entries
+        size = len(entries)
+        hits = {}
+        for position, kmer_hash in kmer_hashes(protein, self.k):
+            entry = bisect_left(entries, kmer_hash << 32)
+            while entry < size and entries[entry] >> 32 == kmer_hash:
+                hits.setdefault(entries[entry] & 0xFFFFFFFF, []) \
+                    .append(position)
+                entry += 1
+        return hits
+
+    def map_protein(self, protein, max_targets=5, min_identity=95.0,
+                    max_evalue=1e-5):
+        """Align a protein to the indexed proteins sharing the most k-mers.
+
+        Args:
+            protein(str): A protein sequence.
+            max_targets(int): The number of hits to keep.
+            min_identity(float): The lowest percent identity of a hit.
+            max_evalue(float): The highest e-value of a hit.
+        Returns:
+            list: The (subject ID, percent identity, alignment length,
+            mismatches, query start, query end, subject start, subject end,
+            e-value, bit score) of the hits in decreasing score, with 1-based
+            inclusive coordinates.
+        """
+
+        hits = self.candidates(protein)
+        ranked = sorted(hits, key=lambda number: (-len(hits[number]), number))
+
+        results = []
+        for number in ranked[:max_targets * 4]:
+            subject = self._fasta.fetch(self._names[number]).upper()
+
+            # Vote for the diagonal of the shared k-mers
+            diagonals = Counter()
+            for position in hits[number]:
+                kmer = protein[position:position + self.k]
+                subject_position = subject.find(kmer)
+                while subject_position != -1:
+                    diagonals[subject_position - position] += 1
+                    subject_position = subject.find(kmer, subject_position + 1)
+            if not diagonals:
+                continue
+
+            diagonal = diagonals.most_common(1)[0][0]
+            score, start, end, identities = ungapped_alignment(
+                protein, subject, diagonal)
+            length = end - start
+            if not length:
+                continue
+            identity = 100 * identities / length
+            if identity < min_identity:
+                continue
+
+            evalue = KAPPA * len(protein) * self.database_size * \
+                math.exp(-LAMBDA * score)
+            if evalue > max_evalue:
+                continue
+            bit_score = (LAMBDA * score - math.log(KAPPA)) / math.log(2)
+            results.append((self.subject_ids[number], identity, length,
+                            length - identities, start + 1, end,
+                            start + diagonal + 1, end + diagonal, evalue,
+                            bit_score))
+
+        results.sort(key=lambda hit: -hit[-1])
+        return results[:max_targets]
+
+    def close(self):
+        """Close the protein FASTA file."""
+
+        self._fasta.close()
+
+
+# The index of the worker processes, opened by _init_mapper_worker
+_kmer_index = None
+
+
+def _init_mapper_worker(filename, k, step, index_path):
+    """Open the k-mer index in the worker process. The index is opened from
+    its file instead of inherited, so the workers also work with the spawn
+    start method of macOS and Windows."""
+
+    global _kmer_index
+    _kmer_index = KmerIndex(filename, k, step, index_path)
+
+
+def _map_record(record, max_targets=5, min_identity=95.0, max_evalue=1e-5,
+                table_id=1, kmer_index=None):
+    """Translate one transcript record and return its outfmt6 lines, mapped
+    with kmer_index or the index of the worker process."""
+
+    name, frame, protein, _ = translate_record(record, table_id)
+    if not protein:
+        return []
+
+    kmer_index = kmer_index or _kmer_index
+    lines = []
+    for subject_id, identity, length, mismatches, *positions, evalue, \
+            bit_score in kmer_index.map_protein(protein, max_targets,
+                                                min_identity, max_evalue):
+        lines.append("\t".join([
+            f"{name}|m.{frame}", subject_id, f"{identity:.2f}", str(length),
+            str(mismatches), "0", *map(str, positions),
+            f"{evalue:.2e}" if evalue >= 1e-180 else "0.0",
+            f"{bit_score:.1f}"]) + "\n")
+    return lines
+
+
+def map_transcripts(kmer_index, transcripts_filename, output_filename,
+                    workers=1, chunksize=64, max_targets=5,
+                    min_identity=95.0, max_evalue=1e-5, table_id=1):
+    """Translate every transcript of a FASTA file, map it to the indexed
+    proteins and write the hits in the BLAST tabular format.
+
+    The transcripts are mapped in batches like translate_batch, so the
+    hits keep the order of the transcript file.
+
+    Args:
+        kmer_index(KmerIndex): The index of the proteins.
+        transcripts_filename(string): A file path to the transcript FASTA.
+        output_filename(string): A file path to the .outfmt6 output.
+        workers(int): The number of worker processes.
+        chunksize(int): The number of records sent to a worker at once.
+        max_targets(int): The number of hits kept per transcript.
+        min_identity(float): The lowest percent identity of a hit.
+        max_evalue(float): The highest e-value of a hit.
+        table_id(int): The NCBI translation table ID.
+    Returns:
+        int: The number of hits written.
+    """
+
+    records = read_fasta(transcripts_filename)
+    map_record = partial(_map_record, max_targets=max_targets,
+                         min_identity=min_identity, max_evalue=max_evalue,
+                         table_id=table_id)
+    batch_size = max(1, workers) * chunksize
+    count = 0
+
+    pool = None
+    if workers > 1:
+        pool = Pool(workers, initializer=_init_mapper_worker,
+                    initargs=(kmer_index.filename, kmer_index.k,
+                              kmer_index.step, kmer_index.index_path))
+    else:
+        map_record = partial(map_record, kmer_index=kmer_index)
+    try:
+        with open(output_filename, "w") as output_file:
+            batch = list(islice(records, batch_size))
+            while batch:
+                if pool:
+                    results = pool.map(map_record, batch, chunksize)
+                else:
+                    results = map(map_record, batch)
+
+                for lines in results:
+                    output_file.writelines(lines)
+                    count += len(lines)
+
+                batch = list(islice(records, batch_size))
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    return count
+
+
+@profile_option
+def main():
+    """The main function of the script that maps the transcripts of a FASTA
+    file to the proteins of a SwissProt FASTA file and writes the hits to
+    a .outfmt6 file.
+
+    Usage:
+        python kmer_mapper.py uniprot_sprot.fasta transcripts.fasta
+            [output.outfmt6] [--workers N] [--k K] [--min-identity P]
+            [--evalue E] [--table N]
+    """
+
+    options = {"--workers": 1, "--k": 6, "--min-identity": 95.0,
+               "--evalue": 1e-5, "--table": 1}
+    for option, default in options.items():
+        if option in sys.argv:
+            index = sys.argv.index(option)
+            try:
+                options[option] = type(default)(sys.argv[index + 1])
+            except (IndexError, ValueError):
+                sys.exit(f"Please provide a number after {option}.")
+            del sys.argv[index:index + 2]
+
+    if len(sys.argv) < 3:
+        sys.exit("Provide a SwissProt FASTA file and a transcript FASTA "
+                 "file to map.")
+    for filename in sys.argv[1:3]:
+        if not os.path.exists(filename):
+            sys.exit(filename + " not found. Check the file path and try "
+                     "again.")
+    output_filename = sys.argv[3] if len(sys.argv) > 3 else \
+        "kmer_blastp.outfmt6"
+
+    try:
+        with stage("load index", bytes_read=input_size(sys.argv[1])) \
+                as current:
+            kmer_index = KmerIndex(sys.argv[1], options["--k"])
+            current.records = len(kmer_index)
+        with kmer_index, stage("map transcripts",
+                               bytes_read=input_size(sys.argv[2])) as current:
+            current.records = map_transcripts(
+                kmer_index, sys.argv[2], output_filename, options["--workers"],
+                min_identity=options["--min-identity"],
+                max_evalue=options["--evalue"], table_id=options["--table"])
+    except ValueError as error:
+        sys.exit(str(error))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,15 @@ exported after parsing.
 This file contains below function to parse the gene information:
     * get_header - returns the FASTA header that contains info about VERSION
                    and DEFINITION
+    * get_origin - returns the unwrapped sequence under ORIGIN
     * get_sequence - returns the FASTA format sequence under ORIGIN
-    * split_records - returns a list of all possible gene record in a genbank
-                      file
+    * split_records - yields all possible gene record in a genbank file one
+                      at a time
+    * record_offsets - yields the byte offsets of every record in a genbank
+                       file
+    * decode_records - decodes bytes of a genbank file like split_records
+    * convert_parallel - converts a genbank file with a pool of worker
+                         processes when --workers N is given
 
 Author: Jia Yi Terri Shen
 Date: October 2019
@@ -18,7 +24,18 @@ Date: October 2019
 
 import sys
 import re
-import textwrap
+import itertools
+import io
+import os
+import shutil
+import tempfile
+from multiprocessing import Pool
+
+from fasta_writer import FastaWriter, wrap_sequence
+from profiling import profile_option, stage, timed, input_size
+
+# The "//" line ending a GenBank record, with any line ending
+TERMINATOR = re.compile(rb"//(?:\r\n?|\n)")
 
 
 def get_header(record):
@@ -36,9 +53,28 @@ def get_header(record):
     definition_parse = "".join(re.findall(r"^DEFINITION\s*(.*\s[\n\s]*.*)\.",
                                           record, re.M))
 
+    # Join the wrapped DEFINITION lines so the header stays on one line
+    definition_parse = " ".join(definition_parse.split())
+
     return ">" + version_parse + " " + definition_parse
 
 
+def get_origin(record):
+    """Parse for the ORIGIN value within record and return the sequence on
+    one line.
+
+    Args:
+        record(string): A multi-line GenBank record
+    Returns:
+        string: The sequence in CAPs without numbers or whitespaces.
+    """
+
+    origin_parse = re.findall(r"ORIGIN.+((?:\n.+)+)", record, re.M)
+    aaseq_parse = "".join(re.findall(r"([a-z]+)", origin_parse[0], re.M))
+
+    return aaseq_parse.upper()
+
+
 def get_sequence(record):
     """Parse for the ORIGIN value within record and convert the sequence into
     a FASTA-formatted sequence.
@@ -50,38 +86,220 @@ def get_sequence(record):
         characters, and no whitespaces in between.
     """
 
-    origin_parse = re.findall(r"ORIGIN.+((?:\n.+)+)", record, re.M)
-    aaseq_parse = "".join(re.findall(r"([a-z]+)", origin_parse[0], re.M))
+    return wrap_sequence(get_origin(record), width=70)
 
-    return "\n".join(textwrap.wrap(aaseq_parse.upper(), width=70))
 
+def split_records(filename, buffer_size=1 << 20):
+    """Open the input file, read it in buffered chunks, and yield the
+    individual GenBank records one at a time.
 
-def split_records(filename):
-    """Open the input file, read it, and split the file into individual
-    GenBank records.
+    Only the record being read is kept in memory, so the peak memory is
+    bounded by the largest record instead of the size of the file.
 
     Args:
         filename(string): A file path to the input GenBank file
-    Returns:
-        lists: Seperated entries that contains gene info as a list or an
-               empty list if the file is not found
+        buffer_size(int): The number of characters read at once
+    Yields:
+        string: Seperated entries that contains gene info, nothing is
+                yielded if the file is not found
     """
 
     try:
-        with open(filename) as gb_file:
-            gb_info = gb_file.read()
-            split_list = re.split(r"//\n", gb_info)
-        record_list = []
-        for record in split_list:
-            if "LOCUS" in record:
-                record_list.append(record)
-        return record_list
+        gb_file = open(filename)
     except FileNotFoundError:
-        return []
+        return
+
+    with gb_file:
+        pending = []
+        carry = ""
+        for chunk in iter(lambda: gb_file.read(buffer_size), ""):
+            # Search the new chunk and the unchecked end of the last one
+            text = carry + chunk
+            start = 0
+            end = text.find("//\n")
+            while end != -1:
+                pending.append(text[start:end])
+                record = "".join(pending)
+                pending = []
+                if "LOCUS" in record:
+                    yield record
+                start = end + 3
+                end = text.find("//\n", start)
+
+            # Keep the last two characters in case "//\n" is split
+            keep = max(start, len(text) - 2)
+            pending.append(text[start:keep])
+            carry = text[keep:]
+
+        pending.append(carry)
+        record = "".join(pending)
+        if "LOCUS" in record:
+            yield record
+
+
+def record_offsets(filename, buffer_size=1 << 20):
+    """Scan the GenBank file once in binary mode and yield the byte offsets
+    of every record, the text between two "//" record terminators.
+
+    The terminator line may end with "\n", "\r\n" or "\r", the line
+    endings split_records reads as "\n" in text mode.
+
+    Args:
+        filename(string): A file path to the input GenBank file
+        buffer_size(int): The number of bytes read at once
+    Yields:
+        tuple: The start and end byte offset of a record, the end excludes
+               the "//" terminator line
+    """
+
+    with open(filename, "rb") as gb_file:
+        record_start = 0
+        position = 0
+        carry = b""
+        for chunk in iter(lambda: gb_file.read(buffer_size), b""):
+            text = carry + chunk
+            text_start = position - len(carry)
+            start = 0
+            for match in TERMINATOR.finditer(text):
+                # A "\r" at the end of the chunk may be followed by "\n"
+                if match.end() == len(text) and text.endswith(b"\r"):
+                    break
+                yield record_start, text_start + match.start()
+                start = match.end()
+                record_start = text_start + start
+
+            # Keep the last three bytes in case "//\r\n" is split
+            keep = max(start, len(text) - 3)
+            carry = text[keep:]
+            position += len(chunk)
+
+        # A "//\r" terminator held back at the end of the file
+        if carry.endswith(b"//\r") and record_start <= position - 3:
+            yield record_start, position - 3
+            record_start = position
+
+        if record_start < position:
+            yield record_start, position
+
+
+def decode_records(data):
+    """Decode bytes of a GenBank file the way split_records reads it in text
+    mode, with the default encoding and every line ending read as "\n".
+
+    Args:
+        data(bytes): Bytes read from a GenBank file
+    Returns:
+        string: The decoded text
+    """
 
-    gb_file.close()
+    return io.TextIOWrapper(io.BytesIO(data)).read()
 
 
+def convert_record(record):
+    """Convert a GenBank record into a FASTA record.
+
+    Args:
+        record(string): A multi-line GenBank record
+    Returns:
+        string: The FASTA header and sequence
+    """
+
+    return "\n".join([get_header(record), get_sequence(record)])
+
+
+def convert_shard(shard):
+    """Convert the GenBank records within a byte range of the input file and
+    write them to a FASTA shard file. Used by the worker processes.
+
+    Args:
+        shard(tuple): The GenBank file path, the start and end byte offsets
+                      aligned to record boundaries, the shard file path and
+                      if a .fai index of the shard should be written
+    Returns:
+        tuple: The shard file path and the number of records converted
+    """
+
+    filename, start, end, shard_filename, fai = shard
+    with open(filename, "rb") as gb_file:
+        gb_file.seek(start)
+        gb_info = decode_records(gb_file.read(end - start))
+
+    with FastaWriter(shard_filename, width=70, fai=fai,
+                     blank_line=True) as writer:
+        for record in re.split(r"//\n", gb_info):
+            if "LOCUS" in record:
+                writer.write(get_header(record), get_origin(record))
+
+    return shard_filename, writer.count
+
+
+def convert_parallel(filename, output_file, workers, shard_size=None,
+                     fai_filename=None):
+    """Convert a GenBank file into FASTA with a pool of worker processes.
+
+    The file is scanned once for the record boundaries, contiguous ranges of
+    records are converted by the workers into shard files, and the shards
+    are stitched into the output in the input order.
+
+    Args:
+        filename(string): A file path to the input GenBank file
+        output_file(file): An open text file to write the FASTA records to
+        workers(int): The number of worker processes
+        shard_size(int): The approximate number of bytes per shard
+        fai_filename(string): A file path to write the .fai index of the
+                              output to, if given
+    Returns:
+        int: The number of records converted
+    """
+
+    file_size = os.path.getsize(filename)
+    if shard_size is None:
+        shard_size = min(64 << 20, max(1 << 20, file_size // (workers * 4)))
+
+    with tempfile.TemporaryDirectory() as shard_dir:
+
+        def shards():
+            shard_start = 0
+            # The boundary scan is the split records stage of this mode
+            for start, _ in timed(record_offsets(filename), "split records",
+                                  file_size):
+                if start - shard_start >= shard_size:
+                    yield filename, shard_start, start, os.path.join(
+                        shard_dir, f"{shard_start}.fasta"), bool(fai_filename)
+                    shard_start = start
+            if shard_start < file_size:
+                yield filename, shard_start, file_size, os.path.join(
+                    shard_dir, f"{shard_start}.fasta"), bool(fai_filename)
+
+        fai_file = open(fai_filename, "w") if fai_filename else None
+        output_offset = 0
+        count = 0
+        with Pool(workers) as pool:
+            for shard_filename, shard_count in pool.imap(convert_shard,
+                                                         shards()):
+                count += shard_count
+                with open(shard_filename) as shard_file:
+                    shutil.copyfileobj(shard_file, output_file)
+
+                # Shift the shard index by the bytes of the previous shards
+                if fai_file:
+                    with open(shard_filename + ".fai") as shard_fai:
+                        for line in shard_fai:
+                            fields = line.split("\t")
+                            fields[2] = str(int(fields[2]) + output_offset)
+                            fai_file.write("\t".join(fields))
+                    os.remove(shard_filename + ".fai")
+
+                output_offset += os.path.getsize(shard_filename)
+                os.remove(shard_filename)
+
+        if fai_file:
+            fai_file.close()
+
+    return count
+
+
+@profile_option
 def main():
     """The main function of the script that will validate the user inputs and
     output some warining messages or export a file that contains gene
@@ -101,19 +319,34 @@ def main():
                           warnings to the user depending on their inputs
     """
 
-    # Accept up to two command-line arguments
+    # Accept up to two command-line arguments, the --workers option and the
+    # --fai option to write the samtools faidx index of the output
     input_file = "<input_file>"
     output_filename = "<output_filename>"
 
+    write_fai = "--fai" in sys.argv
+    if write_fai:
+        sys.argv.remove("--fai")
+
+    workers = 1
+    if "--workers" in sys.argv:
+        index = sys.argv.index("--workers")
+        try:
+            workers = int(sys.argv[index + 1])
+        except (IndexError, ValueError):
+            sys.exit("Please provide the number of workers as an integer.")
+        del sys.argv[index:index + 2]
+
     # The first argument is required and should be a genbank file
     if len(sys.argv) < 2 or not sys.argv[1].endswith(".gb"):
         sys.exit("Provide a GenBank file to convert to FASTA.")
     else:
         input_file = sys.argv[1]
         gb_records = split_records(input_file)
+        first_record = next(gb_records, None)
 
     # Check if the provided import file exist
-    if not gb_records:
+    if first_record is None:
         sys.exit(input_file + " not found. Check the file path and try again.")
     elif len(sys.argv) == 2:
         output_filename = "sequences.fasta"
@@ -122,12 +355,26 @@ def main():
         output_filename = sys.argv[2] + ".fasta"
         sys.stdout = open(output_filename, "w")
 
-    # Export gene information to FASTA format into the output file
-    fasta_outputs = []
-    for record in gb_records:
-        fasta_record = "\n".join([get_header(record), get_sequence(record)])
-        fasta_outputs.append(fasta_record)
-    print("\n\n".join(fasta_outputs), end="\n\n", flush=False)
+    # Export gene information to FASTA format into the output file as soon
+    # as each record is read
+    fai_filename = output_filename + ".fai" if write_fai and \
+        output_filename.endswith(".fasta") else None
+    if workers > 1:
+        gb_records.close()
+        with stage("convert", bytes_read=input_size(input_file)) as current:
+            current.records = convert_parallel(input_file, sys.stdout,
+                                               workers,
+                                               fai_filename=fai_filename)
+    else:
+        gb_records = timed(itertools.chain([first_record], gb_records),
+                           "split records", input_size(input_file))
+        # The convert stage includes reading the records
+        with stage("convert") as current, \
+                FastaWriter(sys.stdout, width=70, fai=fai_filename,
+                            blank_line=True) as writer:
+            for record in gb_records:
+                writer.write(get_header(record), get_origin(record))
+            current.records = writer.count
 
     sys.stdout.close()
 
@@ -13,6 +13,30 @@ This file contains below function to parse the gene information:
                       original GO term with it's direct parent GO terms.
     * find_parent_terms - Fiction accept a GO term and an empty dictionary
                           which recursively look for all parent GO terms.
+    * go_is_a_dict - Function accept .obo file and return a dictionary that
+                     maps every GO term to its direct parent GO terms.
+    * read_protein_go_pairs - Function accept .gaf file and yield the protein
+                              ID and GO term of each annotation line.
+    * write_sorted_runs - Function accept protein and GO term pairs and write
+                          them as sorted run files under a memory budget.
+    * merge_runs - Function accept sorted run files and yield their unique
+                   pairs in sorted order.
+    * write_report - Function accept sorted protein and GO term pairs and
+                     write the annotation report.
+    * write_report_parallel - Function accept the protein to GO terms
+                              dictionary and write the annotation report
+                              with a pool of worker processes.
+
+For GAF files too large to sort in memory, --spill writes the annotations
+as sorted runs to temporary files within --memory-budget MB (256 by
+default) and merges them into the same report, e.g.
+
+    python parse_humun_genes_go.py go.obo goa_uniprot_all.gaf out --spill
+
+With --workers N the report is written by N worker processes, each
+finding the parent terms of a contiguous range of the sorted proteins. The
+spilled runs are merged in one process, so --workers cannot be combined
+with --spill or --memory-budget.
 
 Author: Jia Yi Terri Shen
 Date: November 2019
@@ -20,6 +44,17 @@ Date: November 2019
 
 import sys
 import re
+import os
+import heapq
+import tempfile
+from io import StringIO
+from multiprocessing import Pool
+
+from profiling import profile_option, profiled, stage, input_size
+
+# The approximate memory of a pair of strings held for sorting
+PAIR_OVERHEAD = 200
+MAX_OPEN_FILES = 256
 
 
 def split_terms(filename):
@@ -41,6 +76,7 @@ def split_terms(filename):
         return []
 
 
+@profiled("load GAF")
 def map_protein_to_go(filename):
     """Open the GO annotation file (GAF) and build the mapping relationship
     between the protein ID and its list of associating GO terms.
@@ -125,6 +161,234 @@ def find_parent_terms(go_id, go_dict):
     return go_set
 
 
+@profiled("load OBO")
+def go_is_a_dict(filename):
+    """Split the GO term file into terms and map every GO term to its is_a
+    parent terms.
+
+    Arg:
+        filename(string): A file path to a GO terms file.
+    Return:
+        dictionary: The list of is_a parent terms of each GO ID or an empty
+        dictionary if the file is not found.
+    """
+
+    go_dict = {}
+    for record in split_terms(filename):
+        go_id, is_a = parse_go_term(record)
+        if go_id:
+            go_dict[go_id[0]] = is_a
+    return go_dict
+
+
+def read_protein_go_pairs(filename):
+    """Read the GO annotation file (GAF) line by line and yield the protein
+    ID and GO term of every annotation, so the file is never held in memory.
+
+    Arg:
+        filename(string): A file path to a GO annotation file (GAF).
+    Yields:
+        tuple: The protein ID and the GO term of one annotation line.
+    """
+
+    with open(filename) as go_association_file:
+        for line in go_association_file:
+            line = line.rstrip("\n")
+            if line and not line.startswith("!"):
+                column_info = line.split("\t")
+                yield column_info[1], column_info[4]
+
+
+def write_sorted_runs(pairs, directory, memory_budget=256 << 20):
+    """Sort the protein and GO term pairs in memory-bounded batches and
+    write every batch to a run file.
+
+    Args:
+        pairs(iterable): The protein ID and GO term pairs.
+        directory(string): The directory of the run files.
+        memory_budget(int): The approximate number of bytes of pairs held
+                            in memory before they are written.
+    Return:
+        list: The file paths of the sorted runs.
+    """
+
+    run_filenames = []
+    batch = set()
+    batch_size = 0
+
+    def write_run():
+        run_filename = os.path.join(directory, f"run{len(run_filenames)}.tsv")
+        with open(run_filename, "w") as run_file:
+            run_file.writelines(f"{protein}\t{go_term}\n"
+                                for protein, go_term in sorted(batch))
+        run_filenames.append(run_filename)
+
+    for pair in pairs:
+        if pair not in batch:
+            batch.add(pair)
+            batch_size += PAIR_OVERHEAD + len(pair[0]) + len(pair[1])
+            if batch_size >= memory_budget:
+                write_run()
+                batch = set()
+                batch_size = 0
+
+    if batch:
+        write_run()
+
+    return run_filenames
+
+
+def read_run(run_filename):
+    """Yield the protein ID and GO term pairs of a run file."""
+
+    with open(run_filename) as run_file:
+        for line in run_file:
+            protein, go_term = line.rstrip("\n").split("\t")
+            yield protein, go_term
+
+
+def merge_runs(run_filenames, directory, max_open_files=MAX_OPEN_FILES):
+    """Merge the sorted run files and yield every pair once in sorted order.
+
+    When there are more runs than max_open_files, the runs are first merged
+    in groups into longer runs.
+
+    Args:
+        run_filenames(list): The file paths of the sorted runs.
+        directory(string): The directory of the intermediate runs.
+        max_open_files(int): The largest number of runs read at once.
+    Yields:
+        tuple: The protein ID and GO term pairs without duplicates.
+    """
+
+    run_filenames = list(run_filenames)
+    while len(run_filenames) > max_open_files:
+        merged_filenames = []
+        for start in range(0, len(run_filenames), max_open_files):
+            group = run_filenames[start:start + max_open_files]
+            merged_fd, merged_filename = tempfile.mkstemp(".tsv", "merge",
+                                                          directory)
+            with open(merged_fd, "w") as merged_file:
+                merged_file.writelines(
+                    f"{protein}\t{go_term}\n"
+                    for protein, go_term in merge_runs(group, directory))
+            for run_filename in group:
+                os.remove(run_filename)
+            merged_filenames.append(merged_filename)
+        run_filenames = merged_filenames
+
+    previous = None
+    for pair in heapq.merge(*map(read_run, run_filenames)):
+        if pair != previous:
+            yield pair
+            previous = pair
+
+
+def write_report(pairs, go_dict, output, parent_terms=None):
+    """Write the annotation report of sorted protein and GO term pairs, the
+    protein ID once followed by each GO term and its sorted parent terms.
+
+    Args:
+        pairs(iterable): The unique protein ID and GO term pairs sorted by
+                         protein and GO term.
+        go_dict(dictionary): The is_a parent terms of every GO term.
+        output(file): An open text file to write the report to.
+        parent_terms(dictionary): The sorted parent terms of each GO term,
+                                  filled in for the missing terms.
+    Return:
+        int: The number of proteins written.
+    """
+
+    parent_terms = {} if parent_terms is None else parent_terms
+    previous_protein = None
+    count = 0
+    lines = []
+
+    for protein, go_term in pairs:
+        if protein != previous_protein:
+            lines.append(protein)
+            previous_protein = protein
+            count += 1
+
+        if go_term not in parent_terms:
+            parent_terms[go_term] = sorted(find_parent_terms(go_term, go_dict))
+        parents = parent_terms[go_term]
+        if parents:
+            lines.append(f"\t {go_term} \t {parents[0]}\n")
+            lines.extend(f"\t\t{parent}\n" for parent in parents[1:])
+
+        if len(lines) >= 65536:
+            output.write("".join(lines))
+            lines = []
+
+    output.write("".join(lines))
+    return count
+
+
+# The inputs of the report worker processes, set by _init_report_worker
+_proteins = []
+_gene_association_map = {}
+_go_dict = {}
+_parent_terms = {}
+
+
+def _init_report_worker(proteins, gene_association_map, go_dict):
+    """Keep the inputs of the report in the worker process, which are
+    shared with the parent process instead of copied when it is forked."""
+
+    global _proteins, _gene_association_map, _go_dict, _parent_terms
+    _proteins = proteins
+    _gene_association_map = gene_association_map
+    _go_dict = go_dict
+    _parent_terms = {}
+
+
+def _report_shard(shard):
+    """Return the report of the proteins from start to end of the sorted
+    protein list."""
+
+    start, end = shard
+    pairs = ((protein, go_id) for protein in _proteins[start:end]
+             for go_id in sorted(_gene_association_map[protein]))
+    report = StringIO()
+    write_report(pairs, _go_dict, report, _parent_terms)
+    return report.getvalue()
+
+
+def write_report_parallel(gene_association_map, go_dict, output, workers,
+                          shard_size=None):
+    """Write the annotation report with a pool of worker processes.
+
+    The sorted proteins are split into contiguous shards, the workers find
+    the parent terms and format the report of one shard at a time and the
+    shards are written in order, so the report is the same as the one of
+    write_report.
+
+    Args:
+        gene_association_map(dictionary): The GO terms of each protein ID.
+        go_dict(dictionary): The is_a parent terms of every GO term.
+        output(file): An open text file to write the report to.
+        workers(int): The number of worker processes.
+        shard_size(int): The number of proteins per shard.
+    Return:
+        int: The number of proteins written.
+    """
+
+    proteins = sorted(gene_association_map)
+    if shard_size is None:
+        shard_size = max(1, -(-len(proteins) // (workers * 8)))
+    shards = [(start, min(start + shard_size, len(proteins)))
+              for start in range(0, len(proteins), shard_size)]
+
+    with Pool(workers, initializer=_init_report_worker,
+              initargs=(proteins, gene_association_map, go_dict)) as pool:
+        for report in pool.imap(_report_shard, shards):
+            output.write(report)
+
+    return len(proteins)
+
+
+@profile_option
 def main():
     """The main function of the script that will validate the user inputs and
     output some warining messages or export an annotation file that contains
@@ -144,11 +408,40 @@ def main():
                           warnings to the user depending on their inputs
     """
 
-    # Accept up to three command-line arguments
+    # Accept up to three command-line arguments, the --spill option to sort
+    # the annotations on disk and its --memory-budget in MB, and the
+    # --workers option to write the report with worker processes
     input_terms = "<input_GO_terms_file>"
     input_annotations = "<input_gene_associations_file>"
     output_filename = "<output_filename>"
 
+    workers = 1
+    if "--workers" in sys.argv:
+        index = sys.argv.index("--workers")
+        try:
+            workers = int(sys.argv[index + 1])
+        except (IndexError, ValueError):
+            sys.exit("Please provide the number of workers as an integer.")
+        del sys.argv[index:index + 2]
+
+    spill = "--spill" in sys.argv
+    if spill:
+        sys.argv.remove("--spill")
+
+    memory_budget = 256
+    if "--memory-budget" in sys.argv:
+        index = sys.argv.index("--memory-budget")
+        try:
+            memory_budget = float(sys.argv[index + 1])
+        except (IndexError, ValueError):
+            sys.exit("Please provide the memory budget in MB as a number.")
+        del sys.argv[index:index + 2]
+        spill = True
+
+    if spill and workers > 1:
+        sys.exit("Please choose either --spill or --workers, the spilled "
+                 "annotations are merged in one process.")
+
 
     # The first two arguments are required GO terms file ending with .obo
     # and gene association GAF file ending with .gaf
@@ -178,30 +471,59 @@ def main():
 
 
     # parse id and is_valeus and make a go_dict
-    split_input_terms = split_terms(input_terms)
-    go_dict = {}
-    for record in split_input_terms:
-        (go_id, is_a) = parse_go_term(record)
-        key_go_dict = "".join(go_id)
-        go_dict[key_go_dict] = is_a
+    go_dict = go_is_a_dict(input_terms)
+
+    # Sort the annotations on disk and merge them into the output file, the
+    # parent terms are found while the report is written
+    if spill:
+        with tempfile.TemporaryDirectory() as run_directory:
+            try:
+                with stage("sort runs", bytes_read=input_size(
+                        input_annotations)) as current:
+                    run_filenames = write_sorted_runs(
+                        read_protein_go_pairs(input_annotations),
+                        run_directory, int(memory_budget * (1 << 20)))
+                    current.records = len(run_filenames)
+            except FileNotFoundError:
+                run_filenames = []
+
+            with stage("write report") as current:
+                current.records = write_report(
+                    merge_runs(run_filenames, run_directory), go_dict,
+                    sys.stdout)
+
+        sys.stdout.close()
+        return
 
-
-    # Export an annotation gene information to tsv format into the output file
     gene_association_map = map_protein_to_go(input_annotations)
-    for protein, go_ids in sorted(gene_association_map.items()):
-        print(protein, end="")
 
-        for go_id in sorted(go_ids):
-            parent_go_ids = find_parent_terms(go_id, go_dict)
+    # Find the parent terms and format the report of contiguous ranges of
+    # proteins in the worker processes
+    if workers > 1:
+        with stage("write report") as current:
+            sys.stdout.flush()
+            current.records = write_report_parallel(
+                gene_association_map, go_dict, sys.stdout, workers)
+
+        sys.stdout.close()
+        return
+
+    # Find the parent terms of every annotated GO term once
+    with stage("closure") as current:
+        parent_terms = {}
+        for go_ids in gene_association_map.values():
+            for go_id in go_ids:
+                if go_id not in parent_terms:
+                    parent_terms[go_id] = sorted(
+                        find_parent_terms(go_id, go_dict))
+        current.records = len(parent_terms)
 
-            count = 0
-            for parent_go_id in sorted(parent_go_ids):
-
-                if count == 0:
-                    print("\t", go_id, "\t", parent_go_id)
-                    count += 1
-                else:
-                    print("\t", parent_go_id, sep="\t")
+    # Export an annotation gene information to tsv format into the output file
+    with stage("write report", len(gene_association_map)):
+        pairs = ((protein, go_id)
+                 for protein, go_ids in sorted(gene_association_map.items())
+                 for go_id in sorted(go_ids))
+        write_report(pairs, go_dict, sys.stdout, parent_terms)
 
     sys.stdout.close()
 
@@ -11,18 +11,47 @@ following class and functions:
                     and the following method:
                        * is_reviewed: To check if the record is reviewed.
                        * to_fasta: To construct FASTA header and sequence.
+   * read_records - yields the lines of each record of the UniProt file.
+   * parse_entries - yields the UniprotEntry objects that pass the filters.
+   * write_fasta - writes the entries to FASTA and collects their GO terms.
    * main - The main function of the script to create the FASTA output file.
 
 Author: Jia Yi Terri Shen
 Date: November 2019
 """
 
+import sys
 import re
-import textwrap
+from functools import cached_property
+
+from fasta_writer import FastaWriter, wrap_sequence
+from profiling import profile_option, stage, timed, input_size
+
+ENTRY_NAME_PATTERN = re.compile(r"ID\s+(\S+)\s+(\S+);.+")
+ACCESSION_PATTERN = re.compile(r"^AC\s+(.+?);")
+GENE_NAME_PATTERN = re.compile(r"GN\s+\w+=(.+?)\s*({.+})*;", re.M)
+PROTEIN_NAME_PATTERN = re.compile(r"DE\s+\w+:\s+Full=(.+?)\s*({.+})*;", re.M)
+FLAGS_PATTERN = re.compile(r"^DE\s+Flags:\s+(Fragment);", re.M)
+EVIDENCE_PATTERN = re.compile(r"^PE\s+(\d+):")
+ORGANISM_PATTERN = re.compile(r"^OS\s+(.+)\s\(.+\).", re.M)
+TAXON_PATTERN = re.compile(r"^OX\s+NCBI_TaxID=(\d+)\s*({.+})*;")
+SEQ_VERSION_PATTERN = re.compile(r"^DT\s+.+sequence\sversion.(\d).", re.M)
+DATE_PATTERN = re.compile(r"^DT\s+(\d{2})-([A-Z]{3})-(\d{4}),", re.M)
+MONTHS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP",
+          "OCT", "NOV", "DEC")
+
+# The GAF 2.2 relation of the annotations without a qualifier, per aspect
+GAF_QUALIFIERS = {"F": "enables", "P": "involved_in", "C": "located_in"}
+
 
 class UniprotEntry():
     """Collection of UniprotEntry object per Uniprot record.
 
+    The record is read line by line once and each line is dispatched on its
+    two-letter line code. The ID, AC, OX and PE values used to filter the
+    entries are decoded right away, the other fields are decoded the first
+    time they are used.
+
     Attributes:
         db(str): Indicate the Uniprot records are from Swiss-Prot database.
         entry_name(str): Entry name at line ID.
@@ -34,9 +63,15 @@ class UniprotEntry():
         organism(str): Formal organism name at line OS.
         taxon_id(int): Taxon_id at line OX.
         seq_version(int): Index for sequence version at line DT.
-        seq(str): Sequence at line block follow by line SQ.
+        entry_date(str): The date of the last DT line as YYYYMMDD.
+        sequence(str): Sequence at line block follow by line SQ.
+        seq(str): Sequence wrapped at 60 characters per line.
+        go_annotations(list): GO ID, aspect and evidence code at lines
+                              DR GO.
+        go_ids(set): Unique GO IDs at lines DR GO.
     Methods:
         is_reviewed: Returns TRUE if the record is reviewed.
+        fasta_header: Returns the header in FASTA format.
         to_fasta: Returns header and sequence in FASTA format.
     """
 
@@ -46,55 +81,122 @@ class UniprotEntry():
         """Define the instance attributes (listed in the class docstrings).
 
         Args:
-            record(string): A multiline string consists of a Swiss-Prot entry.
+            record(string or list): A multiline string or the list of lines
+                                    of a Swiss-Prot entry.
         Returns:
             None
         """
+        if isinstance(record, str):
+            record = record.split("\n")
+
+        self._lines = {"ID": [], "AC": [], "DE": [], "GN": [], "OS": [],
+                       "OX": [], "PE": [], "DT": []}
+        self._go_lines = []
+        self._seq_lines = []
+
+        # Sort the lines by line code until the sequence block - SQ
+        for number, line in enumerate(record):
+            code = line[:2]
+            if code in self._lines:
+                self._lines[code].append(line.rstrip("\n"))
+            elif code == "DR" and line.startswith("DR   GO;"):
+                self._go_lines.append(line)
+            elif code == "SQ":
+                self._seq_lines = record[number + 1:]
+                break
+
         # Find the status and entry name - ID
-        entry_name_pattern = re.compile(r"ID\s+(\S+)\s+(\S+);.+")
-        self.status = re.search(entry_name_pattern, record).group(2)
-        self.entry_name = re.search(entry_name_pattern, record).group(1)
+        id_match = ENTRY_NAME_PATTERN.search(self._first("ID"))
+        self.entry_name = id_match.group(1)
+        self.status = id_match.group(2)
 
         # Find the accession ID - AC
-        self.accession = re.search(r"^AC\s+(.+?);", record, re.M).group(1)
-
-        # Find the gene name - GN
-        gene_name_pattern = re.compile(r"GN\s+\w+=(.+?)\s*({.+})*;", re.M)
-        if re.search(gene_name_pattern, record):
-            self.gene_name = re.search(gene_name_pattern, record).group(1)
-        else:
-            self.gene_name = ""
-
-        # Find the protein name or (Fragment) - DE
-        protein_name = re.search(r"DE\s+\w+:\s+Full=(.+?)\s*({.+})*;" \
-                                    , record, re.M).group(1)
-        flags_pattern = re.compile(r"^DE\s+Flags:\s+(Fragment);", re.M)
-
-        if protein_name and re.search(flags_pattern, record):
-            self.protein_name = f"{protein_name} " \
-                                f"({re.search(flags_pattern,record).group(1)})"
-        else:
-            self.protein_name = f"{protein_name}"
+        self.accession = ACCESSION_PATTERN.search(self._first("AC")).group(1)
 
         # Find protein eviende - PE
-        self.protein_evi = re.search(r"^PE\s+(\d+):", record, re.M).group(1)
-
-        # Find organism name - OS
-        self.organism = re.search(r"^OS\s+(.+)\s\(.+\).", record, re.M). \
-                                 group(1)
+        self.protein_evi = EVIDENCE_PATTERN.search(self._first("PE")).group(1)
 
         # Find taxon_id - OX
-        self.taxon_id = re.search(r"^OX\s+NCBI_TaxID=(\d+)\s*({.+})*;", \
-                                 record, re.M).group(1)
+        self.taxon_id = TAXON_PATTERN.search(self._first("OX")).group(1)
+
+    def _first(self, code):
+        """Return the first line of a line code or an empty string."""
+
+        lines = self._lines[code]
+        return lines[0] if lines else ""
+
+    @cached_property
+    def gene_name(self):
+        """Find the gene name - GN"""
+
+        gene_name = GENE_NAME_PATTERN.search("\n".join(self._lines["GN"]))
+        return gene_name.group(1) if gene_name else ""
+
+    @cached_property
+    def protein_name(self):
+        """Find the protein name or (Fragment) - DE"""
+
+        de_lines = "\n".join(self._lines["DE"])
+        protein_name = PROTEIN_NAME_PATTERN.search(de_lines).group(1)
+        flags = FLAGS_PATTERN.search(de_lines)
+
+        if protein_name and flags:
+            return f"{protein_name} ({flags.group(1)})"
+        return f"{protein_name}"
+
+    @cached_property
+    def organism(self):
+        """Find organism name - OS"""
 
-        # Find seq_version - DT
-        self.seq_version = re.search(r"^DT\s+.+sequence\sversion.(\d).", \
-                                    record, re.M).group(1)
+        return ORGANISM_PATTERN.search("\n".join(self._lines["OS"])).group(1)
 
-        # Find seq - SQ
-        seq_block = re.search(r"SQ.+;\n(.+)", record, re.S).group(1)
-        seq_combine = "".join(re.findall(r"(\w+)", seq_block, re.M))
-        self.seq = "\n".join(textwrap.wrap(seq_combine, width=60))
+    @cached_property
+    def seq_version(self):
+        """Find seq_version - DT"""
+
+        return SEQ_VERSION_PATTERN.search(
+            "\n".join(self._lines["DT"])).group(1)
+
+    @cached_property
+    def entry_date(self):
+        """Find the date of the last entry update - DT"""
+
+        dates = DATE_PATTERN.findall("\n".join(self._lines["DT"]))
+        if not dates or dates[-1][1] not in MONTHS:
+            return ""
+        day, month, year = dates[-1]
+        return f"{year}{MONTHS.index(month) + 1:02d}{day}"
+
+    @cached_property
+    def sequence(self):
+        """Find seq - SQ"""
+
+        return "".join("".join(line.split()) for line in self._seq_lines)
+
+    @cached_property
+    def go_annotations(self):
+        """Find GO cross-references - DR   GO; GO:0005737; C:cytoplasm;
+        IDA:UniProtKB."""
+
+        annotations = []
+        for line in self._go_lines:
+            columns = line[5:].rstrip().rstrip(".").split("; ")
+            if len(columns) >= 4:
+                annotations.append((columns[1], columns[2][:1],
+                                    columns[3].split(":")[0]))
+        return annotations
+
+    @property
+    def go_ids(self):
+        """The unique GO IDs of the entry."""
+
+        return {go_id for go_id, _, _ in self.go_annotations}
+
+    @property
+    def seq(self):
+        """The sequence wrapped at 60 characters per line."""
+
+        return wrap_sequence(self.sequence, width=60)
 
 
     def is_reviewed(self):
@@ -106,33 +208,187 @@ class UniprotEntry():
         return self.status == "Reviewed"
 
 
+    def fasta_header(self):
+        """Construct the FASTA header.
+
+        Returns:
+            String: The relevant attributes in UniProtKB FASTA header format.
+        """
+        return f">{UniprotEntry.db}|{self.accession}|{self.entry_name}" \
+               f" {self.protein_name} OS={self.organism}" \
+               f" OX={self.taxon_id} GN={self.gene_name}" \
+               f" PE={self.protein_evi} SV={self.seq_version}"
+
+
     def to_fasta(self):
         """Parse into the FASTA format.
 
         Returns:
             String: The relevant attributes in UniProtKB FASTA format.
         """
-        header = f">{UniprotEntry.db}|{self.accession}|{self.entry_name}" \
-                 f" {self.protein_name} OS={self.organism}" \
-                 f" OX={self.taxon_id} GN={self.gene_name}" \
-                 f" PE={self.protein_evi} SV={self.seq_version}"
+        header = self.fasta_header()
         sequence = self.seq
         return  header + "\n" + sequence + "\n"
 
 
+def read_records(filename):
+    """Read the UniProt flat file line by line and yield one record at a
+    time, so only one record is kept in memory.
+
+    Args:
+        filename(string): A file path to the UniProt .txt file.
+    Yields:
+        list: The lines of one record without the "//" terminator.
+    """
+
+    with open(filename) as uniprot_file:
+        lines = []
+        for line in uniprot_file:
+            if line.startswith("//"):
+                if lines:
+                    yield lines
+                lines = []
+            else:
+                lines.append(line)
+
+        if any(line.strip() for line in lines):
+            yield lines
+
+
+def parse_entries(filename, reviewed_only=True, taxon_ids=None,
+                  max_evidence=None):
+    """Stream the UniProt entries that pass the filters. The filters only
+    use the ID, OX and PE lines, so the other fields and the sequence of the
+    filtered out entries are never decoded.
+
+    Args:
+        filename(string): A file path to the UniProt .txt file.
+        reviewed_only(bool): Only keep the reviewed entries.
+        taxon_ids(set): Only keep the entries of these NCBI taxon IDs.
+        max_evidence(int): Only keep the entries with a protein evidence
+                           level up to this value (1 is protein level).
+    Yields:
+        UniprotEntry: The entries that pass the filters.
+    """
+
+    for record in read_records(filename):
+        uniprot_entry = UniprotEntry(record)
+        if reviewed_only and not uniprot_entry.is_reviewed():
+            continue
+        if taxon_ids and uniprot_entry.taxon_id not in taxon_ids:
+            continue
+        if max_evidence and int(uniprot_entry.protein_evi) > max_evidence:
+            continue
+        yield uniprot_entry
+
+
+def write_gaf_line(gaf_file, uniprot_entry, annotation):
+    """Write one GO annotation of an entry as a GAF 2.2 line.
+
+    The DR lines carry no qualifier or reference, so the qualifier is the
+    default relation of the aspect (enables, involved_in or located_in) and
+    the reference is the UniProtKB entry. The symbol is the gene name, or
+    the entry name without one, and the date is the last DT line.
+
+    Args:
+        gaf_file(file): An open .gaf file.
+        uniprot_entry(UniprotEntry): The annotated entry.
+        annotation(tuple): The GO ID, aspect and evidence code.
+    Returns:
+        None
+    """
+
+    go_id, aspect, evidence = annotation
+    columns = ["UniProtKB", uniprot_entry.accession,
+               uniprot_entry.gene_name or uniprot_entry.entry_name,
+               GAF_QUALIFIERS.get(aspect, ""), go_id,
+               "UniProtKB:" + uniprot_entry.accession, evidence, "", aspect,
+               uniprot_entry.protein_name, "", "protein",
+               "taxon:" + uniprot_entry.taxon_id, uniprot_entry.entry_date,
+               "UniProt", "", ""]
+    gaf_file.write("\t".join(columns) + "\n")
+
+
+def write_fasta(entries, output_filename, write_fai=False, gene_to_go=None,
+                gaf_filename=None):
+    """Write the entries into a FASTA file and collect their GO
+    cross-references in the same pass.
+
+    Args:
+        entries(iterable): The UniprotEntry objects to write.
+        output_filename(string): A file path to the FASTA output.
+        write_fai(bool): Write the .fai index next to the FASTA output.
+        gene_to_go(dictionary): If given, it is filled with the accession
+                                (key) to unique GO IDs (value) mapping, the
+                                same form gene_go_dict and map_protein_to_go
+                                return for a GAF file.
+        gaf_filename(string): If given, a GAF 2.2 file of the GO
+                              cross-references is written.
+    Returns:
+        int: The number of entries written.
+    """
+
+    gaf_file = open(gaf_filename, "w") if gaf_filename else None
+    if gaf_file:
+        gaf_file.write("!gaf-version: 2.2\n")
+
+    with FastaWriter(output_filename, width=60, fai=write_fai) as writer:
+        for uniprot_entry in entries:
+            writer.write(uniprot_entry.fasta_header(), uniprot_entry.sequence)
+
+            if gene_to_go is not None and uniprot_entry.go_annotations:
+                gene_to_go.setdefault(uniprot_entry.accession, set()) \
+                    .update(uniprot_entry.go_ids)
+            if gaf_file:
+                for annotation in uniprot_entry.go_annotations:
+                    write_gaf_line(gaf_file, uniprot_entry, annotation)
+
+        count = writer.count
+
+    if gaf_file:
+        gaf_file.close()
+
+    return count
+
+
+@profile_option
 def main():
-    """ The main function of the script."""
-
-    with open("uniprot-neurofibromas.txt") as uniport_file:
-        records = uniport_file.read()
-        records = re.split(r"//\n", records)
-
-        with open("output.fasta", "w") as output_fasta:
-            for record in records:
-                if record:
-                    uniprot_entry = UniprotEntry(record)
-                    if uniprot_entry.is_reviewed():
-                        output_fasta.write(uniprot_entry.to_fasta())
+    """ The main function of the script. With --fai the samtools faidx index
+    output.fasta.fai is written along with the FASTA file. The reviewed
+    entries can be further filtered by taxon with --taxon ID (repeatable)
+    and by protein evidence level with --max-evidence N. With --gaf the GO
+    cross-references of the entries are written to output.gaf in the same
+    pass."""
+
+    write_fai = "--fai" in sys.argv
+    gaf_filename = "output.gaf" if "--gaf" in sys.argv else None
+
+    taxon_ids = set()
+    while "--taxon" in sys.argv:
+        index = sys.argv.index("--taxon")
+        if index + 1 >= len(sys.argv):
+            sys.exit("Please provide an NCBI taxon ID.")
+        taxon_ids.add(sys.argv[index + 1])
+        del sys.argv[index:index + 2]
+
+    max_evidence = None
+    if "--max-evidence" in sys.argv:
+        index = sys.argv.index("--max-evidence")
+        try:
+            max_evidence = int(sys.argv[index + 1])
+        except (IndexError, ValueError):
+            sys.exit("Please provide the protein evidence level as an " +
+                     "integer.")
+
+    uniprot_filename = "uniprot-neurofibromas.txt"
+    entries = timed(parse_entries(uniprot_filename, taxon_ids=taxon_ids,
+                                  max_evidence=max_evidence),
+                    "split records", input_size(uniprot_filename))
+
+    # The convert stage includes reading the entries
+    with stage("convert") as current:
+        current.records = write_fasta(entries, "output.fasta", write_fai,
+                                      gaf_filename=gaf_filename)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,288 @@
+"""Measure the stages of the scripts and report them as JSON.
+
+A stage is a named step of a run, e.g. loading the BLAST hits or writing
+the report. When a stage ends, its wall time, number of records, records
+per second, bytes read and the peak resident set size (RSS) of the process
+are sent to every subscribed callback. No measurement is made while nobody
+is subscribed, so the instrumented functions run at full speed by default.
+
+The scripts subscribe a JSON writer with --profile, which writes one JSON
+object per stage to stderr, and --cprofile FILE also dumps the cProfile
+statistics of the run to FILE (read them with python -m pstats FILE), e.g.
+
+    python parse_humun_genes_go.py go.obo genes.gaf --profile
+
+Library callers subscribe their own callback instead:
+
+    import profiling
+    profiling.subscribe(lambda report: print(report["stage"],
+                                             report["seconds"]))
+
+This file contains below functions and class:
+    * subscribe - adds a callback called with the report of every stage.
+    * unsubscribe - removes a callback.
+    * Stage - A class defines a measured stage used as a context manager.
+    * stage - returns a Stage.
+    * profiled - decorates a loader so each call is measured as a stage.
+    * timed - yields the items of an iterable measured as a stage.
+    * profile_option - decorates a script main with --profile and
+                       --cprofile.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import os
+import json
+import time
+import cProfile
+from functools import wraps
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_subscribers = []
+
+
+def subscribe(callback):
+    """Call the callback with the report dictionary of every stage.
+
+    Args:
+        callback(callable): A function accepting one dictionary.
+    Returns:
+        None
+    """
+
+    _subscribers.append(callback)
+
+
+def unsubscribe(callback):
+    """Stop calling a subscribed callback.
+
+    Args:
+        callback(callable): A subscribed function.
+    Returns:
+        None
+    """
+
+    if callback in _subscribers:
+        _subscribers.remove(callback)
+
+
+def peak_rss_kib():
+    """Return the peak RSS in KiB of the process and its finished worker
+    processes, or None if it is not available on the platform."""
+
+    if resource is None:
+        return None
+
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # macOS reports the peak in bytes, Linux in KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def input_size(filename):
+    """Return the size in bytes of an input file, or None if it is not a
+    file."""
+
+    if isinstance(filename, str) and os.path.isfile(filename):
+        return os.path.getsize(filename)
+    return None
+
+
+class Stage:
+    """A measured stage of a run.
+
+    Args:
+        name(str): The stage name, e.g. "load BLAST".
+        records(int): The number of records processed, can be set in the
+                      with block.
+        bytes_read(int): The number of bytes read, can be set in the with
+                         block.
+
+    Attributes:
+        name(str): The stage name.
+        records(int): The number of records processed.
+        bytes_read(int): The number of bytes read.
+        seconds(float): The wall time of the stage once it ended.
+
+    Methods:
+        report: Return the measurements as a dictionary.
+    """
+
+    def __init__(self, name, records=None, bytes_read=None):
+        self.name = name
+        self.records = records
+        self.bytes_read = bytes_read
+        self.seconds = None
+        self._start = None
+
+    def __repr__(self):
+        return f"Stage({self.name})"
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.perf_counter() - self._start
+        if _subscribers:
+            report = self.report()
+            for callback in list(_subscribers):
+                callback(report)
+
+    def report(self):
+        """Return the measurements of the stage.
+
+        Returns:
+            dict: The stage name, seconds, records, records per second,
+            bytes read and peak RSS in KiB (None if unknown).
+        """
+
+        rate = None
+        if self.records is not None and self.seconds:
+            rate = round(self.records / self.seconds, 1)
+        return {"stage": self.name, "seconds": round(self.seconds, 6),
+                "records": self.records, "records_per_second": rate,
+                "bytes_read": self.bytes_read,
+                "peak_rss_kib": peak_rss_kib()}
+
+
+def stage(name, records=None, bytes_read=None):
+    """Return a Stage to measure the code of a with block.
+
+    Args:
+        name(str): The stage name.
+        records(int): The number of records processed.
+        bytes_read(int): The number of bytes read.
+    Returns:
+        Stage: The stage context manager.
+    """
+
+    return Stage(name, records, bytes_read)
+
+
+def profiled(name, count=len):
+    """Decorate a function that loads a file given as its first argument,
+    so every call is measured as a stage while a callback is subscribed.
+
+    Args:
+        name(str): The stage name.
+        count(callable): A function returning the number of records of the
+                         return value, or None to not count them.
+    Returns:
+        callable: The decorator.
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _subscribers:
+                return function(*args, **kwargs)
+
+            with Stage(name, bytes_read=input_size(args[0] if args else None)
+                       ) as current:
+                result = function(*args, **kwargs)
+                if count and result is not None:
+                    current.records = count(result)
+            return result
+        return wrapper
+
+    return decorator
+
+
+def timed(iterable, name, bytes_read=None):
+    """Yield the items of an iterable and report the time spent producing
+    them as a stage, e.g. reading records while they are converted. The
+    stage is reported when the iterable is exhausted or the generator is
+    closed.
+
+    Args:
+        iterable(iterable): The items, e.g. a record generator.
+        name(str): The stage name.
+        bytes_read(int): The number of bytes read.
+    Yields:
+        object: The items of the iterable.
+    """
+
+    if not _subscribers:
+        yield from iterable
+        return
+
+    current = Stage(name, 0, bytes_read)
+    seconds = 0.0
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                seconds += time.perf_counter() - start
+            current.records += 1
+            yield item
+    finally:
+        # Also report the items read when the generator is closed early
+        current.seconds = seconds
+        report = current.report()
+        for callback in list(_subscribers):
+            callback(report)
+
+
+def write_json(report):
+    """Write the report of a stage as one JSON line to stderr."""
+
+    sys.stderr.write(json.dumps(report) + "\n")
+    sys.stderr.flush()
+
+
+def profile_option(main):
+    """Decorate the main function of a script with the --profile option,
+    which writes the report of every stage and of the whole run ("total")
+    as JSON lines to stderr, and --cprofile FILE, which also dumps the
+    cProfile statistics of the run to FILE.
+
+    Args:
+        main(callable): The main function of a script.
+    Returns:
+        callable: The main function handling the options.
+    """
+
+    @wraps(main)
+    def wrapper():
+        profile = "--profile" in sys.argv
+        if profile:
+            sys.argv.remove("--profile")
+
+        cprofile_filename = None
+        if "--cprofile" in sys.argv:
+            index = sys.argv.index("--cprofile")
+            if index + 1 >= len(sys.argv):
+                sys.exit("Please provide a file for the cProfile "
+                         "statistics.")
+            cprofile_filename = sys.argv[index + 1]
+            del sys.argv[index:index + 2]
+
+        if not profile and not cprofile_filename:
+            return main()
+
+        if profile:
+            subscribe(write_json)
+        profiler = cProfile.Profile() if cprofile_filename else None
+        try:
+            with Stage("total"):
+                if profiler:
+                    return profiler.runcall(main)
+                return main()
+        finally:
+            unsubscribe(write_json)
+            if profiler:
+                profiler.dump_stats(cprofile_filename)
+
+    return wrapper
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""Calculate the physicochemical properties of protein sequences.
+
+The residues of each protein are counted once with bytes.count and the
+average and monoisotopic mass, isoelectric point (pI), GRAVY and extinction
+coefficient are derived from those counts. The instability index is derived
+from the dipeptide counts. Unknown residues (X, B, Z, *) are ignored.
+
+The masses are the ExPASy ProtParam average and monoisotopic amino acid
+residue masses, the pI uses the Bjellqvist pK values, the GRAVY the
+Kyte-Doolittle hydropathy scale and the instability index the Guruprasad et
+al. (1990) dipeptide instability weight values.
+
+This file contains below functions:
+    * count_residues - returns the count of each standard amino acid.
+    * average_mass - returns the average mass of a protein.
+    * monoisotopic_mass - returns the monoisotopic mass of a protein.
+    * isoelectric_point - returns the pI of a protein.
+    * gravy - returns the grand average of hydropathy of a protein.
+    * extinction_coefficient - returns the molar extinction coefficients.
+    * instability_index - returns the instability index of a protein.
+    * protein_properties - returns all of the properties of one protein.
+    * batch_properties - yields the properties of a batch of proteins.
+    * main - writes the properties of a protein FASTA file into a .tsv file.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+from collections import Counter
+
+from profiling import profile_option
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+# ExPASy amino acid residue masses in daltons, a peptide is its residues
+# and one water.
+AVERAGE_MASSES = {
+    "A": 71.0788, "C": 103.1388, "D": 115.0886, "E": 129.1155,
+    "F": 147.1766, "G": 57.0519, "H": 137.1411, "I": 113.1594,
+    "K": 128.1741, "L": 113.1594, "M": 131.1926, "N": 114.1038,
+    "P": 97.1167, "Q": 128.1307, "R": 156.1875, "S": 87.0782,
+    "T": 101.1051, "V": 99.1326, "W": 186.2132, "Y": 163.1760,
+}
+MONOISOTOPIC_MASSES = {
+    "A": 71.03711, "C": 103.00919, "D": 115.02694, "E": 129.04259,
+    "F": 147.06841, "G": 57.02146, "H": 137.05891, "I": 113.08406,
+    "K": 128.09496, "L": 113.08406, "M": 131.04049, "N": 114.04293,
+    "P": 97.05276, "Q": 128.05858, "R": 156.10111, "S": 87.03203,
+    "T": 101.04768, "V": 99.06841, "W": 186.07931, "Y": 163.06333,
+}
+AVERAGE_WATER = 18.01524
+MONOISOTOPIC_WATER = 18.01056
+
+# Bjellqvist pK values with the terminal specific values.
+POSITIVE_PKS = {"Nterm": 7.5, "K": 10.0, "R": 12.0, "H": 5.98}
+NEGATIVE_PKS = {"Cterm": 3.55, "D": 4.05, "E": 4.45, "C": 9.0, "Y": 10.0}
+N_TERMINAL_PKS = {"A": 7.59, "M": 7.0, "S": 6.93, "P": 8.36, "T": 6.82,
+                  "V": 7.44, "E": 7.7}
+C_TERMINAL_PKS = {"D": 4.55, "E": 4.75}
+
+# Kyte-Doolittle hydropathy index.
+HYDROPATHY = {
+    "A": 1.8, "R": -4.5, "N": -3.5, "D": -3.5, "C": 2.5, "Q": -3.5,
+    "E": -3.5, "G": -0.4, "H": -3.2, "I": 4.5, "L": 3.8, "K": -3.9,
+    "M": 1.9, "F": 2.8, "P": -1.6, "S": -0.8, "T": -0.7, "W": -0.9,
+    "Y": -1.3, "V": 4.2,
+}
+
+# Dipeptide instability weight values, one row per first residue with the
+# second residue in the AMINO_ACIDS order.
+_DIWV_ROWS = {
+    "A": "1.0 44.94 -7.49 1.0 1.0 1.0 -7.49 1.0 1.0 1.0 "
+         "1.0 1.0 20.26 1.0 1.0 1.0 1.0 1.0 1.0 1.0",
+    "C": "1.0 1.0 20.26 1.0 1.0 1.0 33.6 1.0 1.0 20.26 "
+         "33.6 1.0 20.26 -6.54 1.0 1.0 33.6 -6.54 24.68 1.0",
+    "D": "1.0 1.0 1.0 1.0 -6.54 1.0 1.0 1.0 -7.49 1.0 "
+         "1.0 1.0 1.0 1.0 -6.54 20.26 -14.03 1.0 1.0 1.0",
+    "E": "1.0 44.94 20.26 33.6 1.0 1.0 -6.54 20.26 1.0 1.0 "
+         "1.0 1.0 20.26 20.26 1.0 20.26 1.0 1.0 -14.03 1.0",
+    "F": "1.0 1.0 13.34 1.0 1.0 1.0 1.0 1.0 -14.03 1.0 "
+         "1.0 1.0 20.26 1.0 1.0 1.0 1.0 1.0 1.0 33.601",
+    "G": "-7.49 1.0 1.0 -6.54 1.0 13.34 1.0 -7.49 -7.49 1.0 "
+         "1.0 -7.49 1.0 1.0 1.0 1.0 -7.49 1.0 13.34 -7.49",
+    "H": "1.0 1.0 1.0 1.0 -9.37 -9.37 1.0 44.94 24.68 1.0 "
+         "1.0 24.68 -1.88 1.0 1.0 1.0 -6.54 1.0 -1.88 44.94",
+    "I": "1.0 1.0 1.0 44.94 1.0 1.0 13.34 1.0 -7.49 20.26 "
+         "1.0 1.0 -1.88 1.0 1.0 1.0 1.0 -7.49 1.0 1.0",
+    "K": "1.0 1.0 1.0 1.0 1.0 -7.49 1.0 -7.49 1.0 -7.49 "
+         "33.6 1.0 -6.54 24.64 33.6 1.0 1.0 -7.49 1.0 1.0",
+    "L": "1.0 1.0 1.0 1.0 1.0 1.0 1.0 1.0 -7.49 1.0 "
+         "1.0 1.0 20.26 33.6 20.26 1.0 1.0 1.0 24.68 1.0",
+    "M": "13.34 1.0 1.0 1.0 1.0 1.0 58.28 1.0 1.0 1.0 "
+         "-1.88 1.0 44.94 -6.54 -6.54 44.94 -1.88 1.0 1.0 24.68",
+    "N": "1.0 -1.88 1.0 1.0 -14.03 -14.03 1.0 44.94 24.68 1.0 "
+         "1.0 1.0 -1.88 -6.54 1.0 1.0 -7.49 1.0 -9.37 1.0",
+    "P": "20.26 -6.54 -6.54 18.38 20.26 1.0 1.0 1.0 1.0 1.0 "
+         "-6.54 1.0 20.26 20.26 -6.54 20.26 1.0 20.26 -1.88 1.0",
+    "Q": "1.0 -6.54 20.26 20.26 -6.54 1.0 1.0 1.0 1.0 1.0 "
+         "1.0 1.0 20.26 20.26 1.0 44.94 1.0 -6.54 1.0 -6.54",
+    "R": "1.0 1.0 1.0 1.0 1.0 -7.49 20.26 1.0 1.0 1.0 "
+         "1.0 13.34 20.26 20.26 58.28 44.94 1.0 1.0 58.28 -6.54",
+    "S": "1.0 33.6 1.0 20.26 1.0 1.0 1.0 1.0 1.0 1.0 "
+         "1.0 1.0 44.94 20.26 20.26 20.26 1.0 1.0 1.0 1.0",
+    "T": "1.0 1.0 1.0 20.26 13.34 -7.49 1.0 1.0 1.0 1.0 "
+         "1.0 -14.03 1.0 -6.54 1.0 1.0 1.0 1.0 -14.03 1.0",
+    "V": "1.0 1.0 -14.03 1.0 1.0 -7.49 1.0 1.0 -1.88 1.0 "
+         "1.0 1.0 20.26 1.0 1.0 1.0 -7.49 1.0 1.0 -6.54",
+    "W": "-14.03 1.0 1.0 1.0 1.0 -9.37 24.68 1.0 1.0 13.34 "
+         "24.68 13.34 1.0 1.0 1.0 1.0 -14.03 -7.49 1.0 1.0",
+    "Y": "24.68 1.0 24.68 -6.54 1.0 -7.49 13.34 1.0 1.0 1.0 "
+         "44.94 1.0 13.34 1.0 -15.91 1.0 -7.49 1.0 -9.37 13.34",
+}
+DIWV = {first + second: float(value)
+        for first, row in _DIWV_ROWS.items()
+        for second, value in zip(AMINO_ACIDS, row.split())}
+
+
+def count_residues(sequence):
+    """Count each standard amino acid of a protein sequence.
+
+    Args:
+        sequence(str or bytes): A protein sequence in upper case.
+    Returns:
+        dictionary: The count of each of the 20 standard amino acids.
+    """
+
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii", "replace")
+
+    return {amino_acid: sequence.count(code)
+            for amino_acid, code in zip(AMINO_ACIDS,
+                                        AMINO_ACIDS.encode("ascii"))}
+
+
+def _mass(counts, masses, water):
+    """Return the mass of a peptide from its residue counts."""
+
+    if not any(counts.values()):
+        return 0.0
+    return sum(masses[aa] * count for aa, count in counts.items()) + water
+
+
+def average_mass(counts):
+    """Return the average mass of a protein in daltons.
+
+    Args:
+        counts(dictionary): The residue counts from count_residues.
+    Returns:
+        float: The average mass.
+    """
+
+    return _mass(counts, AVERAGE_MASSES, AVERAGE_WATER)
+
+
+def monoisotopic_mass(counts):
+    """Return the monoisotopic mass of a protein in daltons.
+
+    Args:
+        counts(dictionary): The residue counts from count_residues.
+    Returns:
+        float: The monoisotopic mass.
+    """
+
+    return _mass(counts, MONOISOTOPIC_MASSES, MONOISOTOPIC_WATER)
+
+
+def _charge_at_ph(counts, positive_pks, negative_pks, ph):
+    """Return the net charge of a protein at a pH."""
+
+    positive = 1.0 / (10 ** (ph - positive_pks["Nterm"]) + 1.0)
+    negative = 1.0 / (10 ** (negative_pks["Cterm"] - ph) + 1.0)
+    for amino_acid, pk in positive_pks.items():
+        if amino_acid != "Nterm":
+            positive += counts[amino_acid] / (10 ** (ph - pk) + 1.0)
+    for amino_acid, pk in negative_pks.items():
+        if amino_acid != "Cterm":
+            negative += counts[amino_acid] / (10 ** (pk - ph) + 1.0)
+
+    return positive - negative
+
+
+def isoelectric_point(counts, n_terminal="", c_terminal=""):
+    """Return the isoelectric point of a protein by bisection of its net
+    charge between pH 0 and 14.
+
+    Args:
+        counts(dictionary): The residue counts from count_residues.
+        n_terminal(str): The first residue of the protein.
+        c_terminal(str): The last residue of the protein.
+    Returns:
+        float: The pH at which the net charge is zero.
+    """
+
+    positive_pks = dict(POSITIVE_PKS)
+    negative_pks = dict(NEGATIVE_PKS)
+    if n_terminal in N_TERMINAL_PKS:
+        positive_pks["Nterm"] = N_TERMINAL_PKS[n_terminal]
+    if c_terminal in C_TERMINAL_PKS:
+        negative_pks["Cterm"] = C_TERMINAL_PKS[c_terminal]
+
+    low, high = 0.0, 14.0
+    while high - low > 0.0001:
+        middle = (low + high) / 2
+        if _charge_at_ph(counts, positive_pks, negative_pks, middle) > 0:
+            low = middle
+        else:
+            high = middle
+
+    return (low + high) / 2
+
+
+def gravy(counts):
+    """Return the grand average of hydropathy (GRAVY) of a protein.
+
+    Args:
+        counts(dictionary): The residue counts from count_residues.
+    Returns:
+        float: The mean Kyte-Doolittle hydropathy of the residues.
+    """
+
+    length = sum(counts.values())
+    if not length:
+        return 0.0
+    return sum(HYDROPATHY[aa] * count for aa, count in counts.items()) \
+        / length
+
+
+def extinction_coefficient(counts):
+    """Return the molar extinction coefficients of a protein at 280 nm.
+
+    Args:
+        counts(dictionary): The residue counts from count_residues.
+    Returns:
+        tuple: The coefficient with reduced cysteines and the coefficient
+        with every cysteine pair forming a cystine, in M-1 cm-1.
+    """
+
+    reduced = counts["W"] * 5500 + counts["Y"] * 1490
+    cystines = reduced + counts["C"] // 2 * 125
+
+    return reduced, cystines
+
+
+def instability_index(sequence):
+    """Return the instability index of a protein from its dipeptides.
+
+    Args:
+        sequence(str): A protein sequence in upper case.
+    Returns:
+        float: The instability index, a protein over 40 is unstable.
+    """
+
+    if not sequence:
+        return 0.0
+
+    dipeptides = Counter(map("".join, zip(sequence, sequence[1:])))
+    score = sum(DIWV.get(dipeptide, 0.0) * count
+                for dipeptide, count in dipeptides.items())
+
+    return 10.0 / len(sequence) * score
+
+
+def protein_properties(sequence):
+    """Calculate all the properties of one protein sequence.
+
+    Args:
+        sequence(str): A protein sequence, a trailing stop "*" or "-" is
+                       ignored.
+    Returns:
+        dictionary: The length, average and monoisotopic mass, pI, GRAVY,
+        extinction coefficients and instability index.
+    """
+
+    sequence = sequence.upper().rstrip("*-")
+    counts = count_residues(sequence)
+    reduced, cystines = extinction_coefficient(counts)
+
+    return {
+        "length": len(sequence),
+        "average_mass": average_mass(counts),
+        "monoisotopic_mass": monoisotopic_mass(counts),
+        "isoelectric_point": isoelectric_point(counts, sequence[:1],
+                                               sequence[-1:]),
+        "gravy": gravy(counts),
+        "extinction_reduced": reduced,
+        "extinction_cystines": cystines,
+        "instability_index": instability_index(sequence),
+    }
+
+
+def batch_properties(sequences):
+    """Calculate the properties of a batch of proteins.
+
+    Args:
+        sequences(iterable): Protein sequences, or (name, sequence) tuples
+                             such as the records of translate_mrna.read_fasta.
+    Yields:
+        tuple: The name (None for plain sequences) and the properties.
+    """
+
+    for sequence in sequences:
+        name = None
+        if isinstance(sequence, tuple):
+            name, sequence = sequence
+        yield name, protein_properties(sequence)
+
+
+@profile_option
+def main():
+    """The main function of the script that writes the properties of every
+    protein of a FASTA file, e.g. the output of translate_mrna.py or
+    parse_uniprot_to_fasta.py, into a .tsv file.
+
+    Usage:
+        python protein_properties.py proteins.fasta [output_name]
+    """
+
+    from translate_mrna import read_fasta
+
+    if len(sys.argv) < 2:
+        sys.exit("Provide a protein FASTA file.")
+
+    input_file = sys.argv[1]
+    output_filename = (sys.argv[2] if len(sys.argv) > 2 else "properties") \
+        + ".tsv"
+    columns = ["length", "average_mass", "monoisotopic_mass",
+               "isoelectric_point", "gravy", "extinction_reduced",
+               "extinction_cystines", "instability_index"]
+
+    try:
+        with open(output_filename, "w") as output:
+            output.write("\t".join(["record"] + columns) + "\n")
+            for header, properties in batch_properties(read_fasta(input_file)):
+                name = header.split()[0] if header.strip() else header
+                row = [name] + [f"{properties[column]:.2f}"
+                                if isinstance(properties[column], float)
+                                else str(properties[column])
+                                for column in columns]
+                output.write("\t".join(row) + "\n")
+    except FileNotFoundError:
+        sys.exit(input_file + " not found. Check the file path and try again.")
+
+
+if __name__ == "__main__":
+    main()
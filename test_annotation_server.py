@@ -0,0 +1,221 @@
+"""This script test the annotation_server.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import os
+import json
+import time
+import socket
+import threading
+import http.client
+import urllib.error
+import urllib.request
+
+import pytest
+from annotation_server import AnnotationService, make_server
+
+BLAST = "TRINITY_1|m.1\tgi|1|sp|P1.1|A_HUMAN\t100.00\t10\t0\n"
+GAF = "!gaf-version: 2.1\nDB\tP1\tA\t\tGO:0000002\tPMID:1\tIDA\n"
+OBO = """format-version: 1.2
+
+[Term]
+id: GO:0000001
+name: root
+namespace: biological_process
+
+[Term]
+id: GO:0000002
+name: child
+namespace: biological_process
+is_a: GO:0000001 ! root
+
+"""
+
+
+def write_files(tmp_path):
+    """Write the test annotation files and return their file paths."""
+
+    filenames = []
+    for name, text in (("blastp.outfmt6", BLAST), ("genes.gaf", GAF),
+                       ("go.obo", OBO)):
+        filename = str(tmp_path / name)
+        with open(filename, "w") as annotation_file:
+            annotation_file.write(text)
+        filenames.append(filename)
+    return filenames
+
+
+def test_index_lookups(tmp_path):
+    """Test if the transcripts and GO terms are looked up and cached."""
+
+    index = AnnotationService(*write_files(tmp_path)).index
+
+    assert json.loads(index.transcript("TRINITY_1")) == {
+        "transcript": "TRINITY_1", "protein": "P1",
+        "go": [["GO:0000002", "child"]]}
+    assert json.loads(index.go_term("GO:0000002"))["ancestors"] == \
+        [["GO:0000001", "root"]]
+    assert json.loads(index.go_term("GO:9999999")) == {
+        "go": "GO:9999999", "name": "NA", "ancestors": []}
+
+    index.transcript("TRINITY_1")
+    assert index.cache_info()["transcripts"]["hits"] == 1
+
+
+def test_reload_if_changed(tmp_path):
+    """Test if the index is loaded again only when a file changed."""
+
+    filenames = write_files(tmp_path)
+    service = AnnotationService(*filenames)
+    assert not service.reload_if_changed()
+
+    with open(filenames[2], "w") as obo_file:
+        obo_file.write(OBO.replace("name: child", "name: renamed child"))
+    os.utime(filenames[2], ns=(0, 0))
+    assert service.reload_if_changed()
+    assert json.loads(service.index.go_term("GO:0000002"))["name"] == \
+        "renamed child"
+
+
+def test_server_query(tmp_path):
+    """Test if the batched query is answered over HTTP."""
+
+    server = make_server(AnnotationService(*write_files(tmp_path)), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_port}/query",
+            json.dumps({"transcripts": ["TRINITY_1", "TRINITY_2"],
+                        "go": ["GO:0000001"]}).encode())
+        with urllib.request.urlopen(request) as response:
+            answer = json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [result["protein"] for result in answer["transcripts"]] == \
+        ["P1", "NA"]
+    assert answer["go"][0]["name"] == "root"
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """An HTTP connection to a server on a Unix socket."""
+
+    def __init__(self, socket_filename):
+        super().__init__("localhost")
+        self.socket_filename = socket_filename
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX)
+        self.sock.connect(self.socket_filename)
+
+
+def serve(server):
+    """Answer the requests of the server in a daemon thread."""
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_dangling_parent(tmp_path):
+    """Test if an is_a parent without its own term is answered as a root."""
+
+    filenames = write_files(tmp_path)
+    with open(filenames[2], "w") as obo_file:
+        obo_file.write(OBO.replace("is_a: GO:0000001 ! root",
+                                   "is_a: GO:0000001 ! root\n"
+                                   "is_a: GO:0000009 ! missing"))
+
+    server = make_server(AnnotationService(*filenames), port=0)
+    serve(server)
+    try:
+        with urllib.request.urlopen(
+                f"http://127.0.0.1:{server.server_port}/go?"
+                f"ids=GO:0000002,GO:0000009") as response:
+            answer = json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert answer[0]["ancestors"] == [["GO:0000001", "root"],
+                                      ["GO:0000009", "NA"]]
+    assert answer[1] == {"go": "GO:0000009", "name": "NA", "ancestors": []}
+
+
+def test_lookup_error(tmp_path):
+    """Test if a failed lookup is answered with a JSON error."""
+
+    service = AnnotationService(*write_files(tmp_path))
+
+    def fail(go_id):
+        raise KeyError(go_id)
+
+    service.index.go_term = fail
+    server = make_server(service, port=0)
+    serve(server)
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}"
+                                   f"/go?ids=GO:0000002")
+        assert error.value.code == 500
+        assert "GO:0000002" in json.loads(error.value.read())["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_watch_survives_failed_reload(tmp_path, capsys):
+    """Test if the watch thread keeps checking after a reload raised."""
+
+    service = AnnotationService(*write_files(tmp_path))
+    calls = []
+
+    def fail():
+        calls.append(True)
+        raise KeyError("GO:0000009")
+
+    service.reload_if_changed = fail
+    thread = service.watch(0.01)
+    deadline = time.monotonic() + 5
+    while len(calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    service.stop()
+    thread.join(5)
+
+    assert len(calls) >= 2
+    assert "Reload failed" in capsys.readouterr().err
+
+
+def test_unix_socket_server(tmp_path):
+    """Test if the lookups are answered on a Unix socket, a stale socket is
+    removed and a live one is not taken over."""
+
+    socket_filename = str(tmp_path / "annotations.sock")
+    # A socket file left by a server that is gone
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(socket_filename)
+    stale.close()
+    assert os.path.exists(socket_filename)
+
+    service = AnnotationService(*write_files(tmp_path))
+    server = make_server(service, socket_filename=socket_filename)
+    serve(server)
+    try:
+        connection = UnixHTTPConnection(socket_filename)
+        connection.request("GET", "/transcripts?ids=TRINITY_1")
+        response = connection.getresponse()
+        answer = json.loads(response.read())
+        connection.close()
+
+        with pytest.raises(OSError, match="already listening"):
+            make_server(service, socket_filename=socket_filename)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status == 200
+    assert answer[0]["protein"] == "P1"
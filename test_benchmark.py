@@ -0,0 +1,58 @@
+"""This script test the benchmark.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import json
+
+import benchmark
+from benchmark import measure, compare
+
+BASELINE = {"small": {"Blast": {"seconds": 1.0, "peak_kib": 100.0},
+                      "Matrix": {"seconds": 2.0, "peak_kib": 0.0}}}
+
+
+def test_compare_flags_regressions():
+    """Test if only the metrics over the tolerance are regressions."""
+
+    results = {"small": {"Blast": {"seconds": 1.3, "peak_kib": 120.0},
+                         "Matrix": {"seconds": 1.0, "peak_kib": 50.0},
+                         "split_terms": {"seconds": 9.0, "peak_kib": 9.0}},
+               "medium": {"Blast": {"seconds": 9.0, "peak_kib": 9.0}}}
+
+    assert compare(results, BASELINE, 0.25) == [
+        ("small", "Blast", "seconds", 1.0, 1.3)]
+    assert compare(results, BASELINE, 0.1) == [
+        ("small", "Blast", "seconds", 1.0, 1.3),
+        ("small", "Blast", "peak_kib", 100.0, 120.0)]
+    assert compare(results, {}, 0.25) == []
+
+
+def test_measure():
+    """Test if measure returns the run time and the peak memory."""
+
+    seconds, peak = measure(lambda: bytearray(1 << 20), repeat=2)
+
+    assert seconds >= 0
+    assert peak >= 1 << 20
+
+
+def test_main_save_and_compare(tmp_path, monkeypatch, capsys):
+    """Test if a saved baseline is read back and compared."""
+
+    baseline_filename = str(tmp_path / "baseline.json")
+    arguments = ["benchmark.py", "--only", "split_terms,go_is_a_dict",
+                 "--repeat", "1", "--baseline", baseline_filename,
+                 "--data-dir", str(tmp_path / "data")]
+
+    monkeypatch.setattr(sys, "argv", arguments + ["--save"])
+    benchmark.main()
+    with open(baseline_filename) as baseline_file:
+        assert set(json.load(baseline_file)["small"]) == {"split_terms",
+                                                          "go_is_a_dict"}
+
+    monkeypatch.setattr(sys, "argv", arguments + ["--tolerance", "1000"])
+    benchmark.main()
+    assert "\tgo_is_a_dict\t" in capsys.readouterr().out
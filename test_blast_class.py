@@ -0,0 +1,30 @@
+"""This script test the blast_class.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+from blast_class import Blast
+
+HITS = ("TRINITY_1|m.1\tgi|1|sp|P1.1|A_HUMAN\t100.00\t10\t0\n"
+        "TRINITY_2|m.2\tgi|2|sp|P2.1|B_HUMAN\t98.00\t10\t1\n")
+
+
+def test_blast_trailing_blank_lines(tmp_path):
+    """Test if the blank lines at the end of the file are skipped."""
+
+    blast_filename = tmp_path / "blastp.outfmt6"
+    blast_filename.write_text(HITS + "\n\n")
+
+    hits = list(Blast(str(blast_filename)))
+    assert [hit.sp_id for hit in hits] == ["P1", "P2"]
+
+
+def test_blast_transcripts(tmp_path):
+    """Test if only the hits of the given transcripts are kept."""
+
+    blast_filename = tmp_path / "blastp.outfmt6"
+    blast_filename.write_text(HITS + "\n")
+
+    hits = list(Blast(str(blast_filename), {"TRINITY_2"}))
+    assert [hit.transcript_id for hit in hits] == ["TRINITY_2"]
@@ -6,7 +6,9 @@ Date: November 2019
 
 import pytest
 from diff_exp_annotations import (transcript_protein_dict, gene_go_dict,
-                                  go_name_dict, wrtie_annotations)
+                                  go_name_dict, wrtie_annotations,
+                                  matrix_transcripts)
+from bloom_filter import BloomFilter
 
 
 def test_transcript_protein_dict_blast():
@@ -30,6 +32,42 @@ def test_transcript_protein_dict_none():
         transcript_to_protein = transcript_protein_dict()
 
 
+def test_transcript_protein_dict_matrix_transcripts(tmp_path):
+    """Test if only the BLAST hits of the matrix transcripts are kept."""
+
+    blast_filename = tmp_path / "blastp.outfmt6"
+    blast_filename.write_text(
+        "TRINITY_1|m.1\tgi|1|sp|P1.1|A_HUMAN\t100.00\t10\t0\n"
+        "TRINITY_2|m.2\tgi|2|sp|P2.1|B_HUMAN\t100.00\t10\t0\n")
+    matrix_filename = tmp_path / "diffExpr.matrix"
+    matrix_filename.write_text("\tds\ths\tlog\tplat\n"
+                               "TRINITY_2\t1\t2\t3\t4\n")
+
+    transcripts = matrix_transcripts(str(matrix_filename))
+    assert transcripts == {"TRINITY_2"}
+    transcript_to_protein = transcript_protein_dict(str(blast_filename),
+                                                    transcripts)
+    assert transcript_to_protein == {"TRINITY_2": "P2"}
+
+
+def test_matrix_transcripts_bloom_filter(tmp_path):
+    """Test if a matrix with more rows than max_set_size is loaded into a
+    Bloom filter sized to its rows."""
+
+    matrix_filename = tmp_path / "diffExpr.matrix"
+    transcripts = [f"TRINITY_{number}" for number in range(50)]
+    matrix_filename.write_text("\tds\ths\tlog\tplat\n" + "".join(
+        f"{transcript}\t1\t2\t3\t4\n" for transcript in transcripts))
+
+    assert matrix_transcripts(str(matrix_filename), 50) == set(transcripts)
+
+    bloom = matrix_transcripts(str(matrix_filename), 10)
+    assert isinstance(bloom, BloomFilter)
+    assert len(bloom) == 50
+    assert bloom.size == BloomFilter(50).size
+    assert all(transcript in bloom for transcript in transcripts)
+
+
 def test_gene_go_dict_gaf():
     """Test if the filename provided is .gaf file."""
 
@@ -0,0 +1,134 @@
+"""This script test the fasta_index.py and fasta_writer.py with various
+conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import random
+import textwrap
+
+import pytest
+from fasta_index import build_fai, parse_region, IndexedFasta
+from fasta_writer import FastaWriter, wrap_sequence
+
+SEQUENCES = {"seq1": "ACGT" * 40, "seq2": "TTGCA", "seq3": "G" * 120}
+
+
+def write_fasta(tmp_path, width=60, blank_line=False):
+    """Write the test sequences and return the FASTA and .fai file paths."""
+
+    fasta_filename = str(tmp_path / "test.fasta")
+    with FastaWriter(fasta_filename, width=width, fai=True,
+                     blank_line=blank_line) as writer:
+        for name, sequence in SEQUENCES.items():
+            writer.write(name + " description", sequence)
+    return fasta_filename, fasta_filename + ".fai"
+
+
+def test_wrap_sequence():
+    """Test if the sequence is wrapped at the width."""
+
+    assert wrap_sequence("ACGTACG", 3) == "ACG\nTAC\nG"
+    assert wrap_sequence("", 3) == ""
+
+
+def test_wrap_sequence_matches_textwrap():
+    """Test if the sequence is wrapped like textwrap, also when the last
+    line is exactly the width."""
+
+    rng = random.Random(0)
+    for width in (1, 7, 60, 70):
+        for length in (0, 1, width - 1, width, width + 1, 2 * width,
+                       rng.randrange(500)):
+            sequence = "".join(rng.choice("ACGT") for _ in range(length))
+            assert wrap_sequence(sequence, width) == \
+                "\n".join(textwrap.wrap(sequence, width=width))
+
+
+@pytest.mark.parametrize("blank_line", [False, True])
+def test_writer_fai_matches_build_fai(tmp_path, blank_line):
+    """Test if the index written with the FASTA file matches the index
+    built from the FASTA file."""
+
+    fasta_filename, fai_filename = write_fasta(tmp_path, 70, blank_line)
+    with open(fai_filename) as fai_file:
+        written_fai = fai_file.read()
+
+    build_fai(fasta_filename, fai_filename)
+    with open(fai_filename) as fai_file:
+        assert fai_file.read() == written_fai
+
+
+@pytest.mark.parametrize("blank_line", [False, True])
+def test_writer_fai_non_ascii_header(tmp_path, blank_line):
+    """Test if the offsets, line bases and line widths of the index match
+    build_fai with non-ASCII headers, lines exactly the width and records
+    written in several buffers."""
+
+    fasta_filename = str(tmp_path / "test.fasta")
+    with FastaWriter(fasta_filename, width=10, fai=True,
+                     blank_line=blank_line, buffer_size=16) as writer:
+        writer.write("seq1 α-hélice", "ACGT" * 5)
+        writer.write("séq2 ü", "A" * 10)
+        writer.write("seq3 ω", "TTGCA")
+        writer.write("seq4", "C" * 33)
+
+    with open(fasta_filename + ".fai", encoding="utf-8") as fai_file:
+        written_fai = fai_file.read()
+    build_fai(fasta_filename)
+    with open(fasta_filename + ".fai", encoding="utf-8") as fai_file:
+        assert fai_file.read() == written_fai
+
+    with IndexedFasta(fasta_filename) as fasta:
+        assert fasta.fetch("séq2") == "A" * 10
+        assert fasta.fetch("seq4", 8, 23) == "C" * 15
+
+
+def test_fetch_subsequences(tmp_path):
+    """Test if every subsequence across the line breaks is fetched."""
+
+    fasta_filename, _ = write_fasta(tmp_path, width=7)
+    with IndexedFasta(fasta_filename) as fasta:
+        for name, sequence in SEQUENCES.items():
+            assert fasta.fetch(name) == sequence
+            for start in range(0, len(sequence), 5):
+                for end in range(start, len(sequence) + 3, 6):
+                    assert fasta.fetch(name, start, end) == \
+                        sequence[start:end]
+
+
+def test_fetch_region(tmp_path):
+    """Test if a samtools style region is fetched."""
+
+    fasta_filename, _ = write_fasta(tmp_path)
+    with IndexedFasta(fasta_filename) as fasta:
+        assert fasta.fetch_region("seq1:2-5") == SEQUENCES["seq1"][1:5]
+        assert fasta.fetch_region("seq2") == SEQUENCES["seq2"]
+        assert fasta.header("seq2") == "seq2 description"
+
+
+def test_fetch_missing(tmp_path):
+    """Test if a missing record raises KeyError."""
+
+    fasta_filename, _ = write_fasta(tmp_path)
+    with IndexedFasta(fasta_filename) as fasta:
+        with pytest.raises(KeyError):
+            fasta.fetch("seq4")
+
+
+def test_build_fai_uneven_lines(tmp_path):
+    """Test if a record with uneven line lengths is rejected."""
+
+    fasta_filename = tmp_path / "uneven.fasta"
+    fasta_filename.write_text(">seq1\nACG\nACGT\n")
+    with pytest.raises(ValueError):
+        build_fai(str(fasta_filename))
+
+
+def test_parse_region():
+    """Test if the region is converted to 0-based half-open coordinates."""
+
+    assert parse_region("chr1:1,000-2,000") == ("chr1", 999, 2000)
+    assert parse_region("chr1:5") == ("chr1", 4, None)
+    assert parse_region("chr1") == ("chr1", 0, None)
@@ -0,0 +1,128 @@
+"""This script test the find_orfs.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import random
+
+from find_orfs import find_orfs, reverse_complement
+from genetic_code import get_code
+
+# A TTG start upstream of the ATG start, in the same frame as the TAA stop
+SEQUENCE = "TTGAAAATGGCCTAA"
+
+
+def test_find_orfs_atg_only():
+    """Test if only ATG starts an ORF by default."""
+
+    orfs = [orf for orf in find_orfs(SEQUENCE, min_length=1)
+            if orf.strand == "+"]
+    assert [(orf.start, orf.end, orf.peptide) for orf in orfs] == \
+        [(6, 15, "MA")]
+
+
+def test_find_orfs_alt_starts():
+    """Test if the alternative start codons of the table start ORFs with
+    alt_starts."""
+
+    orfs = [orf for orf in find_orfs(SEQUENCE, min_length=1,
+                                     longest_only=True, alt_starts=True)
+            if orf.strand == "+"]
+    assert [(orf.start, orf.end, orf.peptide) for orf in orfs] == \
+        [(0, 15, "MKMA")]
+
+
+def plus_orfs(sequence, **options):
+    """Return the start, end, has_stop and peptide of the + strand ORFs."""
+
+    return [(orf.start, orf.end, orf.has_stop, orf.peptide)
+            for orf in find_orfs(sequence, **options) if orf.strand == "+"]
+
+
+def test_find_orfs_minus_strand():
+    """Test if the minus strand ORFs are mapped to forward coordinates."""
+
+    sequence = "GG" + reverse_complement("ATGAAATAA") + "C"
+    orfs = list(find_orfs(sequence, min_length=1))
+
+    assert [tuple(orf) for orf in orfs] == \
+        [("-", -2, 2, 11, True, "MK")]
+    assert reverse_complement(sequence[2:11]) == "ATGAAATAA"
+
+
+def test_find_orfs_longest_only():
+    """Test if only the longest of the nested ORFs is kept."""
+
+    assert plus_orfs("ATGATGAAATAA", min_length=1) == \
+        [(0, 12, True, "MMK"), (3, 12, True, "MK")]
+    assert plus_orfs("ATGATGAAATAA", min_length=1, longest_only=True) == \
+        [(0, 12, True, "MMK")]
+
+
+def test_find_orfs_allow_partial():
+    """Test if the ORFs without a stop codon are dropped without
+    allow_partial."""
+
+    assert plus_orfs("ATGAAAAAAA", min_length=1) == [(0, 9, False, "MKK")]
+    assert plus_orfs("ATGAAAAAAA", min_length=1, allow_partial=False) == []
+
+
+def test_find_orfs_min_length():
+    """Test if the peptide length without the stop codon is the cutoff."""
+
+    assert plus_orfs("ATGAAATAA", min_length=2) == [(0, 9, True, "MK")]
+    assert plus_orfs("ATGAAATAA", min_length=3) == []
+
+
+def brute_force_orfs(sequence, min_length, longest_only, allow_partial):
+    """Return the ORFs found by translating from every ATG codon."""
+
+    code = get_code(1)
+    length = len(sequence)
+    orfs = []
+    for strand, strand_seq in (("+", sequence),
+                               ("-", reverse_complement(sequence))):
+        for frame in range(3):
+            used_stops = set()
+            for start in range(frame, length - 2, 3):
+                if strand_seq[start:start + 3] != "ATG":
+                    continue
+                end = start
+                while end + 3 <= length and \
+                        strand_seq[end:end + 3] not in code.stop_codons:
+                    end += 3
+                has_stop = end + 3 <= length
+                if not has_stop and not allow_partial:
+                    continue
+                if longest_only and end in used_stops:
+                    continue
+                used_stops.add(end)
+                if (end - start) // 3 < min_length:
+                    continue
+
+                peptide = "M" + code.translate(strand_seq[start + 3:end])
+                orf_end = end + 3 if has_stop else end
+                if strand == "+":
+                    orfs.append((strand, frame + 1, start, orf_end, has_stop,
+                                 peptide))
+                else:
+                    orfs.append((strand, -(frame + 1), length - orf_end,
+                                 length - start, has_stop, peptide))
+    return orfs
+
+
+def test_find_orfs_brute_force():
+    """Test if the ORFs of random sequences are the brute force ORFs."""
+
+    rng = random.Random(0)
+    for _ in range(300):
+        sequence = "".join(rng.choice("ACGT")
+                           for _ in range(rng.randrange(0, 120)))
+        for longest_only in (False, True):
+            for allow_partial in (False, True):
+                options = {"min_length": rng.randrange(0, 6),
+                           "longest_only": longest_only,
+                           "allow_partial": allow_partial}
+                assert [tuple(orf) for orf in find_orfs(sequence, **options)]\
+                    == brute_force_orfs(sequence, **options)
@@ -0,0 +1,101 @@
+"""This script test the genbank_features.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import random
+
+import pytest
+import genbank_features
+from genbank_features import parse_location, FeatureTable, FeatureIndex
+
+
+@pytest.mark.parametrize("location, parts", [
+    ("10..20", [(9, 20, 1)]),
+    ("<1..>20", [(0, 20, 1)]),
+    ("5", [(4, 5, 1)]),
+    ("10^11", [(9, 11, 1)]),
+    ("complement(10..20)", [(9, 20, -1)]),
+    ("join(1..5,10..20)", [(0, 5, 1), (9, 20, 1)]),
+    ("complement(join(1..5,10..20))", [(9, 20, -1), (0, 5, -1)]),
+    ("join(complement(30..40),complement(1..5))",
+     [(29, 40, -1), (0, 5, -1)]),
+    ("order(1..5, 8..9)", [(0, 5, 1), (7, 9, 1)]),
+    ("join(J00194.1:1..10,20..30)", [(19, 30, 1)]),
+])
+def test_parse_location(location, parts):
+    """Test if the location is parsed into 0-based half-open parts in
+    transcription order."""
+
+    assert parse_location(location) == parts
+
+
+def make_record(ranges):
+    """Return a GenBank record with one gene feature per range."""
+
+    lines = ["LOCUS       TEST    1000 bp    DNA", "VERSION     TEST.1",
+             "FEATURES             Location/Qualifiers"]
+    for number, (start, end) in enumerate(ranges):
+        lines.append(f"     gene            {start + 1}..{end}")
+        lines.append(f"                     /gene=\"G{number}\"")
+    lines.append("ORIGIN      ")
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize("size", [0, 1, 7, 16, 17, 200])
+def test_feature_index_overlap(size):
+    """Test if the interval tree finds the same features as a linear scan."""
+
+    rng = random.Random(size)
+    ranges = []
+    for _ in range(size):
+        start = rng.randrange(1000)
+        ranges.append((start, start + rng.randint(1, 150)))
+    table = FeatureTable(make_record(ranges))
+    feature_index = FeatureIndex(table)
+    assert len(table) == size
+
+    for _ in range(300):
+        start = rng.randrange(-10, 1200)
+        end = start + rng.randint(1, 100)
+        expected = {feature for feature, (feature_start, feature_end)
+                    in enumerate(ranges)
+                    if feature_start < end and start < feature_end}
+        hits = feature_index.overlap(start, end)
+        assert len(hits) == len(expected)
+        assert set(hits) == expected
+
+    for position in range(0, 1200, 37):
+        assert set(feature_index.at(position)) == \
+            set(feature_index.overlap(position, position + 1))
+
+
+def test_main_empty_variants(tmp_path, monkeypatch):
+    """Test if an empty variants file writes an empty features.tsv file
+    instead of the CDS FASTA file."""
+
+    gb_filename = tmp_path / "test.gb"
+    gb_filename.write_text(make_record([(0, 10)]))
+    variants_filename = tmp_path / "variants.tsv"
+    variants_filename.write_text("")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["genbank_features.py", "test.gb",
+                                      "--variants", "variants.tsv"])
+    genbank_features.main()
+
+    assert (tmp_path / "features.tsv").read_text() == ""
+    assert not (tmp_path / "cds.fasta").exists()
+
+
+def test_main_missing_input(tmp_path, monkeypatch):
+    """Test if a missing GenBank file exits before the output is created."""
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["genbank_features.py", "missing.gb"])
+    with pytest.raises(SystemExit):
+        genbank_features.main()
+
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,87 @@
+"""This script test the genbank_index.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import os
+import random
+import struct
+
+import pytest
+from benchmark import generate_genbank
+from genbank_index import build_index, GenbankIndex, HEADER, INDEX_MAGIC
+from parse_fasta import split_records, convert_record
+
+RECORDS = 7
+
+
+def write_genbank(tmp_path, records=RECORDS, newline="\n"):
+    """Write the test GenBank file and return the file path."""
+
+    filename = str(tmp_path / "test.gb")
+    generate_genbank(filename, records, random.Random(0), 100, 400)
+    if newline != "\n":
+        with open(filename) as gb_file:
+            text = gb_file.read()
+        with open(filename, "w", newline="") as gb_file:
+            gb_file.write(text.replace("\n", newline))
+    return filename
+
+
+def accession(number):
+    """Return the VERSION accession of a generated record."""
+
+    return f"NM_{number:06d}.1"
+
+
+def test_index_format(tmp_path):
+    """Test if the index has the header and sorted fixed-width entries."""
+
+    filename = write_genbank(tmp_path)
+    assert build_index(filename) == RECORDS
+
+    with open(filename + ".gbi", "rb") as index_file:
+        data = index_file.read()
+    magic, key_width, count, gb_size = HEADER.unpack_from(data)
+    assert (magic, count, gb_size) == (INDEX_MAGIC, RECORDS,
+                                       os.path.getsize(filename))
+
+    entry = struct.Struct(f">{key_width}sQQ")
+    keys = [entry.unpack_from(data, HEADER.size + i * entry.size)[0]
+            for i in range(count)]
+    assert keys == sorted(accession(i).encode() for i in range(RECORDS))
+    assert len(data) == HEADER.size + count * entry.size
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_get_record(tmp_path, newline):
+    """Test if the binary search finds every record and no other ID."""
+
+    filename = write_genbank(tmp_path, newline=newline)
+    records = list(split_records(filename))
+
+    with GenbankIndex(filename) as gb_index:
+        assert len(gb_index) == RECORDS
+        for number, record in enumerate(records):
+            assert gb_index.get_record(accession(number)) == record
+            assert gb_index.get_fasta(accession(number)) == \
+                convert_record(record)
+
+        for missing in ("NM_000000", "NM_999999.1", "A", "NM_000000.10"):
+            assert missing not in gb_index
+        with pytest.raises(KeyError):
+            gb_index.get_record("NM_999999.1")
+
+
+def test_stale_index_rebuilt(tmp_path):
+    """Test if the index is built again when the GenBank file changed."""
+
+    filename = write_genbank(tmp_path, 2)
+    with GenbankIndex(filename) as gb_index:
+        assert len(gb_index) == 2
+
+    write_genbank(tmp_path, 4)
+    with GenbankIndex(filename) as gb_index:
+        assert len(gb_index) == 4
+        assert accession(3) in gb_index
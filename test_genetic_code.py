@@ -0,0 +1,57 @@
+"""This script test the genetic_code.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import random
+
+import pytest
+from genetic_code import get_code, translate, GENETIC_CODES
+
+
+@pytest.mark.parametrize("table_id", [1, 2, 4, 11, 31])
+def test_translate_all_codons(table_id):
+    """Test if every codon, alone and packed with the other 63 codons into
+    one sequence, translates to its amino acid in the table."""
+
+    code = get_code(table_id)
+    assert len(code.forward) == 64
+
+    for codon, amino_acid in code.forward.items():
+        assert code.translate(codon) == amino_acid
+        assert code.translate(codon.lower().replace("t", "u")) == amino_acid
+
+    codons = list(code.forward)
+    random.Random(table_id).shuffle(codons)
+    assert code.translate("".join(codons)) == \
+        "".join(code.forward[codon] for codon in codons)
+
+
+def test_translate_codons_with_n():
+    """Test if codons with N are resolved when every codon agrees."""
+
+    assert translate("GCN") == "A"
+    assert translate("GGN") == "G"
+    assert translate("NNN") == "X"
+    assert translate("ATN") == "X"
+    assert translate("GCNNNNATG") == "AXM"
+
+
+def test_translate_partial_codons():
+    """Test if the trailing bases that do not make a codon are ignored."""
+
+    assert translate("") == ""
+    assert translate("AT") == ""
+    assert translate("ATGGC") == "M"
+    assert translate(b"ATGTAA") == "M*"
+
+
+def test_get_code_unknown_table():
+    """Test if an unknown table ID raises ValueError."""
+
+    assert 7 not in GENETIC_CODES
+    with pytest.raises(ValueError):
+        get_code(7)
+    with pytest.raises(ValueError):
+        get_code("standard")
@@ -0,0 +1,91 @@
+"""This script test the go_slim.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+from go_slim import (slim_terms, slim_table, map_to_slim,
+                     map_transcripts_to_slim, slim_counts)
+from parse_humun_genes_go import go_is_a_dict
+
+OBO = """format-version: 1.2
+subsetdef: goslim_test "Test slim"
+
+[Term]
+id: GO:0000001
+name: root
+subset: goslim_test
+
+[Term]
+id: GO:0000002
+name: left
+is_a: GO:0000001 ! root
+subset: goslim_test
+
+[Term]
+id: GO:0000003
+name: right
+is_a: GO:0000001 ! root
+
+[Term]
+id: GO:0000004
+name: leaf
+is_a: GO:0000002 ! left
+is_a: GO:0000003 ! right
+
+[Term]
+id: GO:0000005
+name: other root
+
+"""
+
+
+def write_obo(tmp_path):
+    """Write the test GO terms and return the file path."""
+
+    obo_filename = str(tmp_path / "test.obo")
+    with open(obo_filename, "w") as obo_file:
+        obo_file.write(OBO)
+    return obo_filename
+
+
+def test_slim_terms(tmp_path):
+    """Test if the slim is read from the subset tags or the whole file."""
+
+    obo_filename = write_obo(tmp_path)
+    assert slim_terms(obo_filename, "goslim_test") == {"GO:0000001",
+                                                       "GO:0000002"}
+    assert len(slim_terms(obo_filename)) == 5
+
+
+def test_slim_table(tmp_path):
+    """Test if every term maps to the slim terms among itself and its
+    parents."""
+
+    go_dict = go_is_a_dict(write_obo(tmp_path))
+    table = slim_table(go_dict, {"GO:0000001", "GO:0000002"})
+
+    assert table["GO:0000001"] == {"GO:0000001"}
+    assert table["GO:0000002"] == {"GO:0000001", "GO:0000002"}
+    assert table["GO:0000003"] == {"GO:0000001"}
+    assert table["GO:0000004"] == {"GO:0000001", "GO:0000002"}
+    assert table["GO:0000005"] == set()
+
+
+def test_map_to_slim_counts(tmp_path):
+    """Test if proteins and transcripts are mapped and counted."""
+
+    go_dict = go_is_a_dict(write_obo(tmp_path))
+    table = slim_table(go_dict, {"GO:0000001", "GO:0000002"})
+    gene_to_go = {"P1": {"GO:0000003", "GO:0000004"}, "P2": {"GO:0000003"},
+                  "P3": {"GO:9999999"}}
+
+    mapping = map_to_slim(gene_to_go, table)
+    assert mapping == {"P1": {"GO:0000001", "GO:0000002"},
+                       "P2": {"GO:0000001"}, "P3": set()}
+    assert slim_counts(mapping) == {"GO:0000001": 2, "GO:0000002": 1}
+
+    transcripts = map_transcripts_to_slim({"t1": "P2", "t2": "P2",
+                                           "t3": "P4"}, gene_to_go, table)
+    assert transcripts == {"t1": {"GO:0000001"}, "t2": {"GO:0000001"},
+                           "t3": set()}
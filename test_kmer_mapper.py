@@ -0,0 +1,98 @@
+"""This script test the kmer_mapper.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import os
+import sys
+import random
+import subprocess
+
+from blast_class import Blast
+from diff_exp_annotations import transcript_protein_dict
+from fasta_writer import FastaWriter
+from genetic_code import get_code
+from kmer_mapper import KmerIndex, map_transcripts
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+PROTEINS = 20
+
+
+def write_fasta_files(tmp_path):
+    """Write a SwissProt FASTA file and the transcripts of every other
+    protein, and return the file paths."""
+
+    rng = random.Random(0)
+    back_translation = {}
+    for codon, amino_acid in get_code(1).forward.items():
+        back_translation.setdefault(amino_acid, []).append(codon)
+
+    proteins = ["M" + "".join(rng.choices(AMINO_ACIDS, k=rng.randint(60, 120)))
+                for _ in range(PROTEINS)]
+    protein_filename = str(tmp_path / "sp.fasta")
+    with FastaWriter(protein_filename) as writer:
+        for number, protein in enumerate(proteins):
+            writer.write(f"sp|P{number:05d}|PROT{number}_HUMAN Protein "
+                         f"{number} OS=Homo sapiens SV=2", protein)
+
+    transcripts_filename = str(tmp_path / "transcripts.fasta")
+    with FastaWriter(transcripts_filename) as writer:
+        for number in range(0, PROTEINS, 2):
+            dna = "GG" + "".join(rng.choice(back_translation[amino_acid])
+                                 for amino_acid in proteins[number]) + "TAA"
+            writer.write(f"TRINITY_DN{number}_c0_g1_i1", dna)
+
+    return protein_filename, transcripts_filename
+
+
+def expected_proteins():
+    """Return the protein of every transcript."""
+
+    return {f"TRINITY_DN{number}_c0_g1_i1": f"P{number:05d}"
+            for number in range(0, PROTEINS, 2)}
+
+
+def test_map_transcripts_read_by_blast(tmp_path):
+    """Test if the hits are read by transcript_protein_dict and Blast."""
+
+    protein_filename, transcripts_filename = write_fasta_files(tmp_path)
+    output_filename = str(tmp_path / "hits.outfmt6")
+    with KmerIndex(protein_filename) as kmer_index:
+        count = map_transcripts(kmer_index, transcripts_filename,
+                                output_filename)
+
+    assert count == PROTEINS // 2
+    assert transcript_protein_dict(output_filename) == expected_proteins()
+
+    hits = list(Blast(output_filename))
+    assert {hit.transcript_id: hit.sp_id for hit in hits} == \
+        expected_proteins()
+    assert all(hit.pident == 100 and hit.mismatch == 0 for hit in hits)
+
+
+def test_map_transcripts_workers_spawn(tmp_path):
+    """Test if the worker processes map the same hits with the spawn start
+    method."""
+
+    protein_filename, transcripts_filename = write_fasta_files(tmp_path)
+    serial_filename = str(tmp_path / "serial.outfmt6")
+    with KmerIndex(protein_filename) as kmer_index:
+        map_transcripts(kmer_index, transcripts_filename, serial_filename)
+
+    workers_filename = str(tmp_path / "workers.outfmt6")
+    script = (
+        "import sys, multiprocessing\n"
+        "from kmer_mapper import KmerIndex, map_transcripts\n"
+        "if __name__ == '__main__':\n"
+        "    multiprocessing.set_start_method('spawn')\n"
+        "    with KmerIndex(sys.argv[1]) as kmer_index:\n"
+        "        map_transcripts(kmer_index, sys.argv[2], sys.argv[3], 2,\n"
+        "                        chunksize=2)\n")
+    subprocess.run([sys.executable, "-c", script, protein_filename,
+                    transcripts_filename, workers_filename], check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    with open(serial_filename) as serial_file, \
+            open(workers_filename) as workers_file:
+        assert workers_file.read() == serial_file.read()
@@ -0,0 +1,142 @@
+"""This script test the parse_fasta.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import random
+
+import pytest
+import parse_fasta
+from benchmark import generate_genbank
+from fasta_index import build_fai
+from fasta_writer import FastaWriter
+from profiling import subscribe, unsubscribe
+from parse_fasta import (split_records, record_offsets, get_header,
+                         get_origin, convert_parallel)
+
+RECORDS = 5
+
+
+def write_genbank(tmp_path, newline):
+    """Write the test GenBank file with the given line ending and return the
+    file path."""
+
+    filename = str(tmp_path / "test.gb")
+    generate_genbank(filename, RECORDS, random.Random(0), 100, 400)
+    with open(filename, newline="") as gb_file:
+        text = gb_file.read()
+    with open(filename, "w", newline="") as gb_file:
+        gb_file.write(text.replace("\n", newline))
+    return filename
+
+
+def convert_serial(filename, fasta_filename):
+    """Convert the GenBank file like the serial path of main."""
+
+    with FastaWriter(fasta_filename, width=70, fai=True,
+                     blank_line=True) as writer:
+        for record in split_records(filename):
+            writer.write(get_header(record), get_origin(record))
+
+
+def read(filename):
+    """Return the content of a file."""
+
+    with open(filename) as text_file:
+        return text_file.read()
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+def test_record_offsets(tmp_path, newline):
+    """Test if every record is found when the terminator is split between
+    two chunks."""
+
+    filename = write_genbank(tmp_path, newline)
+    for buffer_size in (1, 2, 3, 5, 1 << 20):
+        offsets = list(record_offsets(filename, buffer_size))
+        assert len(offsets) == RECORDS
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_workers_match_serial(tmp_path, newline):
+    """Test if the --workers conversion writes the same FASTA and .fai files
+    as the serial conversion."""
+
+    filename = write_genbank(tmp_path, newline)
+    serial_filename = str(tmp_path / "serial.fasta")
+    convert_serial(filename, serial_filename)
+
+    parallel_filename = str(tmp_path / "parallel.fasta")
+    with open(parallel_filename, "w") as parallel_file:
+        convert_parallel(filename, parallel_file, 2, shard_size=1,
+                         fai_filename=parallel_filename + ".fai")
+
+    assert read(serial_filename).count(">") == RECORDS
+    assert read(parallel_filename) == read(serial_filename)
+    assert read(parallel_filename + ".fai") == read(serial_filename + ".fai")
+
+
+def test_crlf_matches_lf(tmp_path):
+    """Test if a CRLF GenBank file converts like the same LF file."""
+
+    lf_directory = tmp_path / "lf"
+    crlf_directory = tmp_path / "crlf"
+    lf_directory.mkdir()
+    crlf_directory.mkdir()
+
+    convert_serial(write_genbank(lf_directory, "\n"),
+                   str(lf_directory / "out.fasta"))
+    convert_serial(write_genbank(crlf_directory, "\r\n"),
+                   str(crlf_directory / "out.fasta"))
+    assert read(str(lf_directory / "out.fasta")) == \
+        read(str(crlf_directory / "out.fasta"))
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_profile_counts_records(tmp_path, monkeypatch, workers):
+    """Test if the split records and convert stages count the records in
+    the serial and --workers modes."""
+
+    filename = write_genbank(tmp_path, "\n")
+    monkeypatch.setattr(sys, "stdout", sys.stdout)
+    monkeypatch.setattr(sys, "argv", ["parse_fasta.py", filename,
+                                      str(tmp_path / "output"),
+                                      "--workers", workers])
+    reports = []
+    subscribe(reports.append)
+    try:
+        parse_fasta.main()
+    finally:
+        unsubscribe(reports.append)
+
+    records = {report["stage"]: report["records"] for report in reports}
+    assert records == {"split records": RECORDS, "convert": RECORDS}
+
+
+# The ORIGIN line of GenBank records ends with spaces
+WRAPPED_RECORD = "\n".join([
+    "LOCUS       NM_002738               4582 bp    mRNA    linear   PRI",
+    "DEFINITION  Homo sapiens protein kinase C beta (PRKCB), transcript "
+    "variant 2,",
+    "            mRNA.",
+    "ACCESSION   NM_002738",
+    "VERSION     NM_002738.7",
+    "ORIGIN      ",
+    "        1 gcggccctgc ggtccccggg",
+    "//", ""])
+
+
+def test_get_header_wrapped_definition(tmp_path):
+    """Test if a DEFINITION wrapped over two lines makes a one-line header
+    that build_fai accepts."""
+
+    assert get_header(WRAPPED_RECORD) == \
+        ">NM_002738.7 Homo sapiens protein kinase C beta (PRKCB), " \
+        "transcript variant 2, mRNA"
+
+    fasta_filename = str(tmp_path / "wrapped.fasta")
+    with FastaWriter(fasta_filename, width=70) as writer:
+        writer.write(get_header(WRAPPED_RECORD), get_origin(WRAPPED_RECORD))
+    assert build_fai(fasta_filename) == 1
@@ -0,0 +1,104 @@
+"""This script test that the in-memory, --spill and --workers modes of
+parse_humun_genes_go.py write the same report.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import sys
+import random
+from io import StringIO
+
+import pytest
+import parse_humun_genes_go
+from benchmark import generate_obo, generate_gaf
+from parse_humun_genes_go import (go_is_a_dict, map_protein_to_go,
+                                  read_protein_go_pairs, write_sorted_runs,
+                                  merge_runs, write_report,
+                                  write_report_parallel)
+
+
+@pytest.fixture
+def go_files(tmp_path):
+    """Write a small GO terms and gene association file pair."""
+
+    rng = random.Random(0)
+    obo_filename = str(tmp_path / "go.obo")
+    gaf_filename = str(tmp_path / "genes.gaf")
+    go_ids = generate_obo(obo_filename, 200, 5, 3, rng)
+    generate_gaf(gaf_filename, 60, go_ids, rng)
+    return obo_filename, gaf_filename
+
+
+def run_main(tmp_path, monkeypatch, go_files, output_name, *options):
+    """Run the script with the options and return the report."""
+
+    monkeypatch.setattr(sys, "stdout", sys.stdout)
+    monkeypatch.setattr(sys, "argv", ["parse_humun_genes_go.py", *go_files,
+                                      str(tmp_path / output_name),
+                                      *options])
+    parse_humun_genes_go.main()
+    with open(tmp_path / (output_name + ".tsv")) as report_file:
+        return report_file.read()
+
+
+def test_modes_write_same_report(tmp_path, monkeypatch, go_files):
+    """Test if --spill with a tiny memory budget and --workers 2 write the
+    same report as the in-memory mode."""
+
+    serial = run_main(tmp_path, monkeypatch, go_files, "serial")
+    assert serial.count("\n") > 60
+
+    assert run_main(tmp_path, monkeypatch, go_files, "spill", "--spill",
+                    "--memory-budget", "0.001") == serial
+    assert run_main(tmp_path, monkeypatch, go_files, "workers",
+                    "--workers", "2") == serial
+
+
+def test_spill_with_workers_rejected(tmp_path, monkeypatch, go_files):
+    """Test if --spill with --workers exits instead of ignoring --workers."""
+
+    with pytest.raises(SystemExit, match="--spill or --workers"):
+        run_main(tmp_path, monkeypatch, go_files, "both", "--spill",
+                 "--workers", "2")
+    assert not (tmp_path / "both.tsv").exists()
+
+
+def test_merge_runs_max_open_files(tmp_path, go_files):
+    """Test if merging the runs in several passes writes the same report."""
+
+    obo_filename, gaf_filename = go_files
+    go_dict = go_is_a_dict(obo_filename)
+    pairs = list(read_protein_go_pairs(gaf_filename))
+
+    expected = StringIO()
+    write_report(sorted(set(pairs)), go_dict, expected)
+
+    run_filenames = write_sorted_runs(pairs, str(tmp_path), 2000)
+    assert len(run_filenames) > 9
+    merged = StringIO()
+    write_report(merge_runs(run_filenames, str(tmp_path), 3), go_dict,
+                 merged)
+
+    assert merged.getvalue() == expected.getvalue()
+
+
+def test_write_report_parallel_shards(go_files):
+    """Test if one protein per shard writes the same report as the serial
+    report."""
+
+    obo_filename, gaf_filename = go_files
+    go_dict = go_is_a_dict(obo_filename)
+    gene_association_map = map_protein_to_go(gaf_filename)
+
+    expected = StringIO()
+    write_report(((protein, go_id) for protein in sorted(gene_association_map)
+                  for go_id in sorted(gene_association_map[protein])),
+                 go_dict, expected)
+
+    report = StringIO()
+    count = write_report_parallel(gene_association_map, go_dict, report, 2,
+                                  shard_size=1)
+
+    assert count == len(gene_association_map)
+    assert report.getvalue() == expected.getvalue()
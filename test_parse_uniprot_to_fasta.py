@@ -0,0 +1,133 @@
+"""This script test the parse_uniprot_to_fasta.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+from parse_uniprot_to_fasta import (UniprotEntry, read_records,
+                                    parse_entries, write_fasta)
+
+ENTRY = """ID   NF1_HUMAN               Reviewed;        2839 AA.
+AC   P21359; O00662; Q14284;
+DT   01-MAY-1991, integrated into UniProtKB/Swiss-Prot.
+DT   01-OCT-1996, sequence version 2.
+DT   10-FEB-2021, entry version 251.
+DE   RecName: Full=Neurofibromin {ECO:0000305};
+DE   Flags: Fragment;
+GN   Name=NF1 {ECO:0000312|HGNC:HGNC:7765};
+OS   Homo sapiens (Human).
+OX   NCBI_TaxID=9606;
+DR   PDB; 1NF1; X-ray; 2.50 A; A=1198-1530.
+DR   GO; GO:0005737; C:cytoplasm; IDA:UniProtKB.
+DR   GO; GO:0005096; F:GTPase activator activity; IDA:UniProtKB.
+DR   GO; GO:0005737; C:cytoplasm; IEA:InterPro.
+PE   1: Evidence at protein level;
+SQ   SEQUENCE   20 AA;  2000 MW;  0000000000000000 CRC64;
+     MAAHRPVEWV QAVVSRFDEQ
+//
+ID   NOGN_MOUSE              Unreviewed;        10 AA.
+AC   Q00002;
+DT   01-JAN-2020, sequence version 1.
+DT   03-MAR-2022, entry version 5.
+DE   SubName: Full=Uncharacterized protein;
+OS   Mus musculus (Mouse).
+OX   NCBI_TaxID=10090;
+DR   GO; GO:0008150; P:biological_process; ND:UniProtKB.
+PE   4: Predicted;
+SQ   SEQUENCE   10 AA;  1000 MW;  0000000000000000 CRC64;
+     MKTAYIAKQR
+//
+"""
+
+
+def write_uniprot(tmp_path):
+    """Write the test UniProt file and return the file path."""
+
+    uniprot_filename = tmp_path / "uniprot.txt"
+    uniprot_filename.write_text(ENTRY)
+    return str(uniprot_filename)
+
+
+def test_entry_line_codes(tmp_path):
+    """Test if the lines are dispatched on their line codes and the fields
+    are decoded."""
+
+    entry = next(parse_entries(write_uniprot(tmp_path)))
+
+    assert (entry.entry_name, entry.status, entry.accession) == \
+        ("NF1_HUMAN", "Reviewed", "P21359")
+    assert (entry.taxon_id, entry.protein_evi) == ("9606", "1")
+    assert entry.gene_name == "NF1"
+    assert entry.protein_name == "Neurofibromin (Fragment)"
+    assert entry.organism == "Homo sapiens"
+    assert entry.seq_version == "2"
+    assert entry.entry_date == "20210210"
+    assert entry.sequence == "MAAHRPVEWVQAVVSRFDEQ"
+    assert entry.go_annotations == [("GO:0005737", "C", "IDA"),
+                                    ("GO:0005096", "F", "IDA"),
+                                    ("GO:0005737", "C", "IEA")]
+    assert entry.go_ids == {"GO:0005737", "GO:0005096"}
+
+
+def test_entry_lazy_fields(tmp_path):
+    """Test if the fields are only decoded when they are used."""
+
+    record = next(read_records(write_uniprot(tmp_path)))
+    entry = UniprotEntry(record)
+
+    lazy_fields = ("gene_name", "protein_name", "organism", "seq_version",
+                   "entry_date", "sequence", "go_annotations")
+    assert not any(field in vars(entry) for field in lazy_fields)
+
+    assert entry.gene_name == "NF1"
+    assert "gene_name" in vars(entry)
+    assert "sequence" not in vars(entry)
+
+
+def test_parse_entries_filters(tmp_path):
+    """Test if the reviewed, taxon and evidence filters are applied."""
+
+    uniprot_filename = write_uniprot(tmp_path)
+
+    def accessions(**filters):
+        return [entry.accession
+                for entry in parse_entries(uniprot_filename, **filters)]
+
+    assert accessions() == ["P21359"]
+    assert accessions(reviewed_only=False) == ["P21359", "Q00002"]
+    assert accessions(reviewed_only=False, taxon_ids={"10090"}) == ["Q00002"]
+    assert accessions(reviewed_only=False, max_evidence=3) == ["P21359"]
+
+
+def test_write_fasta_gene_to_go_and_gaf(tmp_path):
+    """Test if the DR GO lines fill gene_to_go and the GAF 2.2 file."""
+
+    fasta_filename = str(tmp_path / "output.fasta")
+    gaf_filename = str(tmp_path / "output.gaf")
+    gene_to_go = {}
+    count = write_fasta(parse_entries(write_uniprot(tmp_path),
+                                      reviewed_only=False),
+                        fasta_filename, gene_to_go=gene_to_go,
+                        gaf_filename=gaf_filename)
+
+    assert count == 2
+    assert gene_to_go == {"P21359": {"GO:0005737", "GO:0005096"},
+                          "Q00002": {"GO:0008150"}}
+
+    with open(gaf_filename) as gaf_file:
+        assert gaf_file.readline() == "!gaf-version: 2.2\n"
+        lines = [line.rstrip("\n").split("\t") for line in gaf_file]
+
+    assert len(lines) == 4
+    assert all(len(columns) == 17 for columns in lines)
+    # Every required column has a value
+    for columns in lines:
+        for column in (0, 1, 2, 3, 4, 5, 6, 8, 11, 12, 13, 14):
+            assert columns[column]
+
+    assert lines[0][:7] == ["UniProtKB", "P21359", "NF1", "located_in",
+                            "GO:0005737", "UniProtKB:P21359", "IDA"]
+    assert lines[1][3] == "enables"
+    assert lines[0][13] == "20210210"
+    assert lines[3][2:4] == ["NOGN_MOUSE", "involved_in"]
+    assert lines[3][12:14] == ["taxon:10090", "20220303"]
@@ -0,0 +1,52 @@
+"""This script test the profiling.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+from profiling import subscribe, unsubscribe, stage, profiled, timed
+
+
+def test_timed_reports_when_exhausted():
+    """Test if timed reports the stage once the items are read."""
+
+    reports = []
+    subscribe(reports.append)
+    try:
+        assert list(timed(iter("abc"), "split records", 3)) == ["a", "b", "c"]
+    finally:
+        unsubscribe(reports.append)
+
+    assert len(reports) == 1
+    assert reports[0]["stage"] == "split records"
+    assert (reports[0]["records"], reports[0]["bytes_read"]) == (3, 3)
+
+
+def test_timed_reports_when_closed():
+    """Test if timed reports the items read when it is closed early."""
+
+    reports = []
+    subscribe(reports.append)
+    try:
+        records = timed(iter("abc"), "split records")
+        assert next(records) == "a"
+        records.close()
+    finally:
+        unsubscribe(reports.append)
+
+    assert [(report["stage"], report["records"]) for report in reports] == \
+        [("split records", 1)]
+
+
+def test_no_subscribers():
+    """Test if nothing is reported without subscribers."""
+
+    reports = []
+    subscribe(reports.append)
+    unsubscribe(reports.append)
+
+    with stage("load BLAST", 1):
+        pass
+    assert profiled("count")(len)("abc") == 3
+    assert list(timed(iter("ab"), "split records")) == ["a", "b"]
+    assert reports == []
@@ -0,0 +1,91 @@
+"""This script test the protein_properties.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import pytest
+from protein_properties import (count_residues, average_mass,
+                                monoisotopic_mass, isoelectric_point, gravy,
+                                extinction_coefficient, instability_index,
+                                protein_properties, batch_properties)
+
+# Human ubiquitin, UniProt P0CG48 residues 1-76
+UBIQUITIN = "MQIFVKTLTGKTITLEVEPSDTIENVKAKIQDKEGIPPDQQRLIFAGKQLEDGRTLSDYNIQK" \
+            "ESTLHLVLRLRGG"
+# Human preproinsulin, UniProt P01308
+INSULIN = "MALWMRLLPLLALLALWGPDPAAAFVNQHLCGSHLVEALYLVCGERGFFYTPKTRREAEDLQVGQ" \
+          "VELGGGPGAGSLQPLALEGSLQKRGIVEQCCTSICSLYQLENYCN"
+
+
+def test_ubiquitin_protparam():
+    """Test if the mass, pI and GRAVY of ubiquitin are the ExPASy ProtParam
+    values."""
+
+    counts = count_residues(UBIQUITIN)
+
+    assert average_mass(counts) == pytest.approx(8564.84, abs=0.01)
+    assert monoisotopic_mass(counts) == pytest.approx(8559.62, abs=0.01)
+    assert isoelectric_point(counts, "M", "G") == pytest.approx(6.56,
+                                                                 abs=0.01)
+    assert gravy(counts) == pytest.approx(-0.489, abs=0.001)
+    # One tyrosine, no tryptophan or cysteine
+    assert extinction_coefficient(counts) == (1490, 1490)
+
+
+def test_insulin_protparam():
+    """Test if the pI and the extinction coefficients with and without
+    cystines of preproinsulin are the ExPASy ProtParam values."""
+
+    counts = count_residues(INSULIN)
+
+    assert average_mass(counts) == pytest.approx(11980.91, abs=0.01)
+    assert isoelectric_point(counts, "M", "N") == pytest.approx(5.22,
+                                                                 abs=0.01)
+    # Two tryptophans, four tyrosines and six cysteines forming 3 cystines
+    assert extinction_coefficient(counts) == (16960, 17335)
+
+
+def test_instability_index():
+    """Test if the instability index is the mean of the dipeptide
+    instability weight values times ten."""
+
+    # AC 44.94, CD 20.26
+    assert instability_index("ACD") == pytest.approx(10 / 3 * 65.2)
+    # Dipeptides with an unknown residue are not weighted
+    assert instability_index("AXC") == 0.0
+    assert instability_index("") == 0.0
+    assert protein_properties(UBIQUITIN)["instability_index"] < 40
+    assert protein_properties(INSULIN)["instability_index"] > 40
+
+
+def test_empty_and_non_standard():
+    """Test if empty sequences and non-standard residues are handled."""
+
+    empty = protein_properties("")
+    assert empty["length"] == 0
+    assert (empty["average_mass"], empty["monoisotopic_mass"],
+            empty["gravy"], empty["instability_index"]) == (0.0, 0.0, 0.0,
+                                                            0.0)
+    assert (empty["extinction_reduced"], empty["extinction_cystines"]) == \
+        (0, 0)
+
+    # X, B and Z are not counted, the trailing stop is dropped
+    properties = protein_properties("axbzw*")
+    assert properties["length"] == 5
+    assert properties["average_mass"] == \
+        pytest.approx(protein_properties("AW")["average_mass"])
+    assert properties["gravy"] == protein_properties("AW")["gravy"]
+    assert properties["extinction_reduced"] == 5500
+
+
+def test_batch_properties():
+    """Test if the batch properties are the properties of each sequence."""
+
+    sequences = [UBIQUITIN, INSULIN, "", "MKX*"]
+    records = [("ubiquitin", UBIQUITIN), ("insulin", INSULIN)]
+
+    assert list(batch_properties(sequences)) == \
+        [(None, protein_properties(sequence)) for sequence in sequences]
+    assert list(batch_properties(records)) == \
+        [(name, protein_properties(sequence)) for name, sequence in records]
@@ -0,0 +1,102 @@
+"""This script test the translate_mrna.py with various conditions.
+
+Author: Jia Yi Terri Shen
+Date: October 2026
+"""
+
+import random
+
+from translate_mrna import (codon_lookup, translate_sequence, read_fasta,
+                            translate_record, translate_batch)
+
+FASTA = """>seq1 first record
+CCATGGCT
+GCTTAAGG
+
+>seq2
+AAAAAAAAAAAA
+>seq3 rna
+ccaugaaaugauu
+"""
+
+
+def write_fasta(tmp_path, text=FASTA):
+    """Write the test FASTA file and return the file path."""
+
+    fasta_filename = tmp_path / "sequences.fasta"
+    fasta_filename.write_text(text)
+    return str(fasta_filename)
+
+
+def test_unknown_residue():
+    """Test if codon_lookup and translate_sequence write the unknown codons
+    as the same letter."""
+
+    assert codon_lookup("ATG") == "M"
+    assert codon_lookup("TAA") == "-"
+    assert codon_lookup("GCN") == "A"
+    assert codon_lookup("NNN") == codon_lookup("AT") == "X"
+    assert translate_sequence("CCATGNNNGCTTAAGG", 2) == "MXA"
+
+
+def test_read_fasta(tmp_path):
+    """Test if the records are read with their wrapped lines joined."""
+
+    assert list(read_fasta(write_fasta(tmp_path))) == [
+        ("seq1 first record", "CCATGGCTGCTTAAGG"),
+        ("seq2", "AAAAAAAAAAAA"),
+        ("seq3 rna", "ccaugaaaugauu")]
+
+
+def test_translate_record():
+    """Test if the longest reading frame is kept and records without an ORF
+    have no frame."""
+
+    assert translate_record(("seq1 first record", "CCATGGCTGCTTAAGG"))[:3] \
+        == ("seq1", 3, "MAA")
+    assert translate_record(("seq2", "AAAAAAAAAAAA")) == \
+        ("seq2", None, None, None)
+    assert translate_record(("seq3", "ccaugaaaugauu"))[:3] == \
+        ("seq3", 3, "MK")
+
+
+def test_translate_batch_no_orf(tmp_path):
+    """Test if a record without an ORF gets an N/A summary row and no
+    protein."""
+
+    output_name = str(tmp_path / "translated")
+    assert translate_batch(write_fasta(tmp_path), output_name) == 3
+
+    with open(output_name + ".tsv") as summary_file:
+        rows = [line.rstrip("\n").split("\t") for line in summary_file]
+    assert rows[0] == ["record", "frame", "length", "weight"]
+    assert rows[1][:3] == ["seq1", "3", "3"]
+    assert rows[2] == ["seq2", "N/A", "N/A", "N/A"]
+
+    with open(output_name + ".fasta") as protein_file:
+        assert protein_file.read() == ">seq1\nMAA\n>seq3\nMK\n"
+
+
+def test_translate_batch_workers_order(tmp_path):
+    """Test if two workers write the same files in the same order as the
+    serial mode."""
+
+    rng = random.Random(0)
+    records = []
+    for number in range(200):
+        sequence = "".join(rng.choice("ACGT")
+                           for _ in range(rng.randrange(0, 300)))
+        records.append(f">record{number}\n{sequence}\n")
+    fasta_filename = write_fasta(tmp_path, "".join(records))
+
+    outputs = []
+    for workers in (1, 2):
+        output_name = str(tmp_path / f"workers{workers}")
+        assert translate_batch(fasta_filename, output_name, workers,
+                               chunksize=3) == 200
+        with open(output_name + ".fasta") as protein_file, \
+                open(output_name + ".tsv") as summary_file:
+            outputs.append((protein_file.read(), summary_file.read()))
+
+    assert outputs[0] == outputs[1]
+    assert "N/A" in outputs[0][1]
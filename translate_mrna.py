@@ -8,73 +8,81 @@ the protein is calculated after the the protein sequence is defined.
 If no seuquence is provided the default sequence will be Prkcb transcript
 variant 2 mRNA sequence which contains 671 amino acids and reading frame 2.
 
+If a multi-FASTA file is provided instead of a sequence, every record is
+translated in batch mode and the script writes a protein FASTA file and a
+per-record summary .tsv file (reading frame, length and weight). The
+records are translated by a process pool when --workers is given, e.g.
+
+    python translate_mrna.py sequences.fasta translated --workers 8
+
+A non-standard genetic code can be selected by its NCBI translation table
+ID with --table, e.g. --table 2 for the vertebrate mitochondrial code.
+
+A named region of a FASTA file can be translated directly with --region,
+reading only the region through the .fai index of the file, e.g.
+
+    python translate_mrna.py sequences.fasta --region NM_002738.7:100-2200
+
 Author: Jia Yi Terri Shen
 Date: October 2019
 """
 
 import sys
+from functools import partial
+from multiprocessing import Pool
+
+from fasta_index import IndexedFasta
+from fasta_writer import FastaWriter
+from genetic_code import get_code
+from profiling import profile_option, profiled, stage
+from protein_properties import average_mass, count_residues
 
-def codon_lookup(codon):
+FASTA_EXTENSIONS = (".fasta", ".fa", ".fna", ".fas")
+
+def codon_lookup(codon, table_id=1):
     """Return the associating amino acid in the single-letter format.
 
     Args:
         codon(str): A 3-nt sequence.
+        table_id(int): The NCBI translation table ID (1 is the standard code).
     Returns:
-        string: 1-nt letter.
+        string: 1-nt letter, "-" for a stop codon or "X" if unknown, the
+        same letter as translate_sequence.
     """
 
-    codon_table = {
-        'TTT': "F", 'TTC': "F", 'TTA': "L", 'TTG': "L", 'CTT': "L",
-        'CTA': "L", 'CTG': "L", 'ATT': "I", 'ATC': "I", 'ATA': "I",
-        'GTT': "V", 'GTC': "V", 'GTA': "V", 'GTG': "V", 'TCT': "S",
-        'TCA': "S", 'TCG': "S", 'CCT': "P", 'CCC': "P", 'CCA': "P",
-        'ACT': "T", 'ACC': "T", 'ACA': "T", 'ACG': "T", 'GCT': "A",
-        'GCA': "A", 'GCG': "A", 'TAT': "Y", 'TAC': "Y", 'TAA': "-",
-        'CAT': "H", 'CAC': "H", 'CAA': "Q", 'CAG': "Q", 'AAT': "N",
-        'AAA': "K", 'AAG': "K", 'GAT': "D", 'GAC': "D", 'GAA': "E",
-        'TGT': "C", 'TGC': "C", 'TGA': "-", 'TGG': "W", 'CGT': "R",
-        'CGA': "R", 'CGG': "R", 'AGT': "S", 'AGC': "S", 'AGA': "R",
-        'GGT': "G", 'GGC': "G", 'GGA': "G", 'GGG': "G", 'CTC': "L",
-        'ATG': "M", 'TCC': "S", 'CCG': "P", 'GCC': "A", 'TAG': "-",
-        'AAC': "N", 'GAG': "E", 'CGC': "R", 'AGG': "R",
-    }
-
-    return codon_table.get(codon, "x")
-
-def translate_sequence(sequence, start):
+    amino_acid = get_code(table_id).translate(codon) if len(codon) == 3 \
+        else "X"
+
+    return "-" if amino_acid == "*" else amino_acid
+
+def translate_sequence(sequence, start, table_id=1):
     """Find the amino acid of the mRNA sequence from the starting point.
 
     Args:
         sequence(string): A string containing the mRNA sequence
         start(interger): The starting point of the reading frame
+        table_id(int): The NCBI translation table ID (1 is the standard code).
     Returns:
         string: A proper translated protein seq starting with M and end with -
     """
 
-    # Declare empty string to store amino acid.
-    protein = ""
+    # Translate the whole reading frame at once with the compiled table.
+    frame_protein = get_code(table_id).translate(sequence[start:])
 
-    # At the reading frame, split the sequence into codons.
-    for i in range(start, len(sequence), 3):
+    # Started to translate when the starting amino acid is found and stop
+    # at the first stop codon after it.
+    protein_start = frame_protein.find("M")
+    if protein_start == -1:
+        return None
+    protein_end = frame_protein.find("*", protein_start)
+    if protein_end == -1:
+        return None
 
-        # For each codon, find the associating amino acid.
-        codon = sequence[i : i+3]
-        amino_acid = codon_lookup(codon)
-
-        # If the amino acid is "M", store it in the empty protein string.
-        if not protein and amino_acid == 'M':
-            protein += amino_acid
-        # Started to translate when the starting amino acid is found.
-        elif protein and amino_acid == '-':
-            return protein
-        elif protein:
-            protein += amino_acid
-
-    return
+    return frame_protein[protein_start:protein_end]
 
 
 def calculate_molecular_weight(sequence):
-    """Find the average molecular weight of the DNA sequence.
+    """Find the average molecular weight of the protein sequence.
 
     Args:
         sequence(string): A string containing the protein sequence
@@ -84,17 +92,159 @@ def calculate_molecular_weight(sequence):
         average molecualar weight in kilodaltons of the protein
     """
 
-    # Define the average weight of one amino acid in kilos
-    avg_weight_kilo = 110 / 1000
+    # Sum the average mass of each residue counted in the sequence
+    protein_avg_weight = average_mass(count_residues(sequence)) / 1000
+
+    return round(protein_avg_weight, 2)
 
-    # Calcualte the sequence weight
-    protein_avg_weight = float(len(sequence) * avg_weight_kilo)
+def read_fasta(filename):
+    """Stream the records of a multi-FASTA file one at a time.
+
+    Args:
+        filename(string): A file path to the multi-FASTA file.
+    Yields:
+        tuple: The header without ">" and the sequence joined into one line.
+    """
+
+    header = None
+    seq_lines = []
+    with open(filename) as fasta_file:
+        for line in fasta_file:
+            line = line.strip()
+            if line.startswith(">"):
+                if header is not None:
+                    yield header, "".join(seq_lines)
+                header = line[1:]
+                seq_lines = []
+            elif line:
+                seq_lines.append(line)
+
+    if header is not None:
+        yield header, "".join(seq_lines)
+
+
+def translate_record(record, table_id=1):
+    """Translate one FASTA record and keep the longest reading frame.
+
+    Args:
+        record(tuple): The header and the DNA or RNA sequence of a record.
+        table_id(int): The NCBI translation table ID.
+    Returns:
+        tuple: The record name, the reading frame (1-3 or None), the protein
+        sequence (or None) and its molecular weight (or None).
+    """
 
-    return protein_avg_weight
+    header, sequence = record
+    name = header.split()[0] if header.strip() else header
+    sequence = sequence.upper().replace("U", "T")
 
+    best_frame = None
+    best_protein = None
+    for frame in range(3):
+        protein = translate_sequence(sequence, frame, table_id)
+        if protein and (not best_protein or len(protein) > len(best_protein)):
+            best_frame = frame + 1
+            best_protein = protein
+
+    weight = calculate_molecular_weight(best_protein) if best_protein \
+        else None
+
+    return name, best_frame, best_protein, weight
+
+
+@profiled("translate", count=int)
+def translate_batch(input_filename, output_name, workers=1, chunksize=64,
+                    table_id=1):
+    """Translate every record of a multi-FASTA file and write the proteins
+    to output_name.fasta and a summary to output_name.tsv.
+
+    The records are read lazily and streamed to the workers with imap, so
+    the workers translate while the parent reads and writes, and the outputs
+    keep the order of the input file.
+
+    Args:
+        input_filename(string): A file path to the multi-FASTA file.
+        output_name(string): The output file name without extension.
+        workers(int): The number of worker processes.
+        chunksize(int): The number of records sent to a worker at once.
+        table_id(int): The NCBI translation table ID.
+    Returns:
+        int: The number of records translated.
+    """
+
+    records = read_fasta(input_filename)
+    translate = partial(translate_record, table_id=table_id)
+    count = 0
+
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        with FastaWriter(output_name + ".fasta", width=60) as protein_file, \
+                open(output_name + ".tsv", "w") as summary_file:
+            summary_file.write("record\tframe\tlength\tweight\n")
+
+            results = pool.imap(translate, records, chunksize) if pool \
+                else map(translate, records)
+            for name, frame, protein, weight in results:
+                if protein:
+                    protein_file.write(name, protein)
+                summary = [name, frame, len(protein) if protein else None,
+                           weight]
+                summary_file.write("\t".join(
+                    "N/A" if value is None else str(value)
+                    for value in summary) + "\n")
+                count += 1
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    return count
+
+
+@profile_option
 def main():
     """The main function of the script."""
 
+    # Select the genetic code, the standard code by default.
+    table_id = 1
+    if "--table" in sys.argv:
+        index = sys.argv.index("--table")
+        try:
+            table_id = get_code(sys.argv[index + 1]).table_id
+        except (IndexError, ValueError) as error:
+            sys.exit(f"Please provide a valid NCBI translation table. {error}")
+        del sys.argv[index:index + 2]
+
+    # Select a region of an indexed FASTA file, e.g. --region chr1:100-400.
+    region = None
+    if "--region" in sys.argv:
+        index = sys.argv.index("--region")
+        if index + 1 >= len(sys.argv) or len(sys.argv) < 4:
+            sys.exit("Please provide a FASTA file and a region to translate.")
+        region = sys.argv[index + 1]
+        del sys.argv[index:index + 2]
+
+    # Run the batch mode when a multi-FASTA file is provided.
+    if len(sys.argv) >= 2 and sys.argv[1].endswith(FASTA_EXTENSIONS) \
+            and not region:
+        workers = 1
+        if "--workers" in sys.argv:
+            index = sys.argv.index("--workers")
+            try:
+                workers = int(sys.argv[index + 1])
+            except (IndexError, ValueError):
+                sys.exit("Please provide the number of workers as an integer.")
+            del sys.argv[index:index + 2]
+
+        output_name = sys.argv[2] if len(sys.argv) > 2 else "translated"
+        try:
+            translate_batch(sys.argv[1], output_name, workers,
+                            table_id=table_id)
+        except FileNotFoundError:
+            sys.exit(sys.argv[1] + " not found. Check the file path and " +
+                     "try again.")
+        return
+
     # Define a variable to store the Prkcb.transcript vairant2 mRNA sequence
     mrna_seq = """
 GCGGCCCTGCGGTCCCCGGGCGGCAGCAGCGGCCGCCTAGTCCCGCGCCTCTCCGGGCTTACAGCCCCGC
@@ -144,8 +294,20 @@ AAAAAA """
     seq_type = "sequence_type"
     valid = ['DNA', 'RNA']
 
+    # Read the region from the FASTA file without reading the whole file.
+    if region:
+        try:
+            with IndexedFasta(sys.argv[1]) as fasta:
+                mrna = fasta.fetch_region(region).upper().replace("U", "T")
+        except FileNotFoundError:
+            sys.exit(sys.argv[1] + " not found. Check the file path and " +
+                     "try again.")
+        except KeyError:
+            sys.exit(region + " not found in " + sys.argv[1] + ".")
+        except ValueError as error:
+            sys.exit(str(error))
     # Set the default seq and seq type when there is no user input.
-    if len(sys.argv) < 2:
+    elif len(sys.argv) < 2:
         mrna = mrna_seq
         seq_type = "DNA"
     # Quit the function if the seq is provided but seq type is not.
@@ -165,19 +327,22 @@ AAAAAA """
             pass
 
     # Printing a summary report to the user.
-    for frame in range(3):
+    with stage("translate", 1, len(mrna)):
+        for frame in range(3):
+
+            # Define output variables and stores it into a list
+            protein = translate_sequence(mrna, frame, table_id)
+            weight = calculate_molecular_weight(protein) if protein \
+                else 'N/A'
 
-        # Define output variables and stores it into a list
-        protein = translate_sequence(mrna, frame)
-        weight = calculate_molecular_weight(protein) if protein else 'N/A'
-
-        frame = f"Reading frame: {frame + 1}"
-        sequence = f"Sequence: {protein if protein else 'None'}"
-        length = f"Length: {len(protein) if protein else 'N/A'}"
-        molecular_weight = f"Weight (kilodaltons): {weight}"
-        dash = "-" * 4
-        output = [protein, frame, sequence, length, molecular_weight, dash]
-        print(*output[1:], sep="\n")
+            frame = f"Reading frame: {frame + 1}"
+            sequence = f"Sequence: {protein if protein else 'None'}"
+            length = f"Length: {len(protein) if protein else 'N/A'}"
+            molecular_weight = f"Weight (kilodaltons): {weight}"
+            dash = "-" * 4
+            output = [protein, frame, sequence, length, molecular_weight,
+                      dash]
+            print(*output[1:], sep="\n")
 
 if __name__ == "__main__":
     main()